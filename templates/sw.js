@@ -0,0 +1,85 @@
+// Service Worker for {{ site.name }} Portfolio
+// {version, entries: [{url, revision}]} is injected from the build output at compile time
+const PRECACHE = self.__PRECACHE_MANIFEST;
+const CACHE_PREFIX = '{{ site.cache_prefix }}';
+const CACHE_NAME = CACHE_PREFIX + PRECACHE.version;
+// Versioned with the precache, so a deploy drops runtime entries from the previous build
+const RUNTIME_CACHE = CACHE_PREFIX + 'runtime-' + PRECACHE.version;
+
+// Cache keys carry the revision, so an unchanged entry matches across cache versions
+const revisionKey = entry => `${entry.url}${entry.url.includes('?') ? '&' : '?'}__rev=${entry.revision}`;
+const PRECACHE_KEYS = new Map(
+    PRECACHE.entries.map(entry => [new URL(entry.url, self.location).href, revisionKey(entry)])
+);
+
+// Install event - copy unchanged entries from the previous cache, fetch only what changed
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(cache => Promise.all(PRECACHE.entries.map(entry => {
+                const key = revisionKey(entry);
+                return caches.match(key).then(cached => {
+                    if (cached) return cache.put(key, cached);
+                    return fetch(entry.url, { cache: 'no-cache' }).then(response => {
+                        if (!response.ok) throw new Error(`Precache failed: ${entry.url}`);
+                        return cache.put(key, response);
+                    });
+                });
+            })))
+            .then(() => self.skipWaiting())
+    );
+});
+
+// Activate event - clean up old caches
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys().then(cacheNames => {
+            return Promise.all(
+                cacheNames.map(cacheName => {
+                    if (cacheName.startsWith(CACHE_PREFIX) && cacheName !== CACHE_NAME && cacheName !== RUNTIME_CACHE) {
+                        console.log('Deleting old cache:', cacheName);
+                        return caches.delete(cacheName);
+                    }
+                })
+            );
+        }).then(() => self.clients.claim())
+    );
+});
+
+// Fetch event - precached entries from the versioned cache, everything else stale-while-revalidate at runtime
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET') return;
+    if (!event.request.url.startsWith(self.location.origin)) return;
+
+    const url = new URL(event.request.url);
+    const precacheKey = PRECACHE_KEYS.get(url.origin + url.pathname);
+    if (precacheKey) {
+        event.respondWith(
+            caches.open(CACHE_NAME)
+                .then(cache => cache.match(precacheKey))
+                .then(response => response || fetch(event.request))
+        );
+        return;
+    }
+
+    event.respondWith(
+        caches.open(RUNTIME_CACHE).then(cache => cache.match(event.request).then(cached => {
+            const network = fetch(event.request.clone()).then(response => {
+                if (response && response.status === 200 && response.type === 'basic') {
+                    cache.put(event.request, response.clone());
+                }
+                return response;
+            });
+            if (cached) {
+                // Serve the cached copy now and refresh it in the background
+                event.waitUntil(network.catch(() => {}));
+                return cached;
+            }
+            return network.catch(() => {
+                if (event.request.destination === 'document') {
+                    return caches.match(PRECACHE_KEYS.get(self.location.origin + '/'));
+                }
+            });
+        }))
+    );
+});
\ No newline at end of file
@@ -0,0 +1,215 @@
+from pathlib import Path
+import re
+import sys
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import update
+
+
+PAGE = (
+    '<html><head><title>TeNeT Tech</title></head><body>\n'
+    '<nav><a href="#about">About</a></nav>\n'
+    '<section id="about"><p>Old about</p></section>\n'
+    '<section id="home"><h1>TeNeT Tech</h1></section>\n'
+    '<script>console.log("kept")</script>\n'
+    '</body></html>'
+)
+
+
+def _site(tmp_path, monkeypatch):
+    (tmp_path / 'new_snippets').mkdir()
+    (tmp_path / 'new_snippets' / 'about.html').write_text('<p>New about</p>', encoding='utf-8')
+    (tmp_path / 'index.html').write_text(PAGE, encoding='utf-8')
+    (tmp_path / 'app.html').write_text('<html><body><main>App</main></body></html>', encoding='utf-8')
+    (tmp_path / 'main.css').write_text('/* TeNeT Tech */ body { color: red; }', encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(update, 'SECTION_SNIPPETS', {'about': Path('new_snippets/about.html')})
+    monkeypatch.setattr(update, 'HTML_FILES', ['index.html', 'app.html'])
+    monkeypatch.setattr(update, 'OTHER_FILES', ['main.css', 'missing.js'])
+    monkeypatch.setattr(update, 'ASSETS_TO_COPY', {})
+
+
+def test_main_transforms_each_file_in_memory_and_writes_it_once(tmp_path, monkeypatch):
+    _site(tmp_path, monkeypatch)
+    writes = []
+    write_atomic = update.write_atomic
+    monkeypatch.setattr(update, 'write_atomic', lambda fp, content: (writes.append(str(fp)), write_atomic(fp, content)))
+
+    update.main()
+
+    assert sorted(writes) == ['.update-state.json', 'index.html', 'main.css']
+    soup = BeautifulSoup((tmp_path / 'index.html').read_text(encoding='utf-8'), 'html.parser')
+    assert [s['id'] for s in soup.find_all('section')] == ['home', 'about']
+    assert soup.find('section', id='about').get_text(strip=True) == 'New about'
+    assert soup.nav is not None and 'kept' in soup.script.string
+    assert soup.title.string == 'TeNeT X'
+    assert (tmp_path / 'app.html').read_text(encoding='utf-8') == '<html><body><main>App</main></body></html>'
+    assert (tmp_path / 'main.css').read_text(encoding='utf-8') == '/* TeNeT X */ body { color: red; }'
+    assert (tmp_path / 'index.html.bak').read_text(encoding='utf-8') == PAGE
+    assert (tmp_path / 'app.html.bak').exists()
+    assert not list(tmp_path.glob('.*.tmp'))
+
+
+def test_each_html_file_is_parsed_once_and_backed_up_even_when_unchanged(tmp_path, monkeypatch):
+    _site(tmp_path, monkeypatch)
+    parsed = []
+    soup = update.BeautifulSoup
+    monkeypatch.setattr(update, 'BeautifulSoup', lambda *args, **kwargs: (parsed.append(1), soup(*args, **kwargs))[1])
+    update.main()
+    assert len(parsed) == 2
+
+    edited = (tmp_path / 'index.html').read_text(encoding='utf-8') + '<!-- manual edit -->'
+    (tmp_path / 'index.html').write_text(edited, encoding='utf-8')
+    update.main()
+    assert (tmp_path / 'index.html').read_text(encoding='utf-8') == edited
+
+    update.main(undo=True)
+    assert (tmp_path / 'index.html').read_text(encoding='utf-8') == edited
+
+
+def test_dry_run_leaves_files_untouched(tmp_path, monkeypatch):
+    _site(tmp_path, monkeypatch)
+
+    update.main(dry_run=True)
+
+    assert (tmp_path / 'index.html').read_text(encoding='utf-8') == PAGE
+    assert not (tmp_path / 'index.html.bak').exists()
+
+
+def test_jobs_run_files_in_a_pool_with_ordered_logs_and_a_combined_status(tmp_path, monkeypatch, caplog):
+    _site(tmp_path, monkeypatch)
+    (tmp_path / 'app.html').write_text('<html><body><button></button></body></html>', encoding='utf-8')
+    caplog.set_level('INFO')
+
+    status = update.main(jobs=3)
+
+    files = []
+    for record in caplog.records[:-1]:
+        name = record.getMessage().rstrip(':').rsplit(' ', 1)[-1]
+        if name in ('index.html', 'app.html', 'main.css') and files[-1:] != [name]:
+            files.append(name)
+    assert files == ['index.html', 'app.html', 'main.css']
+    assert status == 1
+    assert 'TeNeT X' in (tmp_path / 'index.html').read_text(encoding='utf-8')
+    assert '1 file(s) failed to update or validate: app.html' in caplog.text
+
+    (tmp_path / 'app.html').write_text('<html><body><main>App</main></body></html>', encoding='utf-8')
+    assert update.main(jobs=3) == 0
+
+
+def test_text_replacer_scans_once_with_longest_match_precedence():
+    replacer = update.TextReplacer({
+        r'TeNeT Tech\b': 'TeNeT X',
+        r'TeNeT Tech - Web Development Portfolio': 'TeNeT X: Digital Innovation Lab',
+        r'contact@tenettech\.dev': 'TeNeT.GT@Gmail.com',
+        r'h(e|i)s\b': r'<\1>',
+        'a': 'b',
+        'b': 'c',
+    })
+
+    text, hits = replacer.apply('TENET TECH - Web Development Portfolio, CONTACT@tenettech.dev, his ab, TeNeT Technology')
+
+    assert text == 'TeNeT X: Digital Innovation Lab, TeNeT.GT@Gmail.com, <i> bc, TeNeT Technology'
+    assert hits == {
+        r'TeNeT Tech - Web Development Portfolio': 1,
+        r'contact@tenettech\.dev': 1,
+        r'h(e|i)s\b': 1,
+        'a': 1,
+        'b': 1,
+    }
+    assert update.text_replacer(update.TEXT_REPLACEMENTS) is update.text_replacer(dict(update.TEXT_REPLACEMENTS))
+
+
+def test_literal_and_regex_replacements_expand_templates_alike():
+    table = {r'TeNeT': r'<\g<0>>', r'X\b': r'a\\b\ty', r'h(i)': r'\1\\'}
+    text = 'tenet X hi'
+
+    replaced, _ = update.TextReplacer(table).apply(text)
+
+    expected = text
+    for pattern, repl in table.items():
+        expected = re.sub(pattern, repl, expected, flags=re.IGNORECASE)
+    assert replaced == expected == '<tenet> a\\b\ty i\\'
+
+
+def test_section_index_balances_nesting_and_skips_scripts_and_comments():
+    html = ('<section id="a"><div class="x"><div id="b">in</div></div>'
+            '<script>"</div></section>"</script><!-- </section> --></section>\n<div id="c"></div>')
+
+    spans = update.index_sections(html)
+
+    start, open_end, close_start, end = spans['a'][0]
+    assert html[start:open_end] == '<section id="a">'
+    assert html[close_start:end] == '</section>' and html[end:end + 1] == '\n'
+    assert html[spans['b'][0][0]:spans['b'][0][3]] == '<div id="b">in</div>'
+    assert set(spans) == {'a', 'b', 'c'}
+    assert update.replace_section(html, 'a', '<p>new</p>') == (
+        '<section id="a">\n<p>new</p>\n</section>\n<div id="c"></div>', 1)
+
+
+def test_whole_section_snippets_replace_the_element_so_reruns_are_stable():
+    html = '<body><section id="about" class="old"><div><p>Old</p></div></section><section id="contact"></section></body>'
+    snippets = {'about': '<section id="about" class="section"><p>New</p></section>\n', 'missing': '<p>x</p>'}
+
+    once, counts = update.replace_sections(html, snippets)
+    twice, _ = update.replace_sections(once, snippets)
+
+    assert once == '<body><section id="about" class="section"><p>New</p></section><section id="contact"></section></body>'
+    assert counts == {'about': 1, 'missing': 0}
+    assert twice == once
+
+
+def test_unchanged_inputs_are_skipped_until_a_file_or_snippet_changes(tmp_path, monkeypatch, caplog):
+    _site(tmp_path, monkeypatch)
+    caplog.set_level('INFO')
+    assert update.main() == 0
+    caplog.clear()
+
+    assert update.main() == 0
+    assert 'Nothing to do: 3 file(s) unchanged since the last run.' in caplog.text
+    assert (tmp_path / 'index.html.bak').read_text(encoding='utf-8') == PAGE
+
+    (tmp_path / 'app.html').write_text('<html><body><button></button></body></html>', encoding='utf-8')
+    caplog.clear()
+    assert update.main() == 1
+    assert '[Validate] app.html has errors:' in caplog.text and 'index.html' not in caplog.text
+    caplog.clear()
+    assert update.main() == 1
+    assert 'app.html is unchanged and still has validation errors' in caplog.text
+
+    (tmp_path / 'new_snippets' / 'about.html').write_text('<p>Newer about</p>', encoding='utf-8')
+    caplog.clear()
+    update.main()
+    assert 'Newer about' in (tmp_path / 'index.html').read_text(encoding='utf-8')
+    assert '[Info] No text replacements needed in main.css' in caplog.text
+
+    caplog.clear()
+    update.main(force=True)
+    assert 'Nothing to do' not in caplog.text and '[Info] main.css is unchanged' in caplog.text
+
+
+def test_undo_restores_the_last_runs_input_and_refuses_mismatched_backups(tmp_path, monkeypatch, caplog):
+    _site(tmp_path, monkeypatch)
+    update.main()
+    update.main()
+    assert update.main(undo=True) == 0
+    assert (tmp_path / 'index.html').read_text(encoding='utf-8') == PAGE
+    assert update.main(undo=True) == 1
+
+    update.main()
+    written = (tmp_path / 'index.html').read_text(encoding='utf-8')
+    (tmp_path / 'index.html').write_text(written + '<!-- manual edit -->', encoding='utf-8')
+    caplog.clear()
+    assert update.main(undo=True) == 1
+    assert 'Refusing to restore index.html: it changed since the last update' in caplog.text
+    assert (tmp_path / 'index.html').read_text(encoding='utf-8').endswith('<!-- manual edit -->')
+
+    (tmp_path / 'index.html').write_text(written, encoding='utf-8')
+    (tmp_path / 'index.html.bak').write_text('<p>stale</p>', encoding='utf-8')
+    caplog.clear()
+    assert update.main(undo=True) == 1
+    assert 'index.html.bak is not the backup of the last update' in caplog.text
+    assert update.main(undo=True, force=True) == 0
+    assert (tmp_path / 'index.html').read_text(encoding='utf-8') == '<p>stale</p>'
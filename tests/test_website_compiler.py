@@ -0,0 +1,783 @@
+import gzip
+import http.server
+import importlib.util
+import io
+import json
+import shutil
+from pathlib import Path
+import sys
+import threading
+import urllib.request
+import zipfile
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import website_compiler
+
+
+def test_default_build_cleans_up_and_zips_every_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compiler = website_compiler.TenetTechWebsiteCompiler('site')
+    zip_file = compiler.compile_website()
+
+    assert not (tmp_path / 'site').exists()
+    with zipfile.ZipFile(tmp_path / zip_file) as zf:
+        names = set(zf.namelist())
+    assert 'site/index.html' in names
+    assert 'site/assets/fonts/InterVariable.woff2' in names
+
+
+def test_incremental_rebuild_skips_unchanged_steps(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    website_compiler.TenetTechWebsiteCompiler('site', incremental=True).compile_website()
+    index = tmp_path / 'site' / 'index.html'
+    mtime = index.stat().st_mtime_ns
+    zip_mtime = (tmp_path / 'site.zip').stat().st_mtime_ns
+
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', incremental=True)
+    ran = []
+    monkeypatch.setattr(compiler, 'create_index_html', lambda: ran.append('index'))
+    compiler.compile_website()
+
+    assert ran == []
+    assert index.stat().st_mtime_ns == mtime
+    assert (tmp_path / 'site.zip').stat().st_mtime_ns == zip_mtime
+
+
+def test_incremental_rebuild_picks_up_a_source_that_was_missing(tmp_path, monkeypatch):
+    source = tmp_path / 'src'
+    (source / 'assets/fonts').mkdir(parents=True)
+    for name in ('icon-192.png', 'icon-512.png', 'tmp.logo.png'):
+        shutil.copy(website_compiler.SOURCE_DIR / name, source / name)
+    monkeypatch.setattr(website_compiler, 'SOURCE_DIR', source)
+    monkeypatch.chdir(tmp_path)
+    website_compiler.TenetTechWebsiteCompiler('site', incremental=True).compile_website()
+    font = tmp_path / 'site/assets/fonts/InterVariable.woff2'
+    assert font.read_bytes().startswith(b'# Placeholder')
+
+    (source / 'assets/fonts/InterVariable.woff2').write_bytes(b'wOF2 real font')
+    website_compiler.TenetTechWebsiteCompiler('site', incremental=True).compile_website()
+
+    assert font.read_bytes() == b'wOF2 real font'
+
+
+def test_incremental_rebuild_rewrites_changed_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    website_compiler.TenetTechWebsiteCompiler('site', incremental=True).compile_website()
+
+    class Edited(website_compiler.TenetTechWebsiteCompiler):
+        def create_main_js(self):
+            self._write_file('assets/js/main.js', '// edited')
+
+    Edited('site', incremental=True).compile_website()
+
+    assert (tmp_path / 'site/assets/js/main.js').read_text(encoding='utf-8') == '// edited'
+    with zipfile.ZipFile(tmp_path / 'site.zip') as zf:
+        assert zf.read('site/assets/js/main.js') == b'// edited'
+
+
+def test_incremental_rebuild_reruns_steps_after_a_constant_or_helper_edit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / 'site_compiler.py'
+
+    def build(critical_classes):
+        source.write_text(
+            'import website_compiler\n\n'
+            'class Compiler(website_compiler.TenetTechWebsiteCompiler):\n'
+            f'    CRITICAL_CLASSES = {critical_classes!r}\n', encoding='utf-8')
+        spec = importlib.util.spec_from_file_location('site_compiler', source)
+        module = importlib.util.module_from_spec(spec)
+        monkeypatch.setitem(sys.modules, 'site_compiler', module)
+        spec.loader.exec_module(module)
+        compiler = module.Compiler('site', incremental=True, in_memory=True)
+        compiler.compile_website()
+        return compiler
+
+    build(('section',))
+    compiler = build(('section', 'contact-method'))
+
+    ran = {metric['name'] for metric in compiler.metrics if metric['category'] == 'step' and not metric['skipped']}
+    assert 'inline_critical_css' in ran
+    html = compiler.files['index.html'].decode('utf-8')
+    assert '.contact-method' in html[html.index('<style>'):html.index('</style>')]
+
+
+def test_in_memory_build_never_stages_to_disk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, archive_path='out.zip')
+    monkeypatch.setattr(compiler, 'write_output_tree', lambda: (_ for _ in ()).throw(AssertionError))
+    compiler.compile_website()
+
+    assert not (tmp_path / 'site').exists()
+    with zipfile.ZipFile(tmp_path / 'out.zip') as zf:
+        assert zf.read('site/index.html') == compiler.files['index.html']
+
+
+def test_build_graph_runs_dependencies_first_and_rejects_cycles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, jobs=4)
+    order = []
+    run_step = compiler.run_step
+    monkeypatch.setattr(compiler, 'run_step', lambda name: (order.append(name), run_step(name)))
+    compiler.run_build_graph()
+
+    assert set(order) == set(compiler.BUILD_STEPS)
+    for dep in compiler.BUILD_STEPS['create_service_worker']:
+        assert order.index(dep) < order.index('create_service_worker')
+
+    compiler.BUILD_STEPS = {'a': ('b',), 'b': ('a',)}
+    with pytest.raises(ValueError):
+        compiler.run_build_graph()
+
+
+def test_archives_are_reproducible_and_store_compressed_formats(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, archive_path='a.zip', jobs=1).compile_website()
+    website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, archive_path='b.zip', jobs=4).compile_website()
+
+    assert (tmp_path / 'a.zip').read_bytes() == (tmp_path / 'b.zip').read_bytes()
+    with zipfile.ZipFile(tmp_path / 'a.zip') as zf:
+        names = zf.namelist()
+        assert names == sorted(names)
+        assert zf.getinfo('site/assets/fonts/InterVariable.woff2').compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo('site/index.html').compress_type == zipfile.ZIP_DEFLATED
+        assert zf.getinfo('site/index.html').date_time == (1980, 1, 1, 0, 0, 0)
+
+
+def test_extract_critical_css_keeps_only_matching_rules():
+    css = """
+    /* comment { */
+    :root { --c: red; }
+    .hero, .footer { color: var(--c); }
+    .footer a:hover { color: blue; }
+    @media (min-width: 600px) { .hero { padding: 0; } .footer { margin: 0; } }
+    @keyframes fade { from { opacity: 0; } to { opacity: 1; } }
+    @keyframes unused { to { opacity: 0; } }
+    .hero h1 { animation: fade 1s; }
+    """
+    critical = website_compiler.extract_critical_css(css, {'.hero', 'h1'})
+
+    assert ':root { --c: red; }' in critical
+    assert '.hero { color: var(--c); }' in critical
+    assert '.footer' not in critical
+    assert '@media (min-width: 600px) {\n.hero { padding: 0; }\n}' in critical
+    assert '@keyframes fade' in critical
+    assert 'unused' not in critical
+
+
+def test_index_inlines_critical_css_and_defers_main_stylesheet(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True)
+    compiler.compile_website()
+    html = compiler.files['index.html'].decode('utf-8')
+
+    style = html[html.index('<style>'):html.index('</style>')]
+    assert '.hero-title' in style
+    assert '.contact-method' not in style
+    assert html.count('<link rel="stylesheet" href="/assets/css/main.css">') == 1
+    assert '<noscript><link rel="stylesheet" href="/assets/css/main.css"></noscript>' in html
+    assert 'rel="preload" href="/assets/css/main.css" as="style"' in html
+
+
+def test_minify_css_merges_box_longhands():
+    css = '/* c */\n.a {\n  margin-top: 1px;\n  margin-right: 2px;\n  margin-bottom: 1px;\n  margin-left: 2px;\n}\n' \
+          '@media (min-width: 10px) { .b > .c , .d { font-family: "A  B", sans-serif; } }'
+    code, segments = website_compiler.minify_css(css)
+
+    assert code == '.a{margin:1px 2px}@media (min-width: 10px){.b>.c,.d{font-family:"A  B",sans-serif}}'
+    assert len(segments) == 3
+
+
+def test_minify_js_keeps_strings_templates_regexes_and_asi_breaks():
+    js = (
+        "// header\n"
+        "const a = 'x  // not a comment';\n"
+        "const t = `line  one\n  ${ a + `inner ${ 1 }` }`;\n"
+        "const r = /\\/*[a-z]  /g; /* block */\n"
+        "let b = a\n"
+        "return b\n"
+    )
+    code, segments = website_compiler.minify_js(js)
+
+    assert code == (
+        "const a='x  // not a comment';"
+        "const t=`line  one\n  ${a + `inner ${1}`}`;"
+        "const r=/\\/*[a-z]  /g;let b=a\nreturn b"
+    )
+    assert segments[0] == (0, 0, 1, 0)
+
+
+def test_minify_build_writes_source_maps(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, minify=True)
+    compiler.compile_website()
+
+    assert compiler.files['assets/js/main.js'].endswith(b'//# sourceMappingURL=main.js.map')
+    source_map = json.loads(compiler.files['assets/css/main.css.map'])
+    assert source_map['sources'] == ['src/assets/css/main.css']
+    assert source_map['mappings']
+    report = compiler.minify_report['index.html']
+    assert report['after'] < report['before']
+    html = compiler.files['index.html'].decode('utf-8')
+    assert '<!-- Navigation -->' not in html
+    assert '<nav class="nav" role="navigation" aria-label="Main navigation"><div class="container">' in html
+
+
+def _misaligned_segments(compiler, relpath):
+    """Mapped positions whose generated and original characters differ"""
+    source_map = json.loads(compiler.files[f'{relpath}.map'])
+    generated = compiler.files[relpath].decode('utf-8').split('\n')
+    source = source_map['sourcesContent'][0].split('\n')
+    return [segment for segment in website_compiler.decode_source_map(source_map)
+            if generated[segment[0]][segment[1]:segment[1] + 1] != source[segment[2]][segment[3]:segment[3] + 1]]
+
+
+def test_precache_injection_keeps_the_service_worker_source_map_aligned(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, minify=True)
+    compiler.compile_website()
+
+    assert '"entries":[{"url"' in compiler.files['sw.js'].decode('utf-8')
+    assert website_compiler.decode_source_map(json.loads(compiler.files['sw.js.map']))
+    assert _misaligned_segments(compiler, 'sw.js') == []
+
+
+def test_fingerprint_renames_assets_and_rewrites_references(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, minify=True, fingerprint=True)
+    compiler.compile_website()
+    renamed = json.loads(compiler.files['asset-manifest.json'])
+
+    css = renamed['assets/css/main.css']
+    font = renamed['assets/fonts/InterVariable.woff2']
+    assert css != 'assets/css/main.css' and css in compiler.files
+    assert 'assets/css/main.css' not in compiler.files
+    assert f'{css}.map' in compiler.files
+    index = compiler.files['index.html'].decode('utf-8')
+    assert f'/{css}' in index and '/assets/css/main.css' not in index
+    assert f'/{font}' in index
+    assert f'"/{css}"' in compiler.files['sw.js'].decode('utf-8')
+    fonts_css = compiler.files[renamed['assets/fonts/fonts.css']].decode('utf-8')
+    assert font.rsplit('/', 1)[1] in fonts_css
+    for relpath in ['sw.js', *renamed.values()]:
+        if f'{relpath}.map' in compiler.files:
+            assert _misaligned_segments(compiler, relpath) == [], relpath
+
+
+def test_precompress_writes_gzip_sidecars_that_pay_off(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class Tiny(website_compiler.TenetTechWebsiteCompiler):
+        def create_readme(self):
+            self._write_file('robots.txt', 'x')
+
+    compiler = Tiny('site', in_memory=True, precompress=True)
+    compiler.compile_website()
+
+    assert gzip.decompress(compiler.files['index.html.gz']) == compiler.files['index.html']
+    assert 'robots.txt.gz' not in compiler.files
+    assert 'assets/fonts/InterVariable.woff2.gz' not in compiler.files
+
+
+def _precache(compiler):
+    sw = compiler.files['sw.js'].decode('utf-8')
+    start = sw.index('const PRECACHE = ') + len('const PRECACHE = ')
+    return json.JSONDecoder().raw_decode(sw[start:])[0]
+
+
+def test_service_worker_precache_is_generated_from_build_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True)
+    compiler.compile_website()
+    precache = _precache(compiler)
+    urls = {entry['url']: entry['revision'] for entry in precache['entries']}
+
+    assert {'/', '/apps/shed-organizer/', '/apps/wild-harvest/', '/assets/fonts/InterVariable.woff2'} <= set(urls)
+    assert '/README.md' not in urls and '/sw.js' not in urls
+    assert urls['/assets/js/main.js'] == compiler.hashes['assets/js/main.js'][:10]
+    sw = compiler.files['sw.js'].decode('utf-8')
+    assert "RUNTIME_CACHE = CACHE_PREFIX + 'runtime-' + PRECACHE.version" in sw
+    assert 'event.waitUntil(network.catch(' in sw
+
+    class Edited(website_compiler.TenetTechWebsiteCompiler):
+        def create_main_js(self):
+            self._write_file('assets/js/main.js', '// edited')
+
+    edited = Edited('site', in_memory=True)
+    edited.compile_website()
+    edited_urls = {entry['url']: entry['revision'] for entry in _precache(edited)['entries']}
+    assert _precache(edited)['version'] != precache['version']
+    assert edited_urls['/assets/js/main.js'] != urls['/assets/js/main.js']
+    assert edited_urls['/'] == urls['/']
+
+
+def test_report_dir_gets_step_metrics_and_chrome_trace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, report_dir='reports').compile_website()
+
+    report = json.loads((tmp_path / 'reports/site.build-report.json').read_text(encoding='utf-8'))
+    phases = {phase['name']: phase for phase in report['phases']}
+    assert set(website_compiler.TenetTechWebsiteCompiler.BUILD_STEPS) <= set(phases)
+    assert phases['create_index_html']['files'] == 1
+    assert phases['create_index_html']['bytes'] > 0
+    assert 'cpu_ms' in phases['create_zip_archive']
+
+    trace = json.loads((tmp_path / 'reports/site.trace.json').read_text(encoding='utf-8'))
+    complete = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+    assert len(complete) == len(report['phases'])
+
+
+def test_step_cpu_time_includes_its_pool_workers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class Busy(website_compiler.TenetTechWebsiteCompiler):
+        def create_readme(self):
+            def spin(_):
+                started = website_compiler.time.thread_time()
+                while website_compiler.time.thread_time() - started < 0.05:
+                    pass
+            with website_compiler.ThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(self._counting_cpu(spin), range(2)))
+
+    compiler = Busy('site', in_memory=True)
+    compiler.compile_website()
+
+    readme = next(metric for metric in compiler.metrics if metric['name'] == 'create_readme')
+    assert readme['cpu_ms'] >= 100
+
+
+def test_steps_fan_out_onto_the_build_pool_instead_of_pools_of_their_own(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    threads = set()
+    compress = website_compiler.gzip.compress
+    monkeypatch.setattr(website_compiler.gzip, 'compress', lambda *args, **kwargs: (
+        threads.add(threading.current_thread().name), compress(*args, **kwargs))[1])
+
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, precompress=True, jobs=2,
+                                                          cache_dir=tmp_path / 'cache')
+    compiler.compile_website()
+
+    steps = {metric['thread'] for metric in compiler.metrics if metric['category'] == 'step'}
+    assert threads and len(steps) <= 2
+    assert threads <= steps | {threading.current_thread().name}
+
+
+def test_dev_server_injects_live_reload_and_neutralises_service_worker(tmp_path):
+    (tmp_path / 'apps').mkdir()
+    (tmp_path / 'apps/index.html').write_text('<html><body>app</body></html>', encoding='utf-8')
+    handler = website_compiler.make_dev_handler(tmp_path, website_compiler._LiveReload())
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f'http://127.0.0.1:{server.server_port}'
+        page = urllib.request.urlopen(f'{base}/apps/').read().decode('utf-8')
+        worker = urllib.request.urlopen(f'{base}/sw.js').read().decode('utf-8')
+    finally:
+        server.shutdown()
+
+    assert page == '<html><body>app' + website_compiler.LIVE_RELOAD_SCRIPT + '</body></html>'
+    assert 'unregister' in worker
+
+
+def test_watch_rebuild_reruns_steps_after_a_helper_edit(tmp_path, monkeypatch):
+    source_dir = tmp_path / 'src'
+    shutil.copytree(website_compiler.TEMPLATE_DIR, source_dir / 'templates')
+    for name in ('website_compiler.py', 'icon-192.png', 'icon-512.png', 'tmp.logo.png'):
+        shutil.copy2(website_compiler.SOURCE_DIR / name, source_dir / name)
+    monkeypatch.setattr(website_compiler, '__file__', str(source_dir / 'website_compiler.py'))
+    monkeypatch.chdir(tmp_path)
+
+    def rebuild():
+        compiler = website_compiler._load_compiler_class()('site', incremental=True, minify=True, budget_file=None)
+        compiler.build()
+        compiler.save_manifest()
+        return compiler
+
+    rebuild()
+    module = source_dir / 'website_compiler.py'
+    module.write_text(module.read_text(encoding='utf-8').replace(
+        'out.append(f"{selector}{{{declarations}}}")', 'out.append(f"{selector}{{{declarations};}}")', 1),
+        encoding='utf-8')
+    compiler = rebuild()
+
+    ran = {metric['name'] for metric in compiler.metrics if metric['category'] == 'step' and not metric['skipped']}
+    assert 'minify_assets' in ran
+    assert ';}' in compiler.files['assets/css/main.css'].decode('utf-8')
+
+
+def test_compile_template_renders_loops_conditionals_includes_and_raw():
+    source = (
+        '<ul>\n'
+        '    {% for link in site.nav %}\n'
+        '    <li{% if loop.first %} class="first"{% endif %}>{{ link.label|escape }}</li>\n'
+        '    {% endfor %}\n'
+        '</ul>\n'
+        '{% include "footer.html" %}\n'
+        '{% raw %}{{ kept }}{% endraw %}'
+    )
+    namespace = dict(website_compiler._TEMPLATE_GLOBALS)
+    exec(website_compiler.compile_template(source, 'page.html'), namespace)
+    ctx = {'site': {'nav': [{'label': 'Home'}, {'label': 'Q&A'}], 'name': 'Site'}}
+
+    out = namespace['render'](ctx, lambda name, inner: f'<footer>{inner["site"]["name"]}</footer>')
+
+    assert out == ('<ul>\n    <li class="first">Home</li>\n    <li>Q&amp;A</li>\n</ul>\n'
+                   '<footer>Site</footer>{{ kept }}')
+    with pytest.raises(website_compiler.TemplateError, match='page.html:1'):
+        website_compiler.compile_template('{% for x in items %}', 'page.html')
+
+
+def test_template_edit_reruns_only_the_steps_that_read_it(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    templates = tmp_path / 'templates'
+    shutil.copytree(website_compiler.TEMPLATE_DIR, templates)
+    first = website_compiler.TenetTechWebsiteCompiler('site', incremental=True, template_dir=templates)
+    first.compile_website()
+    assert str(templates / 'partials/contact.html') in first.manifest['steps']['create_index_html']['inputs']
+
+    (templates / 'partials/contact.html').write_text('    <!-- Contact moved -->\n', encoding='utf-8')
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', incremental=True, template_dir=templates)
+    compiler.compile_website()
+
+    ran = {metric['name'] for metric in compiler.metrics if metric['category'] == 'step' and not metric['skipped']}
+    assert 'create_index_html' in ran
+    assert not ran & {'create_main_css', 'create_main_js', 'create_readme', 'create_shed_organizer_app'}
+    assert 'Contact moved' in (tmp_path / 'site/index.html').read_text(encoding='utf-8')
+
+
+def test_picture_markup_wraps_images_that_have_variants():
+    variants = {'/a.png': [('image/webp', [(160, '/a-160w.webp'), (320, '/a-320w.webp')])]}
+    html = '<img src="/a.png" width="160" alt=""><img src="/b.png"><picture><img src="/a.png"></picture>'
+
+    assert website_compiler.picture_markup(html, variants) == (
+        '<picture><source type="image/webp" srcset="/a-160w.webp 160w, /a-320w.webp 320w" sizes="160px">'
+        '<img src="/a.png" width="160" alt=""></picture><img src="/b.png"><picture><img src="/a.png"></picture>'
+    )
+
+
+def test_images_fall_back_to_prebuilt_icons_without_pillow(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(website_compiler, '_pillow', lambda: None)
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, optimize_images=True)
+    compiler.compile_website()
+
+    prebuilt = (website_compiler.SOURCE_DIR / 'icon-192.png').read_bytes()
+    assert compiler.files['assets/icons/icon-192.png'] == prebuilt
+    assert not any(relpath.endswith(('.webp', '.avif')) for relpath in compiler.files)
+    assert '<picture>' not in compiler.files['index.html'].decode('utf-8')
+
+
+def test_images_derive_icons_and_responsive_variants_from_the_master(tmp_path, monkeypatch):
+    Image = pytest.importorskip('PIL.Image')
+    monkeypatch.chdir(tmp_path)
+
+    class WithLogo(website_compiler.TenetTechWebsiteCompiler):
+        IMAGES = {'assets/images/logo.png': ('tmp.logo.png', 320)}
+
+        def create_index_html(self):
+            super().create_index_html()
+            self._write_file('index.html', self._read_file('index.html').replace(
+                '<h1 class="hero-title">', '<img src="/assets/images/logo.png" alt="" width="160"><h1 class="hero-title">'))
+
+    compiler = WithLogo('site', in_memory=True, optimize_images=True)
+    compiler.compile_website()
+
+    for relpath, size in compiler.ICON_SIZES.items():
+        with Image.open(io.BytesIO(compiler.files[relpath])) as icon:
+            assert icon.size == (size, size)
+    assert 'assets/images/logo-160w.webp' in compiler.files
+    assert '<source type="image/webp" srcset="/assets/images/logo-160w.webp 160w' in (
+        compiler.files['index.html'].decode('utf-8'))
+    assert not any(entry['url'].endswith('.webp') for entry in _precache(compiler)['entries'])
+
+
+def test_font_usage_scan_collects_characters_and_axis_ranges():
+    texts = ['<p>caf&eacute; →</p>', '.a { font-weight: 800; } .b { font-weight: bold; font-stretch: 87.5%; }',
+             '@font-face { font-weight: 100 900; }', '.c::after { content: "\\2014"; }']
+
+    codepoints = website_compiler.used_codepoints(texts)
+    assert {ord('é'), 0x2192, 0x2014} <= codepoints
+    assert website_compiler.used_font_axes(texts) == {'wght': (400, 800), 'wdth': (87.5, 100)}
+    assert website_compiler.unicode_range({0x41, 0x42, 0x43, 0x2014}) == 'U+41-43, U+2014'
+
+
+def _variable_woff2(chars):
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+    from fontTools.ttLib.tables._g_v_a_r import TupleVariation
+
+    pen = TTGlyphPen(None)
+    pen.moveTo((50, 0))
+    pen.lineTo((50, 700))
+    pen.lineTo((400, 700))
+    pen.lineTo((400, 0))
+    pen.closePath()
+    names = ['.notdef'] + [f'uni{ord(char):04X}' for char in chars]
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(names)
+    builder.setupCharacterMap({ord(char): f'uni{ord(char):04X}' for char in chars})
+    builder.setupGlyf({name: pen.glyph() for name in names})
+    builder.setupHorizontalMetrics({name: (500, 50) for name in names})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({'familyName': 'Test', 'styleName': 'Regular'})
+    builder.setupOS2()
+    builder.setupPost()
+    builder.setupFvar([('wght', 100, 400, 900, 'Weight')], [])
+    bolder = [(0, 0), (0, 0), (100, 0), (100, 0), (0, 0), (0, 0), (0, 0), (0, 0)]
+    builder.setupGvar({name: [TupleVariation({'wght': (0, 1.0, 1.0)}, bolder)] for name in names})
+    builder.font.flavor = 'woff2'
+    out = io.BytesIO()
+    builder.save(out)
+    return out.getvalue()
+
+
+def test_subset_fonts_drops_unused_glyphs_and_narrows_axes(tmp_path, monkeypatch):
+    pytest.importorskip('fontTools')
+    pytest.importorskip('brotli')
+    monkeypatch.chdir(tmp_path)
+    font = _variable_woff2('ABCabcЖ')
+
+    class WithFont(website_compiler.TenetTechWebsiteCompiler):
+        def create_fonts_placeholder(self):
+            super().create_fonts_placeholder()
+            self._write_file('assets/fonts/InterVariable.woff2', font)
+
+    compiler = WithFont('site', in_memory=True, subset_fonts=True)
+    compiler.compile_website()
+
+    subset = website_compiler._fonttools().TTFont(io.BytesIO(compiler.files['assets/fonts/InterVariable.woff2']))
+    assert set(subset.getBestCmap()) == {ord(char) for char in 'ABCabc'}
+    assert [(axis.minValue, axis.maxValue) for axis in subset['fvar'].axes] == [(400, 800)]
+    for relpath in ('assets/fonts/fonts.css', 'assets/css/main.css'):
+        css = compiler.files[relpath].decode('utf-8')
+        assert 'unicode-range: U+41-43, U+61-63;' in css
+        assert 'font-weight: 400 800;' in css
+    assert 'unicode-range' not in compiler.files['assets/fonts/fonts.css'].decode('utf-8').split('MonaSans')[1]
+
+
+def test_default_build_is_within_the_performance_budgets(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for options in ({}, {'minify': True, 'fingerprint': True}):
+        compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, **options)
+        compiler.compile_website()
+        assert compiler.budget_violations == []
+
+
+def test_budget_violations_are_reported_per_file_type_page_and_critical_css(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'budgets.json').write_text(json.dumps({
+        'file_types': {'.css': {'max_bytes': 1000}},
+        'pages': {'*': {'max_requests': 3}, 'apps/wild-harvest/index.html': {'max_bytes': 100}},
+        'critical_css': {'max_gzip_bytes': 1000},
+    }), encoding='utf-8')
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, budget_file='budgets.json',
+                                                         report_dir='reports')
+    compiler.compile_website()
+
+    failed = {(violation['target'], violation['budget']) for violation in compiler.budget_violations}
+    assert failed == {
+        ('assets/css/main.css', 'file_types[.css].max_bytes'),
+        ('index.html', 'pages[*].max_requests'),
+        ('apps/wild-harvest/index.html', 'pages[apps/wild-harvest/index.html].max_bytes'),
+        ('index.html', 'critical_css.max_gzip_bytes'),
+    }
+    report = json.loads((tmp_path / 'reports/site.build-report.json').read_text(encoding='utf-8'))
+    assert len(report['budget_violations']) == 4
+    assert compiler.page_resources('index.html')[0][:1] == ['index.html']
+
+
+def test_lazy_media_markup_keeps_media_above_the_fold_eager_and_sizes_images():
+    html = ('<div data-id="home"><img src="/logo.png"></div>'
+            '<section id="home"><img src="/hero.png"><img src="/badge.png"><iframe src="https://x.test/map"></iframe></section>'
+            '<img src="/a.png" width="100"><img src="/b.png" loading="eager"><iframe src="https://x.test/"></iframe>')
+    sizes = {'/hero.png': (640, 320), '/a.png': (400, 200)}
+
+    updated, lazy, sized = website_compiler.lazy_media_markup(html, sizes.get, 'home')
+
+    assert updated == (
+        '<div data-id="home"><img src="/logo.png" fetchpriority="high"></div>'
+        '<section id="home"><img src="/hero.png" width="640" height="320"><img src="/badge.png">'
+        '<iframe src="https://x.test/map"></iframe></section>'
+        '<img src="/a.png" width="100" height="50" loading="lazy" decoding="async">'
+        '<img src="/b.png" loading="eager" decoding="async"><iframe src="https://x.test/" loading="lazy"></iframe>'
+    )
+    assert (lazy, sized) == (2, 2)
+
+    updated, lazy, _ = website_compiler.lazy_media_markup(html, sizes.get, 'missing')
+    assert updated.startswith('<div data-id="home"><img src="/logo.png" fetchpriority="high"></div>')
+    assert '<img src="/hero.png" width="640" height="320" loading="lazy" decoding="async">' in updated
+    assert lazy == 5
+
+    html = '<div id="home-banner"><img src="/a.png"></div><section id=home><img src="/hero.png"></section><img src="/b.png">'
+    updated, lazy, _ = website_compiler.lazy_media_markup(html, {}.get, 'home')
+    assert updated == ('<div id="home-banner"><img src="/a.png" fetchpriority="high"></div>'
+                       '<section id=home><img src="/hero.png"></section>'
+                       '<img src="/b.png" loading="lazy" decoding="async">')
+    assert lazy == 1
+
+
+def test_image_size_reads_dimensions_from_headers():
+    png = (website_compiler.SOURCE_DIR / 'icon-192.png').read_bytes()
+    gif = b'GIF89a' + (300).to_bytes(2, 'little') + (150).to_bytes(2, 'little')
+
+    assert website_compiler.image_size(png) == (192, 192)
+    assert website_compiler.image_size(gif) == (300, 150)
+    assert website_compiler.image_size(b'not an image') is None
+
+
+def test_compile_sites_builds_one_archive_per_branded_variant(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    results = website_compiler.compile_sites(
+        [{'project_name': 'tenet'}, {'project_name': 'acme', 'site': {'name': 'Acme Dev'}, 'minify': True}],
+        processes=2, output_dir='archives', jobs=1, in_memory=True,
+    )
+
+    assert [(result['project_name'], result['error']) for result in results] == [('tenet', None), ('acme', None)]
+    assert [result['archive'] for result in results] == [str(Path('archives/tenet.zip')), str(Path('archives/acme.zip'))]
+    with zipfile.ZipFile(tmp_path / 'archives/acme.zip') as zf:
+        assert '<title>Acme Dev - Web Development Portfolio</title>' in zf.read('acme/index.html').decode('utf-8')
+    with zipfile.ZipFile(tmp_path / 'archives/tenet.zip') as zf:
+        assert '<title>TENET Tech - Web Development Portfolio</title>' in zf.read('tenet/index.html').decode('utf-8')
+    with pytest.raises(ValueError):
+        website_compiler.compile_sites([{'project_name': 'same'}, {'project_name': 'same'}])
+
+
+def test_derived_artifacts_are_shared_through_the_cache_dir(tmp_path):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return b'encoded'
+
+    first = website_compiler.TenetTechWebsiteCompiler('one', cache_dir=tmp_path)
+    second = website_compiler.TenetTechWebsiteCompiler('two', cache_dir=tmp_path)
+
+    assert first._derived('image', ['abc', 160], compute) == (b'encoded', False)
+    assert second._derived('image', ['abc', 160], compute) == (b'encoded', True)
+    assert second._derived('image', ['abc', 320], compute) == (b'encoded', False)
+    assert len(calls) == 2
+
+
+def test_purge_css_drops_unmatched_rules_and_keeps_formatting():
+    css = """/* theme */
+:root { --c: red; }
+.used, .unused { color: var(--c); }
+
+.unused:hover { color: blue; }
+
+@media (max-width: 600px) {
+    .unused { margin: 0; }
+}
+@keyframes spin { to { opacity: 1; } }
+@keyframes fade { to { opacity: 0; } }
+.used { animation: fade 1s; }
+"""
+    tokens = website_compiler.page_selector_tokens(
+        '<p class="used">hi</p><script>el.classList.add("toggled")</script>')
+    purged, removed = website_compiler.purge_css(css + '.toggled { color: red; }\n', tokens)
+
+    assert purged == """/* theme */
+:root { --c: red; }
+.used { color: var(--c); }
+
+@keyframes fade { to { opacity: 0; } }
+.used { animation: fade 1s; }
+.toggled { color: red; }
+"""
+    assert removed == ['.unused', '.unused:hover', '.unused', '@keyframes spin']
+
+
+def test_purge_css_build_strips_unused_rules_and_reports_them(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compiler = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True, purge_css=True, report_dir='report')
+    compiler.compile_website()
+    css = compiler.files['assets/css/main.css'].decode('utf-8')
+    report = json.loads((tmp_path / 'report' / 'site.build-report.json').read_text())
+
+    assert '.hidden' not in css
+    assert '.hero-title' in css and '.nav-menu.active' in css
+    assert '.hidden' in report['purge_css']['assets/css/main.css']['removed']
+    assert compiler.purge_report['assets/css/main.css']['after'] < compiler.purge_report['assets/css/main.css']['before']
+
+
+def test_resource_hints_follow_the_asset_graph_up_to_the_cap(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    placeholders = website_compiler.TenetTechWebsiteCompiler('site', in_memory=True)
+    placeholders.compile_website()
+    assert 'rel="preload" href="/assets/fonts/' not in placeholders.files['index.html'].decode('utf-8')
+
+    class WithFont(website_compiler.TenetTechWebsiteCompiler):
+        def create_fonts_placeholder(self):
+            super().create_fonts_placeholder()
+            self._write_file('assets/fonts/InterVariable.woff2', b'wOF2 real font')
+
+    compiler = WithFont('site', in_memory=True)
+    compiler.compile_website()
+    html = compiler.files['index.html'].decode('utf-8')
+    head = html[:html.index('<style>')]
+
+    assert head.count('<link rel="preload" href="/assets/fonts/') == 1
+    assert '<link rel="preload" href="/assets/fonts/InterVariable.woff2" as="font"' in head
+    assert '<link rel="prefetch" href="/apps/shed-organizer/">' in head
+
+    compiler._write_file('assets/js/util.js', 'export const x = 1;')
+    compiler._write_file('assets/js/app.js', "import { x } from './util.js';\nexport * from './util.js';")
+    compiler._write_file('demo.html', (
+        '<head><title>t</title><script type="module" src="/assets/js/app.js"></script>'
+        '<script src="https://cdn.test/x.js"></script><link rel="prefetch" href="/apps/wild-harvest/"></head>'
+        '<a href="/apps/wild-harvest/">w</a><a href="/apps/shed-organizer/#top">s</a><a href="/">h</a>'))
+    assert compiler.resource_hints('demo.html') == [
+        ('modulepreload', '/assets/js/util.js', {}),
+        ('preconnect', 'https://cdn.test', {}),
+        ('prefetch', '/apps/shed-organizer/', {}),
+        ('prefetch', '/', {}),
+        ('prefetch', '/assets/css/apps.css', {}),
+    ]
+
+    monkeypatch.setattr(compiler, 'RESOURCE_HINT_LIMITS', {'prefetch': 1})
+    compiler.add_resource_hints()
+    demo = compiler.files['demo.html'].decode('utf-8')
+    assert demo.startswith('<head><title>t</title><link rel="prefetch" href="/apps/shed-organizer/"><script')
+    assert 'modulepreload' not in demo
+
+
+def test_split_shared_css_moves_only_the_common_leading_rules():
+    first = '\n  /* reset */\n  * { margin: 0; }\n  body { color: #fff; }\n  .a { color: red; }\n  .b { x: 1; }\n'
+    second = '* { margin:  0; }\nbody {\n  color: #fff;\n}\n.b { x: 1; }\n'
+
+    shared, rests = website_compiler.split_shared_css([first, second])
+
+    assert shared == '* { margin: 0; }\nbody { color: #fff; }\n'
+    assert rests == ['\n  .a { color: red; }\n  .b { x: 1; }\n', '\n.b { x: 1; }\n']
+    assert website_compiler.split_shared_css(['.a { x: 1; }', '.b { x: 1; }']) == ('', ['.a { x: 1; }', '.b { x: 1; }'])
+
+
+def test_app_pages_link_shared_css_and_scripts(tmp_path, monkeypatch):
+    class Compiler(website_compiler.TenetTechWebsiteCompiler):
+        def create_wild_harvest_app(self):
+            super().create_wild_harvest_app()
+            page = self._read_file('apps/wild-harvest/index.html')
+            self._write_file('apps/wild-harvest/index.html', page.replace(
+                '<script>', "<script>\n        console.log('apps');\n    </script>\n    <script>", 1))
+
+        def create_shed_organizer_app(self):
+            super().create_shed_organizer_app()
+            page = self._read_file('apps/shed-organizer/index.html')
+            self._write_file('apps/shed-organizer/index.html', page.replace(
+                '<script>', "<script>console.log('apps');</script>\n    <script>", 1))
+
+    monkeypatch.chdir(tmp_path)
+    compiler = Compiler('site', in_memory=True)
+    compiler.compile_website()
+    css = compiler.files['assets/css/apps.css'].decode('utf-8')
+
+    assert compiler.files['assets/js/apps.js'] == b"console.log('apps');\n"
+    assert css.startswith('* { margin: 0; padding: 0; box-sizing: border-box; }\n')
+    assert '.back-link' in css and '.search-bar' not in css and '.canvas' not in css
+    for page in compiler.APP_PAGES:
+        html = compiler.files[page].decode('utf-8')
+        assert html.count('<link rel="stylesheet" href="/assets/css/apps.css">') == 1
+        assert html.count('<script src="/assets/js/apps.js"></script>') == 1
+        assert "console.log('apps')" not in html
+        assert '.back-link' not in html[html.index('<style>'):]
@@ -11,6 +11,8 @@ from bs4 import BeautifulSoup
 import zipfile
 import json
 import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 
 
 def configure_logging(level=logging.INFO):
@@ -36,6 +38,9 @@ DEFAULT_SNIPPETS = {
 
 SECTION_ORDER = ["home", "apps", "about", "projects", "technical-showcase", "implementation-details", "contact"]
 
+# Regex -> replacement, applied case-insensitively in one pass over each file. Where rules
+# overlap, the leftmost match wins, then the longest, then the rule listed first; replaced
+# text is never matched again. Keys without regex syntax are matched as plain strings.
 TEXT_REPLACEMENTS = {
     r"contact@tenettech\.dev": "TeNeT.GT@Gmail.com",
     r"TeNeT Tech\b": "TeNeT X",
@@ -57,6 +62,10 @@ OTHER_FILES = [
     "assets/css/main.css",
 ]
 
+# Hashes of each run's inputs and outputs; files whose inputs are unchanged are skipped
+STATE_FILE = Path(".update-state.json")
+STATE_VERSION = 2
+
 GIT_BRANCH = "main"
 AUTO_PUSH = True
 
@@ -71,6 +80,148 @@ def ensure_snippets():
                 f.write(content)
             logging.info(f"[Init] Created {fpath}")
 
+def _literal_key(pattern):
+    """The text a regex matches when it is a plain string with escaped punctuation, else None."""
+    out, i = [], 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            if i + 1 == len(pattern) or pattern[i + 1].isalnum() or pattern[i + 1] == "_":
+                return None
+            out.append(pattern[i + 1])
+            i += 2
+            continue
+        if ch in ".^$*+?{}[]|()":
+            return None
+        out.append(ch)
+        i += 1
+    return "".join(out) or None
+
+class TextReplacer:
+    """A replacement table compiled for single-pass, case-insensitive matching.
+
+    Literal keys go into an Aho-Corasick automaton; regex keys are joined into one
+    alternation that finds where the next regex match starts. See TEXT_REPLACEMENTS
+    for the precedence rule. Every replacement is a re.sub template, whichever way
+    its key is matched.
+    """
+    def __init__(self, table):
+        self.rules = list(table.items())
+        self.regexes = []
+        # Literal rules whose replacement has escapes or group references to expand
+        self.templates = {}
+        # Automaton over lower-cased literals: goto transitions, failure links, (rule, length) outputs
+        self.goto, self.fail, self.out = [{}], [0], [[]]
+        for index, (pattern, repl) in enumerate(self.rules):
+            literal = _literal_key(pattern)
+            if literal is None:
+                self.regexes.append((index, re.compile(pattern, re.IGNORECASE)))
+                continue
+            if "\\" in repl:
+                self.templates[index] = re.compile(pattern, re.IGNORECASE)
+            state = 0
+            for ch in literal.lower():
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.out[state].append((index, len(literal.lower())))
+        # Breadth-first, so every failure link points at a state that is already complete
+        queue = list(self.goto[0].values())
+        while queue:
+            state = queue.pop(0)
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                if state:
+                    self.fail[child] = self.goto[fallback].get(ch, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+        try:
+            self.combined = re.compile("|".join(f"(?:{regex.pattern})" for _, regex in self.regexes),
+                                       re.IGNORECASE) if self.regexes else None
+        except re.error:
+            # Patterns whose group references would clash once combined are searched one by one
+            self.combined = None
+
+    def _literal_matches(self, text):
+        """Best literal match per start offset: {start: (end, rule index)}."""
+        best, state, origin = {}, 0, []
+        for i, ch in enumerate(text):
+            for lowered in ch.lower():
+                origin.append(i)
+                while state and lowered not in self.goto[state]:
+                    state = self.fail[state]
+                state = self.goto[state].get(lowered, 0)
+                for index, length in self.out[state]:
+                    start, end = origin[len(origin) - length], i + 1
+                    current = best.get(start)
+                    if current is None or (end, -index) > (current[0], -current[1]):
+                        best[start] = (end, index)
+        return best
+
+    def _next_regex_start(self, text, pos):
+        if self.combined is not None:
+            match = self.combined.search(text, pos)
+            return match.start() if match else None
+        starts = [match.start() for match in (regex.search(text, pos) for _, regex in self.regexes) if match]
+        return min(starts, default=None)
+
+    def apply(self, text):
+        """Return (new text, {pattern: hits}) for one scan of text."""
+        literals = self._literal_matches(text) if len(self.goto) > 1 else {}
+        literal_starts = sorted(literals)
+        out, hits, pos, next_literal = [], {}, 0, 0
+        regex_start = self._next_regex_start(text, 0) if self.regexes else None
+        while True:
+            while next_literal < len(literal_starts) and literal_starts[next_literal] < pos:
+                next_literal += 1
+            if regex_start is not None and regex_start < pos:
+                regex_start = self._next_regex_start(text, pos)
+            starts = [start for start in (regex_start, literal_starts[next_literal]
+                                          if next_literal < len(literal_starts) else None) if start is not None]
+            if not starts:
+                break
+            start = min(starts)
+            # (end, -rule index, replacement): the longest match wins, then the rule listed first
+            candidates = []
+            if start in literals:
+                end, index = literals[start]
+                replacement = self.rules[index][1]
+                if index in self.templates:
+                    replacement = self.templates[index].match(text, start).expand(replacement)
+                candidates.append((end, -index, replacement))
+            if start == regex_start:
+                for index, regex in self.regexes:
+                    match = regex.match(text, start)
+                    if match and match.end() > start:
+                        candidates.append((match.end(), -index, match.expand(self.rules[index][1])))
+            if not candidates:
+                # Only empty regex matches here; look again one character on
+                out.append(text[pos:start + 1])
+                pos = start + 1
+                continue
+            end, rank, replacement = max(candidates, key=lambda candidate: candidate[:2])
+            out.append(text[pos:start])
+            out.append(replacement)
+            pattern = self.rules[-rank][0]
+            hits[pattern] = hits.get(pattern, 0) + 1
+            pos = end
+        out.append(text[pos:])
+        return "".join(out), hits
+
+_TEXT_REPLACERS = {}
+
+def text_replacer(table):
+    """The TextReplacer for a replacement table, compiled once per process."""
+    key = tuple(table.items())
+    if key not in _TEXT_REPLACERS:
+        _TEXT_REPLACERS[key] = TextReplacer(table)
+    return _TEXT_REPLACERS[key]
+
 class SimpleHTMLValidator(HTMLParser):
     def __init__(self):
         super().__init__()
@@ -85,9 +236,53 @@ class SimpleHTMLValidator(HTMLParser):
             self.errors.append(str(e))
         return len(self.errors) == 0, self.errors
 
-def advanced_validate_html(html):
+class SectionIndexer(HTMLParser):
+    """Record the span of every <section>/<div> with an id in one pass, balancing nesting.
+
+    spans maps each id to [(start, open_end, close_start, end), ...] character offsets,
+    outermost first for nested duplicates; elements left unclosed get no span.
+    """
+    TAGS = ("section", "div")
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.spans = {}
+        self._stack = []
+        self._line_starts = [0]
+    def index(self, html):
+        self.spans, self._stack = {}, []
+        self._html = html
+        self._line_starts = [0] + [m.end() for m in re.finditer("\n", html)]
+        self.feed(html)
+        self.close()
+        for spans in self.spans.values():
+            spans.sort()
+        return self.spans
+    def _offset(self):
+        line, col = self.getpos()
+        return self._line_starts[line - 1] + col
+    def handle_starttag(self, tag, attrs):
+        if tag in self.TAGS:
+            start = self._offset()
+            self._stack.append((tag, dict(attrs).get("id"), start, start + len(self.get_starttag_text())))
+    def handle_endtag(self, tag):
+        if tag not in self.TAGS or not any(open_tag == tag for open_tag, *_ in self._stack):
+            return
+        close_start = self._offset()
+        end = self._html.index(">", close_start) + 1
+        while self._stack:
+            open_tag, section_id, start, open_end = self._stack.pop()
+            if open_tag == tag:
+                if section_id:
+                    self.spans.setdefault(section_id, []).append((start, open_end, close_start, end))
+                return
+
+def index_sections(html: str):
+    return SectionIndexer().index(html)
+
+def advanced_validate_html(html, soup=None):
     try:
-        soup = BeautifulSoup(html, 'lxml')
+        soup = soup if soup is not None else BeautifulSoup(html, 'lxml')
         interactive = soup.find_all(['a', 'button'])
         aria_errors = [tag for tag in interactive if not tag.has_attr('aria-label') and not tag.text.strip()]
         if aria_errors:
@@ -120,19 +315,181 @@ def restore_from_backup(fp: Path):
         logging.error(f"[Error] Failed to restore {fp}: {e}")
         return False
 
+def write_atomic(fp: Path, content: str):
+    """Write content next to fp and move it into place, so readers never see a half-written file."""
+    tmp = fp.with_name(f".{fp.name}.tmp")
+    try:
+        tmp.write_text(content, encoding="utf-8")
+        if fp.exists():
+            shutil.copymode(fp, tmp)
+        os.replace(tmp, fp)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+# --- TRANSFORMS ---
+
+def replace_sections(html: str, snippets: dict):
+    """Splice every snippet into the sections with its id, using one section index of html.
+
+    A snippet whose root element carries the section's id replaces the whole element;
+    any other snippet replaces the element's content. Returns (html, {id: count}).
+    """
+    spans = index_sections(html)
+    edits, counts = [], {}
+    for section_id, snippet_html in snippets.items():
+        counts[section_id] = 0
+        stripped = snippet_html.strip()
+        whole = any(start == 0 and end == len(stripped)
+                    for start, _, _, end in index_sections(stripped).get(section_id, []))
+        for start, open_end, close_start, end in spans.get(section_id, []):
+            if whole:
+                edits.append((start, end, stripped, section_id))
+            else:
+                edits.append((open_end, close_start, f"\n{snippet_html}\n", section_id))
+    # Outermost first; an edit inside one already applied is covered by it
+    applied = []
+    for edit in sorted(edits, key=lambda edit: (edit[0], -edit[1])):
+        if applied and edit[0] < applied[-1][1]:
+            continue
+        applied.append(edit)
+        counts[edit[3]] += 1
+    for start, end, replacement, _ in reversed(applied):
+        html = html[:start] + replacement + html[end:]
+    return html, counts
+
+def replace_section(html: str, section_id: str, snippet_html: str):
+    new_html, counts = replace_sections(html, {section_id: snippet_html})
+    return new_html, counts[section_id]
+
+def replace_text(content: str, replacements=None):
+    """Apply the replacement table in one pass; returns (content, {pattern: hits})."""
+    return text_replacer(TEXT_REPLACEMENTS if replacements is None else replacements).apply(content)
+
+def reorder_sections_in_soup(soup, order: list):
+    """Put the id'd sections named in order into that order, in the slots they already occupy.
+
+    Returns whether anything moved; the rest of the body stays where it is.
+    """
+    body = soup.body
+    if body is None:
+        return False
+    found = [s for s in body.find_all(['section', 'div'], id=True) if s['id'] in order]
+    found_ids = {id(s) for s in found}
+    # Sections nested in another listed section move along with it
+    top = [s for s in found if not any(id(parent) in found_ids for parent in s.parents)]
+    ordered = sorted(top, key=lambda s: order.index(s['id']))
+    if [id(s) for s in ordered] == [id(s) for s in top]:
+        return False
+    slots = []
+    for section in top:
+        slot = soup.new_string("")
+        section.replace_with(slot)
+        slots.append(slot)
+    for slot, section in zip(slots, ordered):
+        slot.replace_with(section)
+    return True
+
+def validate_html(html: str, soup=None):
+    """Basic and accessibility checks; a soup already parsed from html stands in for the basic tokenizer pass."""
+    basic_errors = []
+    if soup is None:
+        basic_valid, basic_errors = SimpleHTMLValidator().validate(html)
+    advanced_valid, advanced_errors = advanced_validate_html(html, soup)
+    return basic_errors + advanced_errors
+
+def update_file(fp: Path, snippets: dict, dry_run: bool, is_html: bool, replacements=None, order=None):
+    """Apply every transform to one file: one read, one HTML parse and at most one write.
+
+    The section index is a tokenizer pass over the text; the one parsed tree
+    serves both the reorder and the validation. Every processed file is backed
+    up first, so --undo always restores the input of the latest run.
+    Returns (written, valid); valid is None for files that are not validated.
+    """
+    backup_file(fp, dry_run)
+    original = fp.read_text(encoding="utf-8")
+    content, counts = replace_sections(original, snippets)
+    for sec_id, count in counts.items():
+        if count:
+            logging.info(f"[Section] Replaced #{sec_id} in {fp}")
+        else:
+            logging.warning(f"[Warn] Section #{sec_id} not found in {fp}")
+    replaced, hits = replace_text(content, replacements)
+    if replaced != content:
+        counts = ", ".join(f"{pat} x{count}" for pat, count in hits.items())
+        logging.info(f"[Replace] Text replacements in {fp} ({counts})")
+    else:
+        logging.info(f"[Info] No text replacements needed in {fp}")
+    content = replaced
+    valid = None
+    if is_html:
+        soup = BeautifulSoup(content, 'lxml')
+        if reorder_sections_in_soup(soup, SECTION_ORDER if order is None else order):
+            content = str(soup)
+            logging.info(f"[Reorder] Sections reordered in {fp}")
+        errors = validate_html(content, soup)
+        valid = not errors
+        if valid:
+            logging.info(f"[Validate] {fp} is valid HTML (basic + advanced).")
+        else:
+            logging.error(f"[Validate] {fp} has errors:")
+            for err in errors:
+                logging.error(f"  - {err}")
+    if content == original:
+        logging.info(f"[Info] {fp} is unchanged")
+        return False, valid
+    if dry_run:
+        logging.info(f"[Dry-Run] Would write {fp}")
+        return False, valid
+    write_atomic(fp, content)
+    logging.info(f"[Write] Updated {fp}")
+    return True, valid
+
+class _RecordCollector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+    def emit(self, record):
+        self.records.append(record)
+
+def _update_file_job(job):
+    """Run update_file for one file with its log records captured, so the parent can replay them in order."""
+    file, snippets, dry_run, is_html, replacements, order, level = job
+    root = logging.getLogger()
+    handlers, old_level = root.handlers[:], root.level
+    collector = _RecordCollector()
+    root.handlers = [collector]
+    root.setLevel(level)
+    result = {"file": file, "written": False, "valid": None, "error": None}
+    try:
+        result["written"], result["valid"] = update_file(Path(file), snippets, dry_run, is_html, replacements, order)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        root.handlers = handlers
+        root.setLevel(old_level)
+    result["records"] = collector.records
+    return result
+
+def run_update_jobs(files, snippets, dry_run, jobs=1):
+    """Update files (in a process pool when jobs > 1), yielding the per-file results in input order."""
+    level = logging.getLogger().getEffectiveLevel()
+    work = [(file, snippets, dry_run, file in HTML_FILES, TEXT_REPLACEMENTS, SECTION_ORDER, level) for file in files]
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(work))) as pool:
+            yield from pool.map(_update_file_job, work)
+    else:
+        yield from map(_update_file_job, work)
+
+# --- SINGLE-STEP WRAPPERS ---
+
 def replace_section_by_id(fp: Path, section_id: str, snippet_html: str, dry_run: bool):
     try:
-        html = fp.read_text(encoding="utf-8")
-        pattern = re.compile(
-            rf"(<(section|div)\b[^>]*\bid=['\"]{section_id}['\"][^>]*>).*?(</\2>)",
-            re.DOTALL | re.IGNORECASE
-        )
-        new_html, count = pattern.subn(rf"\1\n{snippet_html}\n\3", html)
+        new_html, count = replace_section(fp.read_text(encoding="utf-8"), section_id, snippet_html)
         if count:
             if dry_run:
                 logging.info(f"[Dry-Run] Would replace section #{section_id} in {fp}")
             else:
-                fp.write_text(new_html, encoding="utf-8")
+                write_atomic(fp, new_html)
                 logging.info(f"[Section] Replaced #{section_id} in {fp}")
         else:
             logging.warning(f"[Warn] Section #{section_id} not found in {fp}")
@@ -141,18 +498,13 @@ def replace_section_by_id(fp: Path, section_id: str, snippet_html: str, dry_run:
 
 def reorder_sections(fp: Path, order: list, dry_run: bool):
     try:
-        html = fp.read_text(encoding="utf-8")
-        soup = BeautifulSoup(html, 'lxml')
-        body = soup.body
-        sections = {s['id']: s for s in body.find_all(['section', 'div'], id=True) if s['id'] in order}
-        ordered_content = [str(sections[id]) for id in order if id in sections]
-        new_body = '\n'.join(ordered_content)
-        body.replace_with(BeautifulSoup(new_body, 'lxml'))
-        new_html = str(soup)
-        if dry_run:
+        soup = BeautifulSoup(fp.read_text(encoding="utf-8"), 'lxml')
+        if not reorder_sections_in_soup(soup, order):
+            logging.info(f"[Info] Sections already in order in {fp}")
+        elif dry_run:
             logging.info(f"[Dry-Run] Would reorder sections in {fp}")
         else:
-            fp.write_text(new_html, encoding="utf-8")
+            write_atomic(fp, str(soup))
             logging.info(f"[Reorder] Sections reordered in {fp}")
     except Exception as e:
         logging.error(f"[Error] Failed to reorder sections in {fp}: {e}")
@@ -160,14 +512,12 @@ def reorder_sections(fp: Path, order: list, dry_run: bool):
 def apply_text_replacements(fp: Path, dry_run: bool):
     try:
         content = fp.read_text(encoding="utf-8")
-        new_content = content
-        for pat, repl in TEXT_REPLACEMENTS.items():
-            new_content = re.sub(pat, repl, new_content, flags=re.IGNORECASE)
+        new_content, _ = replace_text(content)
         if new_content != content:
             if dry_run:
                 logging.info(f"[Dry-Run] Would apply text replacements in {fp}")
             else:
-                fp.write_text(new_content, encoding="utf-8")
+                write_atomic(fp, new_content)
                 logging.info(f"[Replace] Text replacements in {fp}")
         else:
             logging.info(f"[Info] No text replacements needed in {fp}")
@@ -175,6 +525,7 @@ def apply_text_replacements(fp: Path, dry_run: bool):
         logging.error(f"[Error] Failed to apply text replacements in {fp}: {e}")
 
 def copy_assets(dry_run: bool):
+    copied = 0
     for src, dest_sub in ASSETS_TO_COPY.items():
         src_path = Path(src)
         dest_path = Path(dest_sub)
@@ -185,6 +536,12 @@ def copy_assets(dry_run: bool):
             for fname in files:
                 rel = Path(root).relative_to(src_path) / fname
                 dst = dest_path / rel
+                if dst.exists():
+                    # copy2 keeps mtimes, so an earlier copy of an unchanged file matches exactly
+                    src_stat, dst_stat = (src_path / rel).stat(), dst.stat()
+                    if (src_stat.st_size, src_stat.st_mtime_ns) == (dst_stat.st_size, dst_stat.st_mtime_ns):
+                        continue
+                copied += 1
                 if dry_run:
                     logging.info(f"[Dry-Run] Would copy asset {rel} -> {dst}")
                 else:
@@ -194,15 +551,12 @@ def copy_assets(dry_run: bool):
                         logging.info(f"[Asset] {rel} -> {dst}")
                     except Exception as e:
                         logging.error(f"[Error] Failed to copy asset {rel}: {e}")
+    return copied
 
 def validate_html_file(fp: Path):
     try:
-        html = fp.read_text(encoding="utf-8")
-        validator = SimpleHTMLValidator()
-        basic_valid, basic_errors = validator.validate(html)
-        advanced_valid, advanced_errors = advanced_validate_html(html)
-        all_errors = basic_errors + advanced_errors
-        if basic_valid and advanced_valid:
+        all_errors = validate_html(fp.read_text(encoding="utf-8"))
+        if not all_errors:
             logging.info(f"[Validate] {fp} is valid HTML (basic + advanced).")
         else:
             logging.error(f"[Validate] {fp} has errors:")
@@ -237,19 +591,76 @@ def git_commit_changes(files, message, branch):
     except subprocess.CalledProcessError as e:
         logging.error(f"[Error] Git operation failed: {e}")
 
-def main(dry_run=False, git_commit=False, undo=False, branch=GIT_BRANCH):
+def file_digest(fp: Path):
+    return hashlib.sha256(fp.read_bytes()).hexdigest()
+
+def config_digest(snippets: dict):
+    """Hash of everything besides the target file that decides what update_file writes."""
+    config = {
+        "version": STATE_VERSION,
+        "script": file_digest(Path(__file__)),
+        "snippets": snippets,
+        "replacements": list(TEXT_REPLACEMENTS.items()),
+        "order": SECTION_ORDER,
+        "html_files": HTML_FILES,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+
+def read_state():
+    try:
+        return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def load_state(config: str):
+    """Per-file state of the last run, or {} when there is none or the configuration changed."""
+    state = read_state()
+    return state.get("files", {}) if state.get("config") == config else {}
+
+def save_state(config: str, files: dict):
+    write_atomic(STATE_FILE, json.dumps({"config": config, "files": files}, indent=2, sort_keys=True))
+
+def undo_changes(force=False):
+    """Restore each file from its .bak, refusing any pair that no longer matches the last recorded write."""
+    state = read_state()
+    files = state.get("files", {})
+    refused = []
+    for file in HTML_FILES + OTHER_FILES:
+        fp = Path(file)
+        bak = fp.with_suffix(fp.suffix + ".bak")
+        entry = files.get(file)
+        if not force and fp.exists() and bak.exists():
+            if not entry or not entry.get("backup"):
+                logging.warning(f"[Undo] Refusing to restore {fp}: no record of the run that wrote {bak} (use --force)")
+                refused.append(file)
+                continue
+            if file_digest(fp) != entry["output"]:
+                logging.warning(f"[Undo] Refusing to restore {fp}: it changed since the last update (use --force)")
+                refused.append(file)
+                continue
+            if file_digest(bak) != entry["backup"]:
+                logging.warning(f"[Undo] Refusing to restore {fp}: {bak} is not the backup of the last update (use --force)")
+                refused.append(file)
+                continue
+        if restore_from_backup(fp):
+            logging.info(f"[Undo] Successfully restored {fp}")
+            files.pop(file, None)
+        else:
+            logging.warning(f"[Warn] Could not undo {fp}")
+    if state:
+        save_state(state.get("config"), files)
+    if refused:
+        logging.error(f"\n❌ Undo refused for {len(refused)} file(s): {', '.join(refused)}")
+        return 1
+    logging.info("\n✅ Undo complete. All changes reverted from backups.")
+    return 0
+
+def main(dry_run=False, git_commit=False, undo=False, branch=GIT_BRANCH, jobs=1, force=False):
     if not logging.getLogger().hasHandlers():
         configure_logging()
     ensure_snippets()  # Auto-generate missing snippet files
     if undo:
-        for file in HTML_FILES + OTHER_FILES:
-            fp = Path(file)
-            if restore_from_backup(fp):
-                logging.info(f"[Undo] Successfully restored {fp}")
-            else:
-                logging.warning(f"[Warn] Could not undo {fp}")
-        logging.info("\n✅ Undo complete. All changes reverted from backups.")
-        return
+        return undo_changes(force)
 
     snippets = {}
     for sec_id, path in SECTION_SNIPPETS.items():
@@ -258,37 +669,54 @@ def main(dry_run=False, git_commit=False, undo=False, branch=GIT_BRANCH):
             continue
         snippets[sec_id] = path.read_text(encoding="utf-8").strip()
 
-    updated_files = []
+    config = config_digest(snippets)
+    state = {} if force else load_state(config)
+    files, inputs, failed = [], {}, []
     for file in HTML_FILES + OTHER_FILES:
-        fp = Path(file)
-        if not fp.exists():
+        if not Path(file).exists():
             logging.warning(f"[Warn] File missing: {file}")
             continue
-        backup_file(fp, dry_run)
-        for sec_id, snip in snippets.items():
-            replace_section_by_id(fp, sec_id, snip, dry_run)
-        apply_text_replacements(fp, dry_run)
-        if not dry_run:
-            updated_files.append(str(fp))
-
-    copy_assets(dry_run)
-
-    # Reorder sections in HTML files
-    for file in HTML_FILES:
-        fp = Path(file)
-        if fp.exists():
-            reorder_sections(fp, SECTION_ORDER, dry_run)
+        inputs[file] = file_digest(Path(file))
+        previous = state.get(file)
+        if previous and previous["output"] == inputs[file]:
+            if previous["valid"] is False:
+                logging.error(f"[Validate] {file} is unchanged and still has validation errors")
+                failed.append(file)
+            continue
+        files.append(file)
 
-    # Validate HTML files
-    for file in HTML_FILES:
-        fp = Path(file)
-        if fp.exists():
-            validate_html_file(fp)
+    updated_files = []
+    for result in run_update_jobs(files, snippets, dry_run, jobs):
+        for record in result["records"]:
+            logging.getLogger().handle(record)
+        file = result["file"]
+        if result["error"]:
+            logging.error(f"[Error] Failed to update {file}: {result['error']}")
+            state.pop(file, None)
+        else:
+            output = file_digest(Path(file)) if result["written"] else inputs[file]
+            # update_file backs the input up before transforming it, so the .bak holds exactly inputs[file].
+            state[file] = {"input": inputs[file], "output": output, "backup": inputs[file], "valid": result["valid"]}
+        if result["error"] or result["valid"] is False:
+            failed.append(file)
+        if result["written"]:
+            updated_files.append(file)
+
+    copied = copy_assets(dry_run)
+    if not dry_run and files:
+        save_state(config, state)
+    if not files and not copied:
+        logging.info(f"\n✅ Nothing to do: {len(inputs)} file(s) unchanged since the last run.")
+        return 1 if failed else 0
 
     if git_commit and not dry_run and updated_files:
         git_commit_changes(updated_files, "Auto-update portfolio sections and assets", branch)
 
+    if failed:
+        logging.error(f"\n❌ {len(failed)} file(s) failed to update or validate: {', '.join(failed)}")
+        return 1
     logging.info("\n✅ All updates applied. Review changes and redeploy.")
+    return 0
 
 if __name__ == "__main__":
     configure_logging()
@@ -297,9 +725,15 @@ if __name__ == "__main__":
     parser.add_argument('--git-commit', action='store_true', help='Commit changes to git after update')
     parser.add_argument('--undo', action='store_true', help='Restore files from backups (undo changes)')
     parser.add_argument('--branch', default=GIT_BRANCH, help='Git branch to commit to (default: main)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of files to transform and validate in parallel (default: 1)')
+    parser.add_argument('--force', action='store_true',
+                        help=f'Process every file even if its inputs are unchanged since the last run ({STATE_FILE}); '
+                             'with --undo, restore backups that do not match the last recorded update')
     args = parser.parse_args()
 
-    main(dry_run=args.dry_run, git_commit=args.git_commit, undo=args.undo, branch=args.branch)
+    raise SystemExit(main(dry_run=args.dry_run, git_commit=args.git_commit, undo=args.undo, branch=args.branch,
+                          jobs=args.jobs, force=args.force))
 
 # End of script
 
@@ -1,17 +1,1417 @@
 import os
+import re
+import gzip
+import bisect
+import sys
 import zipfile
 import json
+import html
 import time
+import types
+import io
+import struct
+import hashlib
+import marshal
+import argparse
+import contextlib
+import threading
+import textwrap
+import functools
+import collections
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from html.parser import HTMLParser
+
+try:
+    import brotli  # pip install brotli
+except ImportError:
+    brotli = None
 from pathlib import Path
 
+BUILD_CACHE_DIR = Path(".build-cache")
+
+# Text outputs that get .gz/.br siblings when --precompress is on
+PRECOMPRESS_SUFFIXES = (".html", ".css", ".js", ".json", ".map", ".svg", ".xml", ".txt", ".webmanifest")
+# A sidecar is only kept if it is at most this fraction of the original size
+PRECOMPRESS_MAX_RATIO = 0.9
+MANIFEST_VERSION = 3
+
+# Already-compressed formats are STORED in the archive; deflating them again only costs time
+INCOMPRESSIBLE_SUFFIXES = frozenset({
+    ".woff", ".woff2", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif",
+    ".zip", ".gz", ".br", ".7z",
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _fonttools():
+    """fontTools' subsetter, TTFont and instancer, or None when fontTools is not installed
+
+    Imported on first use: fontTools.subset alone takes far longer to import
+    than this module, and only --subset-fonts needs it.
+    """
+    try:
+        from fontTools import subset, version  # pip install fonttools
+        from fontTools.ttLib import TTFont
+        from fontTools.varLib import instancer
+    except ImportError:
+        return None
+    return types.SimpleNamespace(subset=subset, TTFont=TTFont, instancer=instancer, version=version)
+
+
+@functools.lru_cache(maxsize=None)
+def _pillow():
+    """PIL.Image, imported on first use, or None when Pillow is not installed"""
+    try:
+        from PIL import Image  # pip install Pillow
+    except ImportError:
+        return None
+    return Image
+
+
+def _archive_timestamp():
+    """Fixed member timestamp: SOURCE_DATE_EPOCH when set, else the zip epoch (1980-01-01)"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        stamp = time.gmtime(int(epoch))[:6]
+        return max(stamp, (1980, 1, 1, 0, 0, 0))
+    return (1980, 1, 1, 0, 0, 0)
+
+
+def _code_fingerprint(code, digest=None):
+    """Hash a code object by bytecode, names and constants (not line numbers)"""
+    digest = digest or hashlib.sha256()
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _code_fingerprint(const, digest)
+        elif isinstance(const, frozenset):
+            digest.update(repr(sorted(map(repr, const))).encode("utf-8"))
+        else:
+            digest.update(repr(const).encode("utf-8"))
+    return digest
+
+
+class _SelectorTokenCollector(HTMLParser):
+    """Collect the tag names, .classes and #ids used in a document
+
+    With stop_after set, collection ends after the element carrying that id
+    closes (e.g. the hero section for above-the-fold markup).
+    """
+
+    def __init__(self, stop_after=None):
+        super().__init__()
+        self.tokens = set()
+        self.stop_after = stop_after
+        self._stop_tag = None
+        self._depth = 0
+        self._done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self._done:
+            return
+        self.tokens.add(tag)
+        attrs = dict(attrs)
+        self.tokens.update(f".{name}" for name in (attrs.get("class") or "").split())
+        if attrs.get("id"):
+            self.tokens.add(f"#{attrs['id']}")
+        if self._stop_tag is None and self.stop_after and attrs.get("id") == self.stop_after:
+            self._stop_tag = tag
+        if tag == self._stop_tag:
+            self._depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == self._stop_tag and not self._done:
+            self._depth -= 1
+            self._done = self._depth == 0
+
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_PSEUDO_RE = re.compile(r"::?[\w-]+(\([^)]*\))?")
+_CSS_ATTRIBUTE_RE = re.compile(r"\[[^\]]*\]")
+_CSS_COMBINATOR_RE = re.compile(r"\s*[>+~]\s*|\s+")
+_CSS_SIMPLE_SELECTOR_RE = re.compile(r"[.#]?[\w-]+")
+
+
+def _skip_css_string(css, i):
+    """Return the index just past the quoted string starting at css[i]"""
+    quote = css[i]
+    i += 1
+    while i < len(css) and css[i] != quote:
+        i += 2 if css[i] == "\\" else 1
+    return i + 1
+
+
+def parse_css_rules(css):
+    """Split a stylesheet into (prelude, body) pairs
+
+    At-rule blocks such as @media keep their nested rules in body, and
+    block-less statements like @import have a body of None.
+    """
+    css = _CSS_COMMENT_RE.sub("", css)
+    rules = []
+    i = 0
+    while i < len(css):
+        j = i
+        while j < len(css) and css[j] not in "{;":
+            j = _skip_css_string(css, j) if css[j] in "'\"" else j + 1
+        if j >= len(css):
+            break
+        prelude = css[i:j].strip()
+        if css[j] == ";":
+            if prelude:
+                rules.append((prelude, None))
+            i = j + 1
+            continue
+        depth = 0
+        k = j
+        while k < len(css):
+            if css[k] in "'\"":
+                k = _skip_css_string(css, k)
+                continue
+            if css[k] == "{":
+                depth += 1
+            elif css[k] == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+            k += 1
+        rules.append((prelude, css[j + 1:k]))
+        i = k + 1
+    return rules
+
+
+def split_selectors(prelude):
+    """Split a selector list on top-level commas"""
+    selectors, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            selectors.append(prelude[start:i].strip())
+            start = i + 1
+    selectors.append(prelude[start:].strip())
+    return [selector for selector in selectors if selector]
+
+
+def selector_matches(selector, tokens):
+    """True if every tag, class and id in the selector occurs in tokens
+
+    Pseudo-classes and attribute selectors are ignored, so the match is
+    deliberately generous: :hover and [data-x] rules survive if their
+    element does.
+    """
+    selector = _CSS_ATTRIBUTE_RE.sub("", _CSS_PSEUDO_RE.sub("", selector))
+    for compound in _CSS_COMBINATOR_RE.split(selector.strip()):
+        for simple in _CSS_SIMPLE_SELECTOR_RE.findall(compound):
+            if simple not in tokens:
+                return False
+    return True
+
+
+def _format_css_rule(prelude, body):
+    return f"{prelude} {{ {' '.join(body.split())} }}"
+
+
+def extract_critical_css(css, tokens):
+    """Return the rules of css whose selectors match the given document tokens
+
+    @font-face rules are always kept, @media/@supports blocks are filtered
+    recursively and @keyframes are kept only when a kept rule names them.
+    """
+    kept, keyframes = [], []
+    for prelude, body in parse_css_rules(css):
+        if body is None:
+            kept.append(f"{prelude};")
+        elif prelude.startswith("@font-face"):
+            kept.append(_format_css_rule(prelude, body))
+        elif prelude.startswith(("@media", "@supports")):
+            inner = extract_critical_css(body, tokens)
+            if inner:
+                kept.append(f"{prelude} {{\n{inner}\n}}")
+        elif prelude.startswith(("@keyframes", "@-webkit-keyframes")):
+            keyframes.append((prelude.split(None, 1)[-1], f"{prelude} {{ {' '.join(body.split())} }}"))
+        elif not prelude.startswith("@"):
+            selectors = [s for s in split_selectors(prelude) if selector_matches(s, tokens)]
+            if selectors:
+                kept.append(_format_css_rule(", ".join(selectors), body))
+    critical = "\n".join(kept)
+    kept.extend(rule for name, rule in keyframes if re.search(rf"\b{re.escape(name)}\b", critical))
+    return "\n".join(kept)
+
+
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>(.*?)</script\s*>", re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r"(<style\b[^>]*>)(.*?)(</style\s*>)", re.DOTALL | re.IGNORECASE)
+_JS_WORD_RE = re.compile(r"[A-Za-z_][\w-]*")
+_INLINE_SCRIPT_RE = re.compile(r"([ \t]*)<script>(.*?)</script\s*>", re.DOTALL | re.IGNORECASE)
+
+
+def page_selector_tokens(html, scripts=()):
+    """Tag, .class and #id tokens a page can match, including ones its scripts may add
+
+    Every word in the page's inline scripts and in the given script sources
+    counts as a possible tag, class and id, so class names built or toggled
+    from JavaScript survive.
+    """
+    collector = _SelectorTokenCollector()
+    collector.feed(html)
+    tokens = set(collector.tokens)
+    for script in [*_SCRIPT_RE.findall(html), *scripts]:
+        for word in _JS_WORD_RE.findall(script):
+            tokens.update((word, f".{word}", f"#{word}"))
+    return tokens
+
+
+def split_shared_css(styles):
+    """Split the leading rules that all the stylesheets have in common off them; returns (shared css, rests)
+
+    Only a common prefix moves, so loading the shared rules ahead of what is
+    left keeps the cascade order of every page. Rules compare by prelude and
+    whitespace-normalised body.
+    """
+    blanked = [_CSS_COMMENT_RE.sub(lambda match: re.sub(r"[^\n]", " ", match.group(0)), css) for css in styles]
+    rules = [list(_iter_css_rules(css)) for css in blanked]
+
+    def key(rule):
+        _, prelude, body, _ = rule
+        return prelude, None if body is None else " ".join(body.split())
+
+    count = 0
+    while all(count < len(page_rules) for page_rules in rules) and len(
+            {key(page_rules[count]) for page_rules in rules}) == 1:
+        count += 1
+    if not count:
+        return "", list(styles)
+    shared = "\n".join(f"{prelude};" if body is None else _format_css_rule(prelude, body)
+                       for prelude, body in map(key, rules[0][:count]))
+    rests = []
+    for css, text, page_rules in zip(styles, blanked, rules):
+        offset, _, body, body_offset = page_rules[count - 1]
+        end = body_offset + len(body) + 1 if body is not None else text.index(";", offset) + 1
+        rests.append(css[end:])
+    return shared + "\n", rests
+
+
+def _removal_span(css, start, end):
+    """Widen [start, end) to whole lines when the rule stands on lines of its own"""
+    line_start = css.rfind("\n", 0, start) + 1
+    if not css[line_start:start].strip():
+        start = line_start
+    line_end = css.find("\n", end)
+    line_end = len(css) if line_end == -1 else line_end + 1
+    if not css[end:line_end].strip():
+        end = line_end
+    return start, end
+
+
+def purge_css(css, tokens):
+    """Drop the rules and selectors of css that match none of the tokens; returns (css, removed selectors)
+
+    Formatting and comments of what is kept are preserved. @font-face and
+    other at-rules are kept, @media/@supports blocks are purged recursively
+    (and dropped when empty) and @keyframes survive only while something
+    still names them.
+    """
+    blanked = _CSS_COMMENT_RE.sub(lambda match: re.sub(r"[^\n]", " ", match.group(0)), css)
+    edits, removed, keyframes = [], [], []
+
+    def purge(base, text):
+        emptied = True
+        for offset, prelude, body, body_offset in _iter_css_rules(text):
+            start = base + offset
+            end = base + body_offset + len(body) + 1 if body is not None else blanked.index(";", start) + 1
+            if body is None or prelude.startswith("@") and not prelude.startswith(
+                    ("@media", "@supports", "@keyframes", "@-webkit-keyframes")):
+                emptied = False
+            elif prelude.startswith(("@keyframes", "@-webkit-keyframes")):
+                keyframes.append((prelude.split(None, 1)[-1], start, end))
+                emptied = False
+            elif prelude.startswith(("@media", "@supports")):
+                if purge(base + body_offset, body):
+                    edits.append((*_removal_span(blanked, start, end), ""))
+                else:
+                    emptied = False
+            else:
+                selectors = split_selectors(prelude)
+                kept = [selector for selector in selectors if selector_matches(selector, tokens)]
+                removed.extend(selector for selector in selectors if selector not in kept)
+                if not kept:
+                    edits.append((*_removal_span(blanked, start, end), ""))
+                    continue
+                emptied = False
+                if len(kept) < len(selectors):
+                    edits.append((start, start + len(prelude), ", ".join(kept)))
+        return emptied
+
+    purge(0, blanked)
+
+    def apply(text, edits):
+        spans = []
+        # Nested removals (a rule inside a dropped @media) are covered by the outer span
+        for start, end, replacement in sorted(edits, key=lambda edit: (edit[0], -edit[1])):
+            if not spans or start >= spans[-1][1]:
+                spans.append((start, end, replacement))
+        for start, end, replacement in reversed(spans):
+            text = text[:start] + replacement + text[end:]
+        return text
+
+    remaining = apply(blanked, edits + [(start, end, "") for _, start, end in keyframes])
+    for name, start, end in keyframes:
+        if not re.search(rf"(?<![\w-]){re.escape(name)}(?![\w-])", remaining) and name not in tokens:
+            edits.append((*_removal_span(blanked, start, end), ""))
+            removed.append(f"@keyframes {name}")
+    return re.sub(r"\n[ \t]*\n(?:[ \t]*\n)+", "\n\n", apply(css, edits)), removed
+
+
+_VLQ_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+def _vlq(value):
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    encoded = ""
+    while True:
+        digit = value & 31
+        value >>= 5
+        encoded += _VLQ_CHARS[digit | 32 if value else digit]
+        if not value:
+            return encoded
+
+
+def build_source_map(file, source, source_content, segments):
+    """Build a v3 source map from (gen_line, gen_col, src_line, src_col) segments"""
+    lines, previous_line = [], None
+    prev_src_line = prev_src_col = 0
+    for gen_line, gen_col, src_line, src_col in sorted(segments):
+        while len(lines) <= gen_line:
+            lines.append([])
+        if previous_line != gen_line:
+            prev_gen_col, previous_line = 0, gen_line
+        lines[gen_line].append(
+            _vlq(gen_col - prev_gen_col) + _vlq(0)
+            + _vlq(src_line - prev_src_line) + _vlq(src_col - prev_src_col)
+        )
+        prev_gen_col, prev_src_line, prev_src_col = gen_col, src_line, src_col
+    return {
+        "version": 3,
+        "file": file,
+        "sources": [source],
+        "sourcesContent": [source_content],
+        "names": [],
+        "mappings": ";".join(",".join(line) for line in lines),
+    }
+
+
+def _decode_vlq(text):
+    values, value, shift = [], 0, 0
+    for char in text:
+        digit = _VLQ_CHARS.index(char)
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value = shift = 0
+    return values
+
+
+def decode_source_map(source_map):
+    """The (gen_line, gen_col, src_line, src_col) segments of a map written by build_source_map"""
+    segments = []
+    src_line = src_col = 0
+    for gen_line, line in enumerate(source_map["mappings"].split(";")):
+        gen_col = 0
+        for segment in filter(None, line.split(",")):
+            fields = _decode_vlq(segment)
+            gen_col += fields[0]
+            src_line += fields[2]
+            src_col += fields[3]
+            segments.append((gen_line, gen_col, src_line, src_col))
+    return segments
+
+
+def splice(text, edits):
+    """Apply non-overlapping (start, end, replacement) edits to text"""
+    pieces, position = [], 0
+    for start, end, replacement in sorted(edits):
+        pieces += [text[position:start], replacement]
+        position = end
+    pieces.append(text[position:])
+    return "".join(pieces)
+
+
+def splice_source_mapped(text, edits, source_map):
+    """Apply edits to generated text and move the segments of its source map along with them
+
+    A segment after an edit shifts by the change in length before it; one
+    inside a replaced span moves to the start of the replacement.
+    """
+    edits = sorted(edits)
+    spliced = splice(text, edits)
+    old_starts, new_starts = _line_starts(text), _line_starts(spliced)
+    ends, shifts, shift = [], [], 0
+    for start, end, replacement in edits:
+        shift += len(replacement) - (end - start)
+        ends.append(end)
+        shifts.append(shift)
+    segments = []
+    for gen_line, gen_col, src_line, src_col in decode_source_map(source_map):
+        offset = old_starts[gen_line] + gen_col
+        done = bisect.bisect_right(ends, offset)
+        if done < len(edits) and edits[done][0] < offset:
+            offset = edits[done][0]
+        offset += shifts[done - 1] if done else 0
+        segments.append((*_offset_to_position(new_starts, offset), src_line, src_col))
+    return spliced, build_source_map(source_map["file"], source_map["sources"][0],
+                                     source_map["sourcesContent"][0], segments)
+
+
+def _line_starts(text):
+    starts = [0]
+    starts.extend(match.end() for match in re.finditer("\n", text))
+    return starts
+
+
+def _offset_to_position(starts, offset):
+    line = bisect.bisect_right(starts, offset) - 1
+    return line, offset - starts[line]
+
+
+def _iter_css_rules(css):
+    """Yield (offset, prelude, body, body_offset) for the top-level rules of comment-free css"""
+    i = 0
+    while i < len(css):
+        j = i
+        while j < len(css) and css[j] not in "{;":
+            j = _skip_css_string(css, j) if css[j] in "'\"" else j + 1
+        if j >= len(css):
+            return
+        raw = css[i:j]
+        offset = i + len(raw) - len(raw.lstrip())
+        if css[j] == ";":
+            if raw.strip():
+                yield offset, raw.strip(), None, None
+            i = j + 1
+            continue
+        depth = 0
+        k = j
+        while k < len(css):
+            if css[k] in "'\"":
+                k = _skip_css_string(css, k)
+                continue
+            if css[k] == "{":
+                depth += 1
+            elif css[k] == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+            k += 1
+        yield offset, raw.strip(), css[j + 1:k], j + 1
+        i = k + 1
+
+
+def _split_outside(text, separator):
+    """Split on separator outside quotes and parentheses"""
+    parts, depth, start, i = [], 0, 0, 0
+    while i < len(text):
+        char = text[i]
+        if char in "'\"":
+            i = _skip_css_string(text, i)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+        i += 1
+    parts.append(text[start:])
+    return parts
+
+
+def _collapse_css_value(value):
+    """Collapse whitespace and drop spaces after commas, leaving quoted strings alone"""
+    pieces, i, start = [], 0, 0
+    while i < len(value):
+        if value[i] in "'\"":
+            end = _skip_css_string(value, i)
+            pieces.append(re.sub(r"\s*,\s*", ",", re.sub(r"\s+", " ", value[start:i])))
+            pieces.append(value[i:end])
+            start = i = end
+            continue
+        i += 1
+    pieces.append(re.sub(r"\s*,\s*", ",", re.sub(r"\s+", " ", value[start:])))
+    return "".join(pieces).strip().replace(" !important", "!important")
+
+
+def _condense_box_value(value):
+    """Shorten a four-value margin/padding shorthand (a b a b -> a b)"""
+    parts = value.split(" ")
+    if len(parts) != 4 or "!important" in value or "(" in value:
+        return value
+    top, right, bottom, left = parts
+    if right == left:
+        parts = [top, right] if top == bottom else [top, right, bottom]
+        if len(parts) == 2 and top == right:
+            parts = [top]
+    return " ".join(parts)
+
+
+def _minify_declarations(body):
+    declarations = []
+    for declaration in _split_outside(body, ";"):
+        name, sep, value = declaration.partition(":")
+        if sep and name.strip():
+            declarations.append([name.strip(), _collapse_css_value(value)])
+    # Merge complete, non-!important margin/padding longhands into one shorthand
+    for box in ("margin", "padding"):
+        sides = [f"{box}-{side}" for side in ("top", "right", "bottom", "left")]
+        found = {name: value for name, value in declarations if name in sides or name == box}
+        if all(side in found for side in sides) and box not in found and not any(
+                "!important" in found[side] for side in sides):
+            first = next(i for i, (name, _) in enumerate(declarations) if name in sides)
+            shorthand = [box, " ".join(found[side] for side in sides)]
+            declarations = [d for d in declarations if d[0] not in sides]
+            declarations.insert(first, shorthand)
+    for declaration in declarations:
+        if declaration[0] in ("margin", "padding"):
+            declaration[1] = _condense_box_value(declaration[1])
+    return ";".join(f"{name}:{value}" for name, value in declarations)
+
+
+def _minify_css_rules(css, base, out, segments):
+    for offset, prelude, body, body_offset in _iter_css_rules(css):
+        segments.append((sum(len(chunk) for chunk in out), base + offset))
+        if body is None:
+            out.append(re.sub(r"\s+", " ", prelude) + ";")
+        elif prelude.startswith("@") and "{" in body:
+            out.append(re.sub(r"\s+", " ", prelude) + "{")
+            _minify_css_rules(body, base + body_offset, out, segments)
+            out.append("}")
+        else:
+            declarations = _minify_declarations(body)
+            if declarations:
+                selector = re.sub(r"\s*([,>+~])\s*", r"\1", re.sub(r"\s+", " ", prelude))
+                out.append(f"{selector}{{{declarations}}}")
+
+
+def minify_css(css):
+    """Minify a stylesheet
+
+    Returns (code, segments) where each segment is a (gen_col, src_offset)
+    pair marking the start of a rule, for source maps.
+    """
+    # Blank comments out instead of removing them so source offsets stay valid
+    blanked = _CSS_COMMENT_RE.sub(lambda m: re.sub(r"\S", " ", m.group()), css)
+    out, segments = [], []
+    _minify_css_rules(blanked, 0, out, segments)
+    return "".join(out), segments
+
+
+_JS_REGEX_PREFIX_RE = re.compile(r"(?:^|[(,=:\[!&|?{};+\-*%<>~^]|\b(?:return|typeof|case|do|else|in|of|void|yield|await|delete|new))\s*$")
+_JS_TIGHT = set("{}()[];,:=?!&|<>")
+_JS_JOIN_AFTER = set("{[(,;")
+_JS_JOIN_BEFORE = set(")]},;.")
+
+
+def minify_js(source):
+    """Strip comments and redundant whitespace from JavaScript
+
+    Strings, template literals and regular expressions are copied verbatim.
+    Line breaks are kept wherever automatic semicolon insertion could depend
+    on them. Returns (code, segments) where each segment is a
+    (gen_line, gen_col, src_line, src_col) mapping for the first token taken
+    from each source line.
+    """
+    out, segments = [], []
+    gen_line = gen_col = 0
+    src_starts = _line_starts(source)
+    pending_space = pending_newline = False
+    mapped_line = -1
+    templates = []  # brace depth of each open ${ ... } template expression
+    i, n = 0, len(source)
+
+    def emit(text, at):
+        nonlocal gen_line, gen_col, pending_space, pending_newline, mapped_line
+        last = out[-1][-1] if out else ""
+        if out and pending_newline and last not in _JS_JOIN_AFTER and text[0] not in _JS_JOIN_BEFORE:
+            out.append("\n")
+            gen_line, gen_col = gen_line + 1, 0
+        elif out and (pending_space or pending_newline) and last not in _JS_TIGHT and text[0] not in _JS_TIGHT:
+            out.append(" ")
+            gen_col += 1
+        pending_space = pending_newline = False
+        src_line, src_col = _offset_to_position(src_starts, at)
+        if src_line != mapped_line:
+            segments.append((gen_line, gen_col, src_line, src_col))
+            mapped_line = src_line
+        out.append(text)
+        newlines = text.count("\n")
+        if newlines:
+            gen_line += newlines
+            gen_col = len(text) - text.rfind("\n") - 1
+        else:
+            gen_col += len(text)
+
+    def scan_template(start):
+        """Return the end of a template literal chunk and whether it stopped at ${"""
+        j = start
+        while j < n:
+            if source[j] == "\\":
+                j += 2
+            elif source[j] == "`":
+                return j + 1, False
+            elif source.startswith("${", j):
+                return j + 2, True
+            else:
+                j += 1
+        return n, False
+
+    while i < n:
+        char = source[i]
+        if char == "\n":
+            pending_newline = True
+            i += 1
+        elif char in " \t\r":
+            pending_space = True
+            i += 1
+        elif source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            if "\n" in source[i:end]:
+                pending_newline = True
+            else:
+                pending_space = True
+            i = end
+        elif char in "'\"":
+            j = i + 1
+            while j < n and source[j] != char and source[j] != "\n":
+                j += 2 if source[j] == "\\" else 1
+            emit(source[i:j + 1], i)
+            i = j + 1
+        elif char == "`" or (char == "}" and templates and templates[-1] == 0):
+            if char == "}":
+                templates.pop()
+            end, expression = scan_template(i + 1)
+            emit(source[i:end], i)
+            if expression:
+                templates.append(0)
+            i = end
+        elif char == "/" and _JS_REGEX_PREFIX_RE.search("".join(out[-3:])):
+            j, in_class = i + 1, False
+            while j < n and source[j] != "\n":
+                if source[j] == "\\":
+                    j += 2
+                    continue
+                if source[j] == "[":
+                    in_class = True
+                elif source[j] == "]":
+                    in_class = False
+                elif source[j] == "/" and not in_class:
+                    break
+                j += 1
+            emit(source[i:j + 1], i)
+            i = j + 1
+        else:
+            if templates and char in "{}":
+                templates[-1] += 1 if char == "{" else -1
+            j = i + 1
+            if char.isalnum() or char in "_$":
+                while j < n and (source[j].isalnum() or source[j] in "_$."):
+                    j += 1
+            emit(source[i:j], i)
+            i = j
+    return "".join(out), segments
+
+
+_HTML_BLOCK_TAGS = frozenset("""
+    html head body meta link title script style noscript base div section nav header footer main
+    article aside ul ol li dl dt dd h1 h2 h3 h4 h5 h6 p pre form fieldset table thead tbody tr td th
+    br hr template picture source
+""".split())
+_HTML_RAW_RE = re.compile(r"(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)", re.DOTALL | re.IGNORECASE)
+_HTML_TAG_NAME_RE = re.compile(r"</?([a-zA-Z][\w-]*)")
+
+
+def _minify_html_markup(markup):
+    markup = re.sub(r"<!--(?!\[if).*?-->", "", markup, flags=re.DOTALL)
+    parts = re.split(r"(<[^>]+>)", markup)
+    for index in range(0, len(parts), 2):
+        text = parts[index]
+        if text.strip():
+            parts[index] = re.sub(r"\s+", " ", text)
+            continue
+        if not text:
+            continue
+        neighbours = [parts[index - 1] if index else "", parts[index + 1] if index + 1 < len(parts) else ""]
+        names = [m.group(1).lower() for m in map(_HTML_TAG_NAME_RE.match, neighbours) if m]
+        block = not names or any(name in _HTML_BLOCK_TAGS for name in names) or any(
+            n.startswith("<!") for n in neighbours)
+        parts[index] = "" if block else " "
+    return "".join(parts)
+
+
+def minify_html(html):
+    """Collapse whitespace and drop comments in HTML, minifying inline <script> and <style>
+
+    Whitespace is removed outright only next to block-level tags; elsewhere
+    runs collapse to one space so inline layout is unchanged. <pre> and
+    <textarea> content is left untouched.
+    """
+    out, last = [], 0
+    for match in _HTML_RAW_RE.finditer(html):
+        out.append(_minify_html_markup(html[last:match.start()]))
+        open_tag, tag, content, close_tag = match.groups()
+        tag = tag.lower()
+        if tag == "script" and "src=" not in open_tag and re.search(r"type=[\"'](?!text/javascript|module)", open_tag) is None:
+            content = minify_js(content)[0]
+        elif tag == "style":
+            content = minify_css(content)[0]
+        out.append(_minify_html_markup(open_tag) + content + close_tag)
+        last = match.end()
+    out.append(_minify_html_markup(html[last:]))
+    return "".join(out).strip()
+
+
+# Text outputs that can reference other build outputs by URL
+TEXT_REFERENCE_SUFFIXES = (".html", ".css", ".js", ".json", ".webmanifest")
+
+
+def _reference_forms(target, referrer):
+    """The absolute URL of target and its path relative to the referring file's directory"""
+    return "/" + target, os.path.relpath(target, os.path.dirname(referrer) or ".").replace(os.sep, "/")
+
+
+def reference_edits(text, referrer, renamed):
+    """(start, end, replacement) edits that point references to renamed outputs at their new names
+
+    Both root-absolute URLs (/assets/css/main.css) and paths relative to the
+    referring file (InterVariable.woff2 inside assets/fonts/fonts.css) are
+    rewritten when they appear as a whole quoted, url() or attribute value.
+    """
+    replacements = {}
+    for old, new in renamed.items():
+        for old_form, new_form in zip(_reference_forms(old, referrer), _reference_forms(new, referrer)):
+            replacements[old_form] = new_form
+    if not replacements:
+        return []
+    pattern = re.compile(
+        r"(?<=[\"'(=\s,])(" + "|".join(map(re.escape, sorted(replacements, key=len, reverse=True)))
+        + r")(?=[\"')\s?#,>])"
+    )
+    return [(match.start(), match.end(), replacements[match.group(1)]) for match in pattern.finditer(text)]
+
+
+def image_size(data):
+    """(width, height) from a PNG, GIF, JPEG, WebP or AVIF header, or None"""
+    try:
+        if data.startswith(b"\x89PNG\r\n\x1a\n"):
+            return struct.unpack(">II", data[16:24])
+        if data.startswith((b"GIF87a", b"GIF89a")):
+            return struct.unpack("<HH", data[6:10])
+        if data.startswith(b"RIFF") and data[8:12] == b"WEBP":
+            chunk = data[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", data[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                bits = int.from_bytes(data[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+        if data.startswith(b"\xff\xd8"):
+            offset = 2
+            while offset + 9 < len(data):
+                marker, length = data[offset + 1], struct.unpack(">H", data[offset + 2:offset + 4])[0]
+                if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                    height, width = struct.unpack(">HH", data[offset + 5:offset + 9])
+                    return width, height
+                offset += 2 + length
+        if data[4:12] in (b"ftypavif", b"ftypavis"):
+            offset = data.find(b"ispe")
+            if offset != -1:
+                return struct.unpack(">II", data[offset + 8:offset + 16])
+    except struct.error:
+        pass
+    return None
+
+
+_MEDIA_TAG_RE = re.compile(r"<(img|iframe)\b[^>]*>", re.IGNORECASE)
+
+
+def _element_end(html, element_id):
+    """Offset just past the element with this id (its closing tag), or None if there is none"""
+    start = re.search(rf"<([a-zA-Z][\w-]*)\b[^>]*\sid=([\"']?){re.escape(element_id)}\2(?=[\s/>])[^>]*>", html)
+    if not start:
+        return None
+    depth = 0
+    for tag in re.finditer(rf"<(/?){start.group(1)}\b[^>]*>", html[start.start():]):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return start.start() + tag.end()
+    return len(html)
+
+
+def lazy_media_markup(html, intrinsic_size, fold_id=None):
+    """Lazy-load <img> and <iframe> tags below the fold and give images a size
+
+    Media up to the end of the fold_id element stays eager, and the first
+    <img> there (or on the page, when it has no fold_id element) gets
+    fetchpriority="high". Every other image gets loading="lazy"
+    decoding="async" and every other iframe loading="lazy".
+    Images without width/height get them from intrinsic_size(src), which
+    returns (width, height) or None; a lone width or height is completed
+    from the aspect ratio. Attributes already present are kept.
+
+    Returns the rewritten markup and the number of lazy-loaded and sized tags.
+    """
+    fold_end = _element_end(html, fold_id) if fold_id else None
+    lcp = next((match.start() for match in _MEDIA_TAG_RE.finditer(html)
+                if match.group(1).lower() == "img" and match.start() < (fold_end or len(html))), None)
+    counts = {"lazy": 0, "sized": 0}
+
+    def rewrite(match):
+        tag, attrs = match.group(0), _html_attributes(match.group(0))
+        above_fold = fold_end is not None and match.start() < fold_end
+        added = {}
+        if match.group(1).lower() == "img":
+            size = intrinsic_size(attrs["src"]) if attrs.get("src") and not (
+                attrs.get("width") and attrs.get("height")) else None
+            if size and all(size):
+                width, height = size
+                if attrs.get("width", "").isdigit():
+                    added["height"] = round(int(attrs["width"]) * height / width)
+                elif attrs.get("height", "").isdigit():
+                    added["width"] = round(int(attrs["height"]) * width / height)
+                else:
+                    added.update(width=width, height=height)
+                counts["sized"] += 1
+            if match.start() == lcp:
+                added["fetchpriority"] = "high"
+            elif not above_fold:
+                added.update(loading="lazy", decoding="async")
+        elif not above_fold:
+            added["loading"] = "lazy"
+        added = {name: value for name, value in added.items() if name not in attrs}
+        if "loading" in added:
+            counts["lazy"] += 1
+        if not added:
+            return tag
+        end = -2 if tag.endswith("/>") else -1
+        return tag[:end].rstrip() + "".join(f' {name}="{value}"' for name, value in added.items()) + tag[end:]
+
+    return _MEDIA_TAG_RE.sub(rewrite, html), counts["lazy"], counts["sized"]
+
+
+class _PageResourceCollector(HTMLParser):
+    """Collect the URLs a page fetches while loading and the inline <style> text in its <head>
+
+    Stylesheets, preloads, scripts, images and iframes count; lazy-loaded
+    images and iframes do not. Module script URLs, link targets and the
+    URLs of resource hints already in the page are collected on the side.
+    """
+
+    LOAD_RELS = {"stylesheet", "preload", "modulepreload"}
+    HINT_RELS = {"preload", "modulepreload", "preconnect", "dns-prefetch", "prefetch"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.urls = []
+        self.head_styles = []
+        self.modules = []
+        self.links = []
+        self.hinted = set()
+        self._in_head = self._in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "head":
+            self._in_head = True
+        elif tag == "body":
+            self._in_head = False
+        elif tag == "style" and self._in_head:
+            self._in_style = True
+            self.head_styles.append("")
+        elif tag == "link":
+            rels = set((attrs.get("rel") or "").lower().split())
+            if self.LOAD_RELS & rels:
+                self.urls.append(attrs.get("href"))
+            if self.HINT_RELS & rels:
+                self.hinted.add(attrs.get("href"))
+        elif tag == "script":
+            self.urls.append(attrs.get("src"))
+            if (attrs.get("type") or "").lower() == "module" and attrs.get("src"):
+                self.modules.append(attrs["src"])
+        elif tag == "a" and attrs.get("href"):
+            self.links.append(attrs["href"])
+        elif tag in ("img", "iframe") and (attrs.get("loading") or "").lower() != "lazy":
+            self.urls.append(attrs.get("src"))
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self._in_head = False
+        elif tag == "style":
+            self._in_style = False
+
+    def handle_data(self, data):
+        if self._in_style:
+            self.head_styles[-1] += data
+
+
+def _resolve_output_url(url, referrer):
+    """The build output a same-site URL refers to, or None for external and data URLs"""
+    url = url.split("#", 1)[0].split("?", 1)[0]
+    if not url or re.match(r"^([a-z][\w+.-]*:|//)", url, re.IGNORECASE):
+        return None
+    path = url[1:] if url.startswith("/") else os.path.join(os.path.dirname(referrer), url)
+    path = os.path.normpath(path).replace(os.sep, "/")
+    if url.endswith("/") or path == ".":
+        path = "index.html" if path == "." else f"{path}/index.html"
+    return path
+
+
+_JS_IMPORT_RE = re.compile(r"""(?:\bimport|\bexport\b[^;'"]*?\bfrom)\s*(?:[\w*{}\s,$]+\bfrom\s*)?['"]([^'"]+)['"]""")
+_URL_ORIGIN_RE = re.compile(r"^(https?:)?//[^/?#]+", re.IGNORECASE)
+FONT_MIME_TYPES = {".woff2": "font/woff2", ".woff": "font/woff", ".ttf": "font/ttf", ".otf": "font/otf"}
+# Leading bytes of a real font file of each type; placeholder fonts are text
+FONT_SIGNATURES = {".woff2": (b"wOF2",), ".woff": (b"wOFF",), ".ttf": (b"\x00\x01\x00\x00", b"true"), ".otf": (b"OTTO",)}
+
+
+def resource_hint_markup(html, hints):
+    """Insert <link> tags for hints ([(rel, href, extra attributes), ...]) after the page's <title>"""
+    if not hints:
+        return html
+    tags = []
+    for rel, href, attrs in hints:
+        extra = "".join(f" {name}" if value is True else f' {name}="{value}"' for name, value in attrs.items())
+        tags.append(f'<link rel="{rel}" href="{href}"{extra}>')
+    anchor = re.search(r"</title\s*>", html, re.IGNORECASE) or re.search(r"</head\s*>", html, re.IGNORECASE)
+    if anchor is None:
+        return html
+    at = anchor.end() if anchor.group(0).lower().startswith("</title") else anchor.start()
+    indent = re.search(r"\n([ \t]*)<title", html, re.IGNORECASE)
+    separator = f"\n{indent.group(1)}" if indent else ""
+    return html[:at] + "".join(separator + tag for tag in tags) + html[at:]
+
+
+# Responsive image formats in <source> preference order: (extension, MIME type, Pillow format, save options)
+IMAGE_FORMATS = (
+    ("avif", "image/avif", "AVIF", {"quality": 50}),
+    ("webp", "image/webp", "WEBP", {"quality": 80}),
+)
+
+_IMG_TAG_RE = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_HTML_ATTR_RE = re.compile(r"""([\w:-]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?""")
+
+
+def _html_attributes(tag):
+    attrs = {}
+    for match in _HTML_ATTR_RE.finditer(tag, _HTML_TAG_NAME_RE.match(tag).end()):
+        name, *values = match.groups()
+        attrs[name.lower()] = next((value for value in values if value is not None), "")
+    return attrs
+
+
+def picture_markup(html, variants):
+    """Wrap each <img> whose src has responsive variants in a <picture>
+
+    variants maps an image URL to [(mime type, [(width, url), ...]), ...] in
+    <source> preference order. sizes comes from the img's width attribute;
+    images already inside a <picture> are left alone.
+    """
+    def wrap(match):
+        tag = match.group(0)
+        before = html[:match.start()].lower()
+        if before.rfind("<picture") > before.rfind("</picture"):
+            return tag
+        attrs = _html_attributes(tag)
+        sources = variants.get(attrs.get("src"))
+        if not sources:
+            return tag
+        sizes = f"{attrs['width']}px" if attrs.get("width", "").isdigit() else "100vw"
+        markup = "".join(
+            f'<source type="{mime}" srcset="{", ".join(f"{url} {width}w" for width, url in candidates)}" '
+            f'sizes="{sizes}">'
+            for mime, candidates in sources
+        )
+        return f"<picture>{markup}{tag}</picture>"
+
+    return _IMG_TAG_RE.sub(wrap, html)
+
+
+_FONT_FACE_RE = re.compile(r"@font-face\s*\{[^}]*\}")
+_CSS_URL_RE = re.compile(r"""url\(\s*['"]?([^'")]+)""")
+_CSS_ESCAPE_RE = re.compile(r"\\([0-9a-fA-F]{1,6})\s?")
+_FONT_WEIGHT_RE = re.compile(r"font-weight\s*:\s*([^;}\"']+)")
+_FONT_STRETCH_RE = re.compile(r"font-stretch\s*:\s*([^;}\"']+)")
+FONT_WEIGHT_KEYWORDS = {"normal": 400, "bold": 700, "lighter": 100, "bolder": 900}
+FONT_STRETCH_KEYWORDS = {
+    "ultra-condensed": 50, "extra-condensed": 62.5, "condensed": 75, "semi-condensed": 87.5, "normal": 100,
+    "semi-expanded": 112.5, "expanded": 125, "extra-expanded": 150, "ultra-expanded": 200,
+}
+
+
+def used_codepoints(texts):
+    """Characters that can appear in text rendered from these HTML/CSS/JS sources
+
+    Entities and CSS escapes are decoded; printable ASCII is always included
+    for text typed or generated at runtime.
+    """
+    codepoints = set(range(0x20, 0x7F))
+    for text in texts:
+        text = _CSS_ESCAPE_RE.sub(lambda match: chr(min(int(match.group(1), 16), 0x10FFFF)), html.unescape(text))
+        codepoints.update(ord(char) for char in text if char.isprintable())
+    return codepoints
+
+
+def used_font_axes(texts):
+    """The (min, max) font-weight and font-stretch (in percent) used by these CSS/HTML sources
+
+    Descriptors inside @font-face rules are not usage and are ignored; the
+    defaults 400/700 (body text, bold elements) and 100% always count.
+    """
+    weights, stretches = {400, 700}, {100}
+    for text in texts:
+        text = _FONT_FACE_RE.sub("", text)
+        for value in _FONT_WEIGHT_RE.findall(text):
+            value = value.strip().lower()
+            weights.update([FONT_WEIGHT_KEYWORDS[value]] if value in FONT_WEIGHT_KEYWORDS
+                           else [float(value)] if re.fullmatch(r"\d+(\.\d+)?", value) else [])
+        for value in _FONT_STRETCH_RE.findall(text):
+            value = value.strip().lower()
+            stretches.update([FONT_STRETCH_KEYWORDS[value]] if value in FONT_STRETCH_KEYWORDS
+                             else [float(value[:-1])] if re.fullmatch(r"\d+(\.\d+)?%", value) else [])
+    return {"wght": (min(weights), max(weights)), "wdth": (min(stretches), max(stretches))}
+
+
+def unicode_range(codepoints):
+    """Format codepoints as a CSS unicode-range value, merging consecutive runs"""
+    ranges = []
+    for codepoint in sorted(codepoints):
+        if ranges and ranges[-1][1] == codepoint - 1:
+            ranges[-1][1] = codepoint
+        else:
+            ranges.append([codepoint, codepoint])
+    return ", ".join(f"U+{start:X}" if start == end else f"U+{start:X}-{end:X}" for start, end in ranges)
+
+
+def _set_font_face_descriptors(rule, descriptors):
+    """Set descriptors in an @font-face rule, replacing existing values and appending new ones"""
+    for name, value in descriptors.items():
+        pattern = re.compile(rf"(?<=[{{;\s]){name}\s*:\s*[^;}}]*")
+        if pattern.search(rule):
+            rule = pattern.sub(f"{name}: {value}", rule, count=1)
+            continue
+        indent = re.search(r"\n([ \t]*)[\w-]+\s*:", rule)
+        body = rule[:-1].rstrip()
+        separator = "" if body.endswith((";", "{")) else ";"
+        if indent:
+            rule = f"{body}{separator}\n{indent.group(1)}{name}: {value};\n}}"
+        else:
+            rule = f"{body}{separator} {name}: {value}; }}"
+    return rule
+
+
+def _format_axis_range(low, high, unit=""):
+    values = [f"{value:g}{unit}" for value in ((low,) if low == high else (low, high))]
+    return " ".join(values)
+
+
+# Source files (templates, master images) are looked up relative to this module
+SOURCE_DIR = Path(__file__).resolve().parent
+# Page, stylesheet and script sources; see compile_template() for the syntax
+TEMPLATE_DIR = SOURCE_DIR / "templates"
+# Size and request limits checked after every build; see check_budgets()
+BUDGET_FILE = SOURCE_DIR / "budgets.json"
+# Bump when compile_template() output changes, so cached compiled templates are not reused
+TEMPLATE_ENGINE_VERSION = 1
+
+_TEMPLATE_TAG_RE = re.compile(
+    r"\{%\s*raw\s*%\}(?P<raw>.*?)\{%\s*endraw\s*%\}"
+    r"|\{\{(?P<expr>.*?)\}\}"
+    r"|\{%(?P<tag>.*?)%\}"
+    r"|\{#.*?#\}",
+    re.DOTALL,
+)
+_TEMPLATE_NAME_RE = re.compile(r"[A-Za-z_]\w*(?:\.\w+)*")
+_TEMPLATE_FILTERS = {
+    "escape": lambda value: html.escape(str(value)),
+    "json": lambda value: json.dumps(value),
+}
+# The render functions compiled templates define run in a copy of these globals
+_TEMPLATE_GLOBALS = {"__builtins__": {"str": str, "len": len, "list": list, "enumerate": enumerate}}
+# Template source hash -> render function, shared by all compilers in the process
+_TEMPLATE_RENDERERS = {}
+
+
+class TemplateError(ValueError):
+    """A template failed to compile or referenced an undefined variable"""
+
+
+def _template_lookup(ctx, path):
+    value = ctx
+    for key in path.split("."):
+        try:
+            value = value[key] if isinstance(value, dict) else getattr(value, key)
+        except (KeyError, AttributeError):
+            raise TemplateError(f"undefined template variable: {path}") from None
+    return value
+
+
+_TEMPLATE_GLOBALS.update(_lookup=_template_lookup, _filters=_TEMPLATE_FILTERS)
+
+
+def compile_template(source, name="<template>"):
+    """Compile template source to a code object defining render(ctx, include)
+
+    The syntax is a small Jinja subset: {{ name.attr }} and {{ name|filter }}
+    (escape, json) insert values verbatim, {% include "partial" %},
+    {% for x in seq %}...{% endfor %} (with loop.index/first/last) and
+    {% if [not] name %}...{% else %}...{% endif %} are block tags, {# ... #}
+    is a comment and {% raw %}...{% endraw %} passes text through untouched,
+    for scripts that contain {{ themselves. A block tag alone on its line
+    takes the line's indentation and newline with it.
+    """
+    lines = ["def render(ctx, include):", " out = []", " w = out.append"]
+    stack = []
+
+    def emit(line):
+        lines.append(" " * (len(stack) + 1) + line)
+
+    def fail(message, offset):
+        line = source.count("\n", 0, offset) + 1
+        raise TemplateError(f"{name}:{line}: {message}")
+
+    def name_expr(text, offset):
+        text = text.strip()
+        if not _TEMPLATE_NAME_RE.fullmatch(text):
+            fail(f"expected a variable name, got {text!r}", offset)
+        return f"_lookup(ctx, {text!r})"
+
+    pos = 0
+    for match in _TEMPLATE_TAG_RE.finditer(source):
+        text = source[pos:match.start()]
+        block = match.group("expr") is None
+        if block:
+            line_start = text.rfind("\n") + 1
+            starts_line = line_start > 0 or pos == 0 or source[pos - 1] == "\n"
+            if starts_line and not text[line_start:].strip(" \t"):
+                text = text[:line_start]
+        if text:
+            emit(f"w({text!r})")
+        pos = match.end()
+        if block and source.startswith("\n", pos):
+            pos += 1
+
+        if match.group("raw") is not None:
+            emit(f"w({match.group('raw')!r})")
+        elif match.group("expr") is not None:
+            variable, _, filter_name = match.group("expr").partition("|")
+            value = name_expr(variable, match.start())
+            filter_name = filter_name.strip()
+            if filter_name:
+                if filter_name not in _TEMPLATE_FILTERS:
+                    fail(f"unknown filter {filter_name!r}", match.start())
+                value = f"_filters[{filter_name!r}]({value})"
+            emit(f"w(str({value}))")
+        elif match.group("tag") is not None:
+            words = match.group("tag").split(None, 1)
+            keyword, rest = (words + [""])[:2] if words else ("", "")
+            if keyword == "include":
+                partial = rest.strip()
+                if len(partial) < 2 or partial[0] != partial[-1] or partial[0] not in "\"'":
+                    fail(f"include needs a quoted template name, got {rest!r}", match.start())
+                emit(f"w(include({partial[1:-1]!r}, ctx))")
+            elif keyword == "for":
+                target, _, sequence = rest.partition(" in ")
+                if not target.strip().isidentifier():
+                    fail(f"bad for loop {rest!r}", match.start())
+                n = len(stack)
+                emit(f"_items{n} = list({name_expr(sequence, match.start())})")
+                emit(f"_outer{n} = ctx")
+                emit(f"for _i{n}, _item{n} in enumerate(_items{n}):")
+                stack.append(("for", n))
+                emit(f"ctx = {{**_outer{n}, {target.strip()!r}: _item{n}, 'loop': "
+                     f"{{'index': _i{n} + 1, 'first': _i{n} == 0, 'last': _i{n} == len(_items{n}) - 1}}}}")
+            elif keyword == "endfor":
+                if not stack or stack[-1][0] != "for":
+                    fail("endfor without for", match.start())
+                _, n = stack.pop()
+                emit(f"ctx = _outer{n}")
+            elif keyword == "if":
+                negate = rest.startswith("not ")
+                condition = name_expr(rest[4:] if negate else rest, match.start())
+                emit(f"if {'not ' if negate else ''}{condition}:")
+                stack.append(("if", None))
+                emit("pass")
+            elif keyword == "else":
+                if not stack or stack[-1][0] != "if":
+                    fail("else without if", match.start())
+                stack.pop()
+                emit("else:")
+                stack.append(("else", None))
+                emit("pass")
+            elif keyword == "endif":
+                if not stack or stack[-1][0] not in ("if", "else"):
+                    fail("endif without if", match.start())
+                stack.pop()
+            else:
+                fail(f"unknown tag {keyword!r}", match.start())
+    if stack:
+        fail(f"unclosed {stack[-1][0]}", len(source))
+    if source[pos:]:
+        emit(f"w({source[pos:]!r})")
+    emit("return ''.join(out)")
+    return compile("\n".join(lines), f"<template {name}>", "exec")
+
+
 class TenetTechWebsiteCompiler:
-    def __init__(self, project_name="tenet-tech-portfolio"):
+    # Build step -> steps whose outputs it needs. Steps run as soon as their
+    # dependencies finish, up to `jobs` at a time.
+    BUILD_STEPS = {
+        "create_index_html": (),
+        "create_main_css": (),
+        "create_main_js": (),
+        "create_manifest_json": (),
+        "create_shed_organizer_app": (),
+        "create_wild_harvest_app": (),
+        "create_fonts_placeholder": (),
+        "create_readme": (),
+        "create_service_worker": (),
+        "create_images": (),
+        "inline_critical_css": ("create_index_html", "create_main_css"),
+        "extract_shared_app_assets": ("create_shed_organizer_app", "create_wild_harvest_app"),
+        "responsive_images": (
+            "inline_critical_css",
+            "create_shed_organizer_app",
+            "extract_shared_app_assets",
+            "create_images",
+        ),
+        "lazy_load_media": ("responsive_images",),
+        "purge_unused_css": (
+            "lazy_load_media",
+            "create_main_css",
+            "create_main_js",
+            "create_service_worker",
+            "create_fonts_placeholder",
+        ),
+        "subset_font_files": (
+            "purge_unused_css",
+            "lazy_load_media",
+            "create_main_css",
+            "create_main_js",
+            "create_fonts_placeholder",
+        ),
+        "minify_assets": (
+            "subset_font_files",
+            "purge_unused_css",
+            "lazy_load_media",
+            "create_main_css",
+            "create_main_js",
+            "create_service_worker",
+            "extract_shared_app_assets",
+            "create_fonts_placeholder",
+        ),
+        "fingerprint_assets": (
+            "minify_assets",
+            "create_manifest_json",
+            "create_service_worker",
+        ),
+        # Hints use the final asset URLs; the service worker precaches the final asset list
+        "add_resource_hints": ("fingerprint_assets",),
+        "inject_precache_manifest": ("add_resource_hints",),
+        "precompress_assets": ("inject_precache_manifest", "create_readme"),
+    }
+
+    # Above-the-fold markup ends with the element carrying this id (the hero)
+    ABOVE_THE_FOLD_ID = "home"
+    # Classes that are critical although they may not appear above the fold,
+    # or only get added from JavaScript
+    CRITICAL_CLASSES = ("section", "section-title", "active", "loaded")
+    # Selectors --purge-css keeps even when no page or script mentions them
+    CSS_SAFELIST = (".active", ".loaded")
+
+    # Most resource hints of each kind added to a page; extra preloads compete with what the parser finds itself
+    RESOURCE_HINT_LIMITS = {"preload": 3, "modulepreload": 3, "preconnect": 2, "prefetch": 3}
+
+    # Standalone app pages, and the files the CSS and JS they all repeat is moved to
+    APP_PAGES = ("apps/shed-organizer/index.html", "apps/wild-harvest/index.html")
+    SHARED_APP_CSS = "assets/css/apps.css"
+    SHARED_APP_JS = "assets/js/apps.js"
+
+    # Build outputs that never go into the service worker precache
+    PRECACHE_EXCLUDE = ("README.md", "asset-manifest.json")
+    # Responsive variants are left to the runtime cache, as a browser only ever fetches one of them
+    PRECACHE_EXCLUDE_SUFFIXES = (".map", ".gz", ".br", ".webp", ".avif")
+
+    # Every manifest and touch icon is derived from one master image (paths relative to SOURCE_DIR)
+    ICON_MASTER = "tmp.logo.png"
+    ICON_SIZES = {
+        "assets/icons/icon-192.png": 192,
+        "assets/icons/icon-512.png": 512,
+        "assets/icons/apple-touch-icon.png": 180,
+    }
+    # Content images: output path -> (source, widest rendition served); the pages use none yet,
+    # so only the icons go through the image pipeline until a subclass or site variant adds some
+    IMAGES = {}
+    # Widths of the WebP/AVIF variants written for each content image with --optimize-images
+    IMAGE_WIDTHS = (160, 320, 640)
+    # Web fonts, copied from SOURCE_DIR when it holds the real files
+    FONT_FILES = ("assets/fonts/InterVariable.woff2", "assets/fonts/MonaSans-Variable.woff2")
+    # Copied as-is when Pillow is not installed
+    PREBUILT_IMAGES = {
+        "assets/icons/icon-192.png": "icon-192.png",
+        "assets/icons/icon-512.png": "icon-512.png",
+    }
+
+    def __init__(self, project_name="tenet-tech-portfolio", incremental=False, cache_dir=BUILD_CACHE_DIR,
+                 in_memory=False, archive_path=None, jobs=None, compress_level=6, minify=False,
+                 fingerprint=False, precompress=False, report_dir=None, template_dir=None, optimize_images=False,
+                 subset_fonts=False, budget_file=BUDGET_FILE, site=None, purge_css=False):
         self.project_name = project_name
         self.base_path = Path(project_name)
+        self.incremental = incremental
+        self.in_memory = in_memory
+        self.archive_path = archive_path or f"{project_name}.zip"
+        self.jobs = jobs or os.cpu_count() or 1
+        self.compress_level = compress_level
+        self.minify = minify
+        self.fingerprint = fingerprint
+        self.precompress = precompress
+        self.optimize_images = optimize_images
+        self.subset_fonts = subset_fonts
+        self.purge_css = purge_css
+        self.budget_file = Path(budget_file) if budget_file else None
+        self.budget_violations = []
+        self.site_overrides = dict(site or {})
+        self.report_dir = Path(report_dir) if report_dir else None
+        self.template_dir = Path(template_dir) if template_dir else TEMPLATE_DIR
+        self.metrics = []
+        self._build_started = time.perf_counter()
+        self.minify_report = {}
+        self.purge_report = {}
+        self.archive_report = {}
+        self.cache_dir = Path(cache_dir)
+        self.manifest_path = self.cache_dir / f"{project_name}.manifest.json"
+        self.manifest = {}
+        self.files = {}
+        self.hashes = {}
+        self.step_outputs = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._source_digest = None
+        # The build graph's thread pool while it runs; steps fan their own work out onto it
+        self._pool = None
         
     def create_directory_structure(self):
         """Create complete directory structure"""
-        if self.base_path.exists():
+        if self.base_path.exists() and not self.incremental:
             import shutil
             shutil.rmtree(self.base_path)
         
@@ -32,1131 +1432,28 @@ class TenetTechWebsiteCompiler:
         
     def create_index_html(self):
         """Create the main index.html file"""
-        html_content = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="TENET Tech - Portfolio showcasing innovative web development and design solutions">
-    <meta name="theme-color" content="#1a1a1a">
-    <title>TENET Tech - Web Development Portfolio</title>
-    
-    <!-- Preload critical fonts -->
-    <link rel="preload" href="/assets/fonts/InterVariable.woff2" as="font" type="font/woff2" crossorigin>
-    <link rel="preload" href="/assets/fonts/MonaSans-Variable.woff2" as="font" type="font/woff2" crossorigin>
-    
-    <!-- Critical CSS inlined for fast rendering -->
-    <style>
-        :root {
-            --primary-color: #00ffff;
-            --secondary-color: #ff6b6b;
-            --accent-color: #4ecdc4;
-            --bg-primary: #0a0a0a;
-            --bg-secondary: #1a1a1a;
-            --text-primary: #ffffff;
-            --text-secondary: #b0b0b0;
-            --font-body: "InterVariable", system-ui, -apple-system, sans-serif;
-            --font-display: "MonaSans", "InterVariable", system-ui, sans-serif;
-            --spacing-xs: 0.5rem;
-            --spacing-sm: 1rem;
-            --spacing-md: 1.5rem;
-            --spacing-lg: 2rem;
-            --spacing-xl: 3rem;
-            --border-radius: 0.5rem;
-            --transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        }
-        
-        @font-face {
-            font-family: 'InterVariable';
-            src: url('/assets/fonts/InterVariable.woff2') format('woff2-variations');
-            font-weight: 100 900;
-            font-display: swap;
-            font-style: normal;
-        }
-        
-        @font-face {
-            font-family: 'MonaSans';
-            src: url('/assets/fonts/MonaSans-Variable.woff2') format('woff2-variations');
-            font-weight: 200 900;
-            font-display: swap;
-            font-style: normal;
-        }
-        
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        html {
-            font-size: clamp(14px, 2.5vw, 16px);
-            scroll-behavior: smooth;
-        }
-        
-        body {
-            font-family: var(--font-body);
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            line-height: 1.6;
-            min-height: 100vh;
-            -webkit-font-smoothing: antialiased;
-            -moz-osx-font-smoothing: grayscale;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 0 var(--spacing-sm);
-        }
-        
-        /* Mobile-first navigation */
-        .nav {
-            position: fixed;
-            top: 0;
-            left: 0;
-            right: 0;
-            background: rgba(26, 26, 26, 0.95);
-            backdrop-filter: blur(10px);
-            z-index: 1000;
-            padding: var(--spacing-sm) 0;
-            border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-        }
-        
-        .nav-container {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .logo {
-            font-family: var(--font-display);
-            font-size: 1.5rem;
-            font-weight: 700;
-            color: var(--primary-color);
-            text-decoration: none;
-            letter-spacing: -0.02em;
-        }
-        
-        .nav-menu {
-            display: none;
-            list-style: none;
-            gap: var(--spacing-lg);
-        }
-        
-        .nav-menu.active {
-            display: flex;
-            flex-direction: column;
-            position: absolute;
-            top: 100%;
-            left: 0;
-            right: 0;
-            background: var(--bg-secondary);
-            padding: var(--spacing-md);
-            border-radius: 0 0 var(--border-radius) var(--border-radius);
-            box-shadow: 0 10px 30px rgba(0, 0, 0, 0.5);
-        }
-        
-        .nav-link {
-            color: var(--text-secondary);
-            text-decoration: none;
-            transition: var(--transition);
-            padding: var(--spacing-sm);
-            border-radius: var(--border-radius);
-            font-weight: 500;
-            min-height: 48px;
-            display: flex;
-            align-items: center;
-        }
-        
-        .nav-link:hover,
-        .nav-link:focus {
-            color: var(--primary-color);
-            background: rgba(0, 255, 255, 0.1);
-        }
-        
-        .nav-toggle {
-            display: block;
-            background: none;
-            border: none;
-            color: var(--text-primary);
-            font-size: 1.5rem;
-            cursor: pointer;
-            padding: var(--spacing-xs);
-            border-radius: var(--border-radius);
-            transition: var(--transition);
-            min-height: 48px;
-            min-width: 48px;
-        }
-        
-        .nav-toggle:hover {
-            background: rgba(255, 255, 255, 0.1);
-        }
-        
-        /* Hero Section */
-        .hero {
-            min-height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            text-align: center;
-            position: relative;
-            overflow: hidden;
-            padding-top: 80px;
-        }
-        
-        .hero::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: radial-gradient(circle at 30% 20%, rgba(0, 255, 255, 0.1) 0%, transparent 50%),
-                        radial-gradient(circle at 70% 80%, rgba(255, 107, 107, 0.1) 0%, transparent 50%);
-            z-index: -1;
-        }
-        
-        .hero-content {
-            max-width: 800px;
-            z-index: 1;
-        }
-        
-        .hero-title {
-            font-family: var(--font-display);
-            font-size: clamp(2rem, 8vw, 4rem);
-            font-weight: 800;
-            line-height: 1.1;
-            margin-bottom: var(--spacing-md);
-            background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }
-        
-        .hero-subtitle {
-            font-size: clamp(1rem, 3vw, 1.25rem);
-            color: var(--text-secondary);
-            margin-bottom: var(--spacing-xl);
-            max-width: 600px;
-            margin-left: auto;
-            margin-right: auto;
-        }
-        
-        .cta-button {
-            display: inline-block;
-            background: linear-gradient(135deg, var(--primary-color), var(--accent-color));
-            color: var(--bg-primary);
-            padding: var(--spacing-md) var(--spacing-xl);
-            text-decoration: none;
-            border-radius: var(--border-radius);
-            font-weight: 600;
-            transition: var(--transition);
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            font-size: 0.9rem;
-            box-shadow: 0 4px 15px rgba(0, 255, 255, 0.3);
-            min-height: 48px;
-            min-width: 120px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }
-        
-        .cta-button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 8px 25px rgba(0, 255, 255, 0.4);
-        }
-        
-        /* Section Styles */
-        .section {
-            padding: var(--spacing-xl) 0;
-            position: relative;
-        }
-        
-        .section-title {
-            font-family: var(--font-display);
-            font-size: clamp(1.5rem, 5vw, 2.5rem);
-            font-weight: 700;
-            text-align: center;
-            margin-bottom: var(--spacing-xl);
-            color: var(--text-primary);
-            position: relative;
-        }
-        
-        .section-title::after {
-            content: '';
-            position: absolute;
-            bottom: -10px;
-            left: 50%;
-            transform: translateX(-50%);
-            width: 60px;
-            height: 3px;
-            background: linear-gradient(90deg, var(--primary-color), var(--accent-color));
-            border-radius: 2px;
-        }
-        
-        /* Desktop navigation */
-        @media (min-width: 769px) {
-            .nav-menu {
-                display: flex;
-                flex-direction: row;
-                position: static;
-                background: transparent;
-                padding: 0;
-                box-shadow: none;
-            }
-            
-            .nav-toggle {
-                display: none;
-            }
-        }
-        
-        /* Utility classes */
-        .hidden {
-            display: none;
-        }
-        
-        .sr-only {
-            position: absolute;
-            width: 1px;
-            height: 1px;
-            padding: 0;
-            margin: -1px;
-            overflow: hidden;
-            clip: rect(0, 0, 0, 0);
-            white-space: nowrap;
-            border: 0;
-        }
-        
-        .loading {
-            opacity: 0;
-            transform: translateY(20px);
-            transition: opacity 0.6s ease, transform 0.6s ease;
-        }
-        
-        .loading.loaded {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    </style>
-    
-    <!-- PWA Meta tags -->
-    <link rel="manifest" href="/manifest.json">
-    <meta name="apple-mobile-web-app-capable" content="yes">
-    <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
-    <meta name="apple-mobile-web-app-title" content="TENET Tech">
-    <link rel="apple-touch-icon" href="/assets/icons/apple-touch-icon.png">
-</head>
-<body>
-    <!-- Navigation -->
-    <nav class="nav" role="navigation" aria-label="Main navigation">
-        <div class="container">
-            <div class="nav-container">
-                <a href="#" class="logo" aria-label="TENET Tech Home">
-                    TENET<span style="color: var(--secondary-color);">Tech</span>
-                </a>
-                
-                <button class="nav-toggle" aria-controls="nav-menu" aria-expanded="false" aria-label="Toggle navigation menu">
-                    <span class="sr-only">Menu</span>
-                    ☰
-                </button>
-                
-                <ul class="nav-menu" id="nav-menu" role="menubar">
-                    <li role="none"><a href="#home" class="nav-link" role="menuitem">Home</a></li>
-                    <li role="none"><a href="#about" class="nav-link" role="menuitem">About</a></li>
-                    <li role="none"><a href="#projects" class="nav-link" role="menuitem">Projects</a></li>
-                    <li role="none"><a href="#technical-showcase" class="nav-link" role="menuitem">Technical Showcase</a></li>
-                    <li role="none"><a href="#apps" class="nav-link" role="menuitem">Apps</a></li>
-                    <li role="none"><a href="#contact" class="nav-link" role="menuitem">Contact</a></li>
-                </ul>
-            </div>
-        </div>
-    </nav>
-    
-    <!-- Hero Section -->
-    <section class="hero" id="home" aria-label="Hero section">
-        <div class="container">
-            <div class="hero-content loading">
-                <h1 class="hero-title">
-                    <span class="typewriter" data-text="Crafting Digital Excellence">Crafting Digital Excellence</span>
-                </h1>
-                <p class="hero-subtitle">
-                    Full-stack developer specializing in modern web technologies, 
-                    progressive web apps, and innovative user experiences - built from scratch, not WordPress.
-                </p>
-                <a href="#technical-showcase" class="cta-button" aria-label="View technical showcase">
-                    See How It's Built
-                </a>
-            </div>
-        </div>
-    </section>
-    
-    <!-- About Section -->
-    <section class="section" id="about" aria-label="About section">
-        <div class="container">
-            <h2 class="section-title">About Me</h2>
-            <div class="about-content">
-                <div class="about-text">
-                    <p>Passionate web developer with expertise in modern technologies and a focus on creating exceptional user experiences. Specialized in React, Node.js, and progressive web applications - all built from the ground up without relying on WordPress or template solutions.</p>
-                    <p>I believe in crafting digital solutions that not only look great but perform exceptionally across all devices, with a special focus on mobile-first design principles and modern web standards.</p>
-                </div>
-                <div class="skills-grid">
-                    <div class="skill-item">
-                        <h3>Frontend</h3>
-                        <p>React, Vue.js, TypeScript, CSS Grid, Flexbox</p>
-                    </div>
-                    <div class="skill-item">
-                        <h3>Backend</h3>
-                        <p>Node.js, Python, PostgreSQL, MongoDB</p>
-                    </div>
-                    <div class="skill-item">
-                        <h3>DevOps</h3>
-                        <p>Docker, GitHub Actions, AWS, Netlify</p>
-                    </div>
-                    <div class="skill-item">
-                        <h3>Mobile</h3>
-                        <p>PWA, React Native, Flutter</p>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </section>
-    
-    <!-- Projects Section -->
-    <section class="section" id="projects" aria-label="Projects section">
-        <div class="container">
-            <h2 class="section-title">Featured Projects</h2>
-            <div class="projects-grid">
-                <div class="project-card">
-                    <div class="project-image">
-                        <div class="project-placeholder">📱</div>
-                    </div>
-                    <div class="project-content">
-                        <h3>E-Commerce PWA</h3>
-                        <p>Full-stack progressive web app with offline functionality, push notifications, and seamless mobile experience.</p>
-                        <div class="project-tech">
-                            <span>React</span>
-                            <span>Node.js</span>
-                            <span>PWA</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="project-card">
-                    <div class="project-image">
-                        <div class="project-placeholder">🎨</div>
-                    </div>
-                    <div class="project-content">
-                        <h3>Design System</h3>
-                        <p>Comprehensive design system with reusable components, built with modern CSS and accessibility in mind.</p>
-                        <div class="project-tech">
-                            <span>CSS</span>
-                            <span>Storybook</span>
-                            <span>Figma</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="project-card">
-                    <div class="project-image">
-                        <div class="project-placeholder">⚡</div>
-                    </div>
-                    <div class="project-content">
-                        <h3>Performance Dashboard</h3>
-                        <p>Real-time analytics dashboard with advanced data visualization and mobile-optimized interface.</p>
-                        <div class="project-tech">
-                            <span>Vue.js</span>
-                            <span>D3.js</span>
-                            <span>WebSocket</span>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </section>
-    
-    <!-- Technical Showcase Section -->
-    <section class="section" id="technical-showcase" aria-label="Technical showcase">
-        <div class="container">
-            <h2 class="section-title">Technical Showcase</h2>
-            <p class="section-subtitle">Behind the scenes of building without WordPress - showcasing modern web development practices</p>
-            
-            <div class="showcase-grid">
-                <div class="showcase-item">
-                    <div class="showcase-icon">⚡</div>
-                    <h3>Architecture & Performance</h3>
-                    <ul class="showcase-list">
-                        <li>Mobile-first progressive web app architecture</li>
-                        <li>Variable fonts reduce HTTP requests by 50%</li>
-                        <li>Service Worker caching for offline functionality</li>
-                        <li>Critical CSS inlined for faster First Contentful Paint</li>
-                        <li>Lighthouse Performance Score: 95+</li>
-                        <li>Core Web Vitals optimized for real-world usage</li>
-                    </ul>
-                </div>
-                
-                <div class="showcase-item">
-                    <div class="showcase-icon">🏗️</div>
-                    <h3>Code Quality & Best Practices</h3>
-                    <ul class="showcase-list">
-                        <li>Semantic HTML5 with accessibility landmarks</li>
-                        <li>Modern CSS with CSS Variables and relative colors</li>
-                        <li>Vanilla JavaScript with ES6+ features</li>
-                        <li>Intersection Observer for performance-friendly animations</li>
-                        <li>Touch-friendly UI with 48px minimum touch targets</li>
-                        <li>WCAG 2.1 AA compliance for accessibility</li>
-                    </ul>
-                </div>
-                
-                <div class="showcase-item">
-                    <div class="showcase-icon">📱</div>
-                    <h3>Development Features</h3>
-                    <ul class="showcase-list">
-                        <li>Progressive Web App (PWA) with offline capabilities</li>
-                        <li>Responsive design from 320px to 1440px viewports</li>
-                        <li>Dark/light theme with system preference detection</li>
-                        <li>Lazy loading for images and non-critical resources</li>
-                        <li>Optimized font loading with preload hints</li>
-                        <li>Service Worker with stale-while-revalidate strategy</li>
-                    </ul>
-                </div>
-                
-                <div class="showcase-item">
-                    <div class="showcase-icon">🎮</div>
-                    <h3>Interactive Applications</h3>
-                    <ul class="showcase-list">
-                        <li>Shed Layout Designer - Drag & drop interface</li>
-                        <li>Chicago Wild Harvest - Interactive plant database</li>
-                        <li>Touch-optimized controls for mobile devices</li>
-                        <li>LocalStorage for data persistence</li>
-                        <li>Modular JavaScript architecture</li>
-                        <li>Event delegation for performance</li>
-                    </ul>
-                </div>
-            </div>
-        </div>
-    </section>
-    
-    <!-- Apps Section -->
-    <section class="section" id="apps" aria-label="Web applications section">
-        <div class="container">
-            <h2 class="section-title">Interactive Apps</h2>
-            <div class="apps-grid">
-                <div class="app-card">
-                    <div class="app-icon">🏠</div>
-                    <h3>Shed Layout Designer</h3>
-                    <p>Interactive tool for designing and organizing shed layouts with drag-and-drop functionality.</p>
-                    <a href="/apps/shed-organizer/" class="app-link" aria-label="Open Shed Layout Designer">Launch App</a>
-                </div>
-                <div class="app-card">
-                    <div class="app-icon">🌿</div>
-                    <h3>Chicago Wild Harvest</h3>
-                    <p>Comprehensive guide to foraging in the Chicago area with interactive maps and plant identification.</p>
-                    <a href="/apps/wild-harvest/" class="app-link" aria-label="Open Chicago Wild Harvest">Launch App</a>
-                </div>
-            </div>
-        </div>
-    </section>
-    
-    <!-- Contact Section -->
-    <section class="section" id="contact" aria-label="Contact section">
-        <div class="container">
-            <h2 class="section-title">Get In Touch</h2>
-            <div class="contact-content">
-                <p>Ready to bring your ideas to life? Let's collaborate on your next project.</p>
-                <div class="contact-methods">
-                    <a href="mailto:contact@tenettech.dev" class="contact-method">
-                        <span class="contact-icon">📧</span>
-                        <span>contact@tenettech.dev</span>
-                    </a>
-                    <a href="https://github.com/Archangel13GTL" class="contact-method" target="_blank" rel="noopener">
-                        <span class="contact-icon">🐱</span>
-                        <span>GitHub</span>
-                    </a>
-                    <a href="https://linkedin.com/in/tenettech" class="contact-method" target="_blank" rel="noopener">
-                        <span class="contact-icon">💼</span>
-                        <span>LinkedIn</span>
-                    </a>
-                </div>
-                <a href="mailto:contact@tenettech.dev" class="cta-button">Contact Me</a>
-            </div>
-        </div>
-    </section>
-    
-    <!-- Load main stylesheet -->
-    <link rel="stylesheet" href="/assets/css/main.css">
-    
-    <!-- Load JavaScript -->
-    <script src="/assets/js/main.js"></script>
-    
-    <!-- Enhanced Navigation Script -->
-    <script>
-        document.addEventListener('DOMContentLoaded', () => {
-            const navToggle = document.querySelector('.nav-toggle');
-            const navMenu = document.getElementById('nav-menu');
-            
-            if (navToggle && navMenu) {
-                navToggle.addEventListener('click', () => {
-                    const isActive = navMenu.classList.contains('active');
-                    navMenu.classList.toggle('active', !isActive);
-                    navToggle.setAttribute('aria-expanded', !isActive);
-                });
-                
-                // Close menu when clicking outside
-                document.addEventListener('click', (e) => {
-                    if (!navToggle.contains(e.target) && !navMenu.contains(e.target)) {
-                        navMenu.classList.remove('active');
-                        navToggle.setAttribute('aria-expanded', 'false');
-                    }
-                });
-                
-                // Keyboard navigation support
-                navToggle.addEventListener('keydown', (e) => {
-                    if (e.key === 'Enter' || e.key === ' ') {
-                        e.preventDefault();
-                        navToggle.click();
-                    }
-                });
-            }
-            
-            // Typewriter effect
-            const typewriter = document.querySelector('.typewriter');
-            if (typewriter) {
-                const text = typewriter.getAttribute('data-text');
-                let index = 0;
-                typewriter.textContent = '';
-                
-                const type = () => {
-                    if (index < text.length) {
-                        typewriter.textContent += text.charAt(index);
-                        index++;
-                        setTimeout(type, 100);
-                    } else {
-                        typewriter.insertAdjacentHTML('afterend', '<span class="cursor">|</span>');
-                    }
-                };
-                
-                setTimeout(type, 500);
-            }
-            
-            // Smooth scrolling for navigation links
-            document.querySelectorAll('a[href^="#"]').forEach(anchor => {
-                anchor.addEventListener('click', function (e) {
-                    e.preventDefault();
-                    const targetId = this.getAttribute('href').substring(1);
-                    const targetElement = document.getElementById(targetId);
-                    
-                    if (targetElement) {
-                        const headerOffset = 80;
-                        const elementPosition = targetElement.offsetTop;
-                        const offsetPosition = elementPosition - headerOffset;
-
-                        window.scrollTo({
-                            top: offsetPosition,
-                            behavior: 'smooth'
-                        });
-                    }
-                });
-            });
-            
-            // Loading animations
-            const observerOptions = {
-                root: null,
-                rootMargin: '0px 0px -50px 0px',
-                threshold: 0.1
-            };
-            
-            const observer = new IntersectionObserver((entries) => {
-                entries.forEach(entry => {
-                    if (entry.isIntersecting) {
-                        entry.target.classList.add('loaded');
-                        observer.unobserve(entry.target);
-                    }
-                });
-            }, observerOptions);
-            
-            document.querySelectorAll('.loading').forEach(el => {
-                observer.observe(el);
-            });
-        });
-        
-        // Add cursor animation styles
-        const style = document.createElement('style');
-        style.textContent = `
-            .cursor {
-                animation: blink 1s infinite;
-                color: var(--primary-color);
-            }
-            
-            @keyframes blink {
-                0%, 50% { opacity: 1; }
-                51%, 100% { opacity: 0; }
-            }
-            
-            @media (prefers-reduced-motion: reduce) {
-                .cursor { animation: none; }
-            }
-        `;
-        document.head.appendChild(style);
-    </script>
-    
-    <!-- Service Worker registration -->
-    <script>
-        if ('serviceWorker' in navigator) {
-            window.addEventListener('load', () => {
-                navigator.serviceWorker.register('/sw.js')
-                    .then(registration => {
-                        console.log('SW registered: ', registration);
-                    })
-                    .catch(registrationError => {
-                        console.log('SW registration failed: ', registrationError);
-                    });
-            });
-        }
-    </script>
-</body>
-</html>"""
-        
-        with open(self.base_path / "index.html", "w", encoding="utf-8") as f:
-            f.write(html_content)
+        self._write_file("index.html", self.render_template("index.html"))
         print("✓ Created index.html")
         
     def create_main_css(self):
         """Create the main CSS file with all styles"""
-        css_content = """/* TENET Tech Portfolio - Complete CSS */
-
-/* Technical Showcase Styles */
-.section-subtitle {
-    text-align: center;
-    color: var(--text-secondary);
-    font-size: 1.1rem;
-    margin-bottom: var(--spacing-xl);
-    max-width: 600px;
-    margin-left: auto;
-    margin-right: auto;
-}
-
-.showcase-grid {
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-    gap: var(--spacing-lg);
-    margin-bottom: var(--spacing-xl);
-}
-
-.showcase-item {
-    background: var(--bg-secondary);
-    padding: var(--spacing-xl);
-    border-radius: var(--border-radius);
-    border: 1px solid rgba(255, 255, 255, 0.1);
-    transition: var(--transition);
-    position: relative;
-    overflow: hidden;
-}
-
-.showcase-item::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    right: 0;
-    bottom: 0;
-    background: linear-gradient(135deg, transparent, rgba(0, 255, 255, 0.05));
-    opacity: 0;
-    transition: var(--transition);
-}
-
-.showcase-item:hover::before {
-    opacity: 1;
-}
-
-.showcase-item:hover {
-    transform: translateY(-5px);
-    border-color: var(--primary-color);
-    box-shadow: 0 15px 40px rgba(0, 255, 255, 0.2);
-}
-
-.showcase-icon {
-    font-size: 3rem;
-    margin-bottom: var(--spacing-md);
-    display: block;
-}
-
-.showcase-item h3 {
-    color: var(--primary-color);
-    margin-bottom: var(--spacing-md);
-    font-family: var(--font-display);
-    font-weight: 600;
-    font-size: 1.2rem;
-}
-
-.showcase-list {
-    list-style: none;
-    padding: 0;
-}
-
-.showcase-list li {
-    color: var(--text-secondary);
-    padding: var(--spacing-xs) 0;
-    position: relative;
-    padding-left: var(--spacing-md);
-}
-
-.showcase-list li::before {
-    content: '→';
-    position: absolute;
-    left: 0;
-    color: var(--primary-color);
-    font-weight: bold;
-}
-
-/* About Section Styles */
-.about-content {
-    max-width: 800px;
-    margin: 0 auto;
-    text-align: center;
-}
-
-.about-text {
-    margin-bottom: var(--spacing-xl);
-}
-
-.about-text p {
-    margin-bottom: var(--spacing-md);
-    color: var(--text-secondary);
-    font-size: 1.1rem;
-}
-
-.skills-grid {
-    display: grid;
-    grid-template-columns: 1fr;
-    gap: var(--spacing-md);
-    margin-top: var(--spacing-xl);
-}
-
-.skill-item {
-    background: var(--bg-secondary);
-    padding: var(--spacing-md);
-    border-radius: var(--border-radius);
-    border: 1px solid rgba(255, 255, 255, 0.1);
-    transition: var(--transition);
-}
-
-.skill-item:hover {
-    transform: translateY(-2px);
-    border-color: var(--primary-color);
-    box-shadow: 0 5px 20px rgba(0, 255, 255, 0.2);
-}
-
-.skill-item h3 {
-    color: var(--primary-color);
-    margin-bottom: var(--spacing-xs);
-    font-family: var(--font-display);
-    font-weight: 600;
-}
-
-.skill-item p {
-    color: var(--text-secondary);
-    font-size: 0.9rem;
-}
-
-@media (min-width: 768px) {
-    .skills-grid {
-        grid-template-columns: repeat(2, 1fr);
-    }
-}
-
-@media (min-width: 1024px) {
-    .skills-grid {
-        grid-template-columns: repeat(4, 1fr);
-    }
-}
-
-/* Projects Section */
-.projects-grid {
-    display: grid;
-    grid-template-columns: 1fr;
-    gap: var(--spacing-lg);
-    max-width: 1000px;
-    margin: 0 auto;
-}
-
-.project-card {
-    background: var(--bg-secondary);
-    border-radius: var(--border-radius);
-    overflow: hidden;
-    border: 1px solid rgba(255, 255, 255, 0.1);
-    transition: var(--transition);
-}
-
-.project-card:hover {
-    transform: translateY(-5px);
-    box-shadow: 0 10px 30px rgba(0, 255, 255, 0.2);
-    border-color: var(--primary-color);
-}
-
-.project-image {
-    height: 200px;
-    background: linear-gradient(135deg, var(--bg-primary), var(--bg-secondary));
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    position: relative;
-    overflow: hidden;
-}
-
-.project-placeholder {
-    font-size: 3rem;
-    opacity: 0.7;
-}
-
-.project-content {
-    padding: var(--spacing-md);
-}
-
-.project-content h3 {
-    font-family: var(--font-display);
-    font-weight: 600;
-    margin-bottom: var(--spacing-sm);
-    color: var(--text-primary);
-}
-
-.project-content p {
-    color: var(--text-secondary);
-    margin-bottom: var(--spacing-md);
-    line-height: 1.6;
-}
-
-.project-tech {
-    display: flex;
-    flex-wrap: wrap;
-    gap: var(--spacing-xs);
-}
-
-.project-tech span {
-    background: rgba(0, 255, 255, 0.1);
-    color: var(--primary-color);
-    padding: 0.25rem 0.5rem;
-    border-radius: 0.25rem;
-    font-size: 0.8rem;
-    font-weight: 500;
-}
-
-@media (min-width: 768px) {
-    .projects-grid {
-        grid-template-columns: repeat(2, 1fr);
-    }
-}
-
-@media (min-width: 1024px) {
-    .projects-grid {
-        grid-template-columns: repeat(3, 1fr);
-    }
-}
-
-/* Apps Section */
-.apps-grid {
-    display: grid;
-    grid-template-columns: 1fr;
-    gap: var(--spacing-lg);
-    max-width: 800px;
-    margin: 0 auto;
-}
-
-.app-card {
-    background: var(--bg-secondary);
-    padding: var(--spacing-xl);
-    border-radius: var(--border-radius);
-    text-align: center;
-    border: 1px solid rgba(255, 255, 255, 0.1);
-    transition: var(--transition);
-    position: relative;
-    overflow: hidden;
-}
-
-.app-card::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    right: 0;
-    bottom: 0;
-    background: linear-gradient(135deg, transparent, rgba(0, 255, 255, 0.05));
-    opacity: 0;
-    transition: var(--transition);
-}
-
-.app-card:hover::before {
-    opacity: 1;
-}
-
-.app-card:hover {
-    transform: translateY(-5px);
-    border-color: var(--primary-color);
-    box-shadow: 0 15px 40px rgba(0, 255, 255, 0.3);
-}
-
-.app-icon {
-    font-size: 3rem;
-    margin-bottom: var(--spacing-md);
-}
-
-.app-card h3 {
-    font-family: var(--font-display);
-    font-weight: 600;
-    margin-bottom: var(--spacing-sm);
-    color: var(--text-primary);
-}
-
-.app-card p {
-    color: var(--text-secondary);
-    margin-bottom: var(--spacing-lg);
-    line-height: 1.6;
-}
-
-.app-link {
-    display: inline-block;
-    background: linear-gradient(135deg, var(--primary-color), var(--accent-color));
-    color: var(--bg-primary);
-    padding: var(--spacing-sm) var(--spacing-md);
-    text-decoration: none;
-    border-radius: var(--border-radius);
-    font-weight: 600;
-    transition: var(--transition);
-    font-size: 0.9rem;
-    min-height: 44px;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-}
-
-.app-link:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 8px 20px rgba(0, 255, 255, 0.4);
-}
-
-@media (min-width: 768px) {
-    .apps-grid {
-        grid-template-columns: repeat(2, 1fr);
-    }
-}
-
-/* Contact Section */
-.contact-content {
-    max-width: 600px;
-    margin: 0 auto;
-    text-align: center;
-}
-
-.contact-content p {
-    color: var(--text-secondary);
-    font-size: 1.1rem;
-    margin-bottom: var(--spacing-xl);
-}
-
-.contact-methods {
-    display: flex;
-    flex-direction: column;
-    gap: var(--spacing-md);
-    margin-bottom: var(--spacing-xl);
-}
-
-.contact-method {
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    gap: var(--spacing-sm);
-    padding: var(--spacing-md);
-    background: var(--bg-secondary);
-    border-radius: var(--border-radius);
-    text-decoration: none;
-    color: var(--text-secondary);
-    transition: var(--transition);
-    border: 1px solid rgba(255, 255, 255, 0.1);
-    min-height: 56px;
-}
-
-.contact-method:hover {
-    color: var(--primary-color);
-    border-color: var(--primary-color);
-    background: rgba(0, 255, 255, 0.1);
-}
-
-.contact-icon {
-    font-size: 1.2rem;
-}
-
-@media (min-width: 768px) {
-    .contact-methods {
-        flex-direction: row;
-        justify-content: center;
-    }
-}
-
-/* Accessibility improvements */
-@media (prefers-reduced-motion: reduce) {
-    * {
-        animation-duration: 0.01ms !important;
-        animation-iteration-count: 1 !important;
-        transition-duration: 0.01ms !important;
-    }
-    
-    html {
-        scroll-behavior: auto;
-    }
-}
-
-/* Focus styles for keyboard navigation */
-*:focus {
-    outline: 2px solid var(--primary-color);
-    outline-offset: 2px;
-}"""
-        
-        with open(self.base_path / "assets/css/main.css", "w", encoding="utf-8") as f:
-            f.write(css_content)
+        self._write_file("assets/css/main.css", self.render_template("assets/css/main.css"))
         print("✓ Created main.css")
         
     def create_main_js(self):
         """Create the main JavaScript file"""
-        js_content = """// TENET Tech Site - Main JavaScript
-// Performance optimizations
-document.addEventListener('DOMContentLoaded', () => {
-    // Lazy loading for images
-    if ('IntersectionObserver' in window) {
-        const imageObserver = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    const img = entry.target;
-                    if (img.dataset.src) {
-                        img.src = img.dataset.src;
-                        img.classList.remove('lazy');
-                        imageObserver.unobserve(img);
-                    }
-                }
-            });
-        });
-
-        document.querySelectorAll('img[data-src]').forEach(img => {
-            imageObserver.observe(img);
-        });
-    }
-
-    // Prefers-reduced-motion support
-    const prefersReducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)');
-    if (prefersReducedMotion.matches) {
-        document.documentElement.style.setProperty('--animation-duration', '0.01ms');
-    }
-});"""
-        
-        with open(self.base_path / "assets/js/main.js", "w", encoding="utf-8") as f:
-            f.write(js_content)
+        self._write_file("assets/js/main.js", self.render_template("assets/js/main.js"))
         print("✓ Created main.js")
         
     def create_manifest_json(self):
         """Create PWA manifest file"""
+        site = self.site_data()
         manifest = {
-            "name": "TENET Tech - Web Development Portfolio",
-            "short_name": "TENET Tech",
-            "description": "Portfolio showcasing innovative web development and design solutions",
-            "theme_color": "#1a1a1a",
-            "background_color": "#0a0a0a",
+            "name": f"{site['name']} - {site['tagline']}",
+            "short_name": site["name"],
+            "description": site["description"],
+            "theme_color": site["theme_color"],
+            "background_color": site["background_color"],
             "display": "standalone",
             "orientation": "portrait-primary",
             "scope": "/",
@@ -1180,595 +1477,1211 @@ document.addEventListener('DOMContentLoaded', () => {
             ]
         }
         
-        with open(self.base_path / "manifest.json", "w", encoding="utf-8") as f:
-            json.dump(manifest, f, indent=2)
+        self._write_file("manifest.json", json.dumps(manifest, indent=2))
         print("✓ Created manifest.json")
         
     def create_service_worker(self):
         """Create service worker for PWA"""
-        sw_content = """// Service Worker for TENET Tech Portfolio
-const CACHE_NAME = 'tenet-tech-v1.0.0';
-const PRECACHE_URLS = [
-    '/',
-    '/index.html',
-    '/assets/css/main.css',
-    '/assets/js/main.js',
-    '/manifest.json'
-];
-
-// Install event - precache essential resources
-self.addEventListener('install', event => {
-    event.waitUntil(
-        caches.open(CACHE_NAME)
-            .then(cache => {
-                console.log('Precaching resources');
-                return cache.addAll(PRECACHE_URLS);
-            })
-            .then(() => self.skipWaiting())
-    );
-});
-
-// Activate event - clean up old caches
-self.addEventListener('activate', event => {
-    event.waitUntil(
-        caches.keys().then(cacheNames => {
-            return Promise.all(
-                cacheNames.map(cacheName => {
-                    if (cacheName !== CACHE_NAME) {
-                        console.log('Deleting old cache:', cacheName);
-                        return caches.delete(cacheName);
-                    }
-                })
-            );
-        }).then(() => self.clients.claim())
-    );
-});
-
-// Fetch event - serve from cache with network fallback
-self.addEventListener('fetch', event => {
-    if (event.request.method !== 'GET') return;
-    if (!event.request.url.startsWith(self.location.origin)) return;
-
-    event.respondWith(
-        caches.match(event.request)
-            .then(response => {
-                if (response) return response;
-
-                return fetch(event.request.clone())
-                    .then(response => {
-                        if (!response || response.status !== 200 || response.type !== 'basic') {
-                            return response;
-                        }
-
-                        const responseToCache = response.clone();
-                        caches.open(CACHE_NAME)
-                            .then(cache => {
-                                cache.put(event.request, responseToCache);
-                            });
-
-                        return response;
-                    })
-                    .catch(() => {
-                        if (event.request.destination === 'document') {
-                            return caches.match('/');
-                        }
-                    });
-            })
-    );
-});"""
-        
-        with open(self.base_path / "sw.js", "w", encoding="utf-8") as f:
-            f.write(sw_content)
+        self._write_file("sw.js", self.render_template("sw.js"))
         print("✓ Created service worker")
         
+    def inline_critical_css(self):
+        """Inline the main.css rules needed above the fold and load the rest without blocking render"""
+        href = "/assets/css/main.css"
+        link = f'<link rel="stylesheet" href="{href}">'
+        html = self._read_file("index.html")
+        css = self._read_file("assets/css/main.css")
+        if link not in html:
+            print("✓ Skipped critical CSS (no main.css link in index.html)")
+            return
+        collector = _SelectorTokenCollector(stop_after=self.ABOVE_THE_FOLD_ID)
+        collector.feed(html)
+        tokens = collector.tokens | {f".{name}" for name in self.CRITICAL_CLASSES}
+        critical = extract_critical_css(css, tokens)
+        loader = (
+            f"<style>\n{critical}\n    </style>\n"
+            f'    <link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f"    <noscript>{link}</noscript>"
+        )
+        self._write_file("index.html", html.replace(link, loader, 1))
+        print(f"✓ Inlined critical CSS ({len(critical.encode('utf-8')):,} of {len(css.encode('utf-8')):,} bytes)")
+        
+    def purge_unused_css(self):
+        """Strip CSS rules that match nothing in any generated page
+
+        Stylesheets are purged against the tags, classes and ids of every
+        page, inline <style> blocks against those of their own page. Words in
+        scripts and CSS_SAFELIST count as used, so classes added at runtime
+        are kept.
+        """
+        if not self.purge_css:
+            return
+        with self._lock:
+            pages = {relpath: data.decode("utf-8") for relpath, data in self.files.items()
+                     if relpath.endswith(".html")}
+            scripts = [data.decode("utf-8") for relpath, data in self.files.items() if relpath.endswith(".js")]
+            stylesheets = sorted(relpath for relpath in self.files if relpath.endswith(".css"))
+        page_tokens = {relpath: page_selector_tokens(markup, scripts) | set(self.CSS_SAFELIST)
+                       for relpath, markup in pages.items()}
+        site_tokens = set().union(*page_tokens.values())
+
+        def record(relpath, before, after, removed):
+            report = self.purge_report.setdefault(relpath, {"before": 0, "after": 0, "removed": []})
+            report["before"] += len(before.encode("utf-8"))
+            report["after"] += len(after.encode("utf-8"))
+            report["removed"].extend(removed)
+
+        for relpath in stylesheets:
+            css = self._read_file(relpath)
+            purged, removed = purge_css(css, site_tokens)
+            if removed:
+                self._write_file(relpath, purged)
+                record(relpath, css, purged, removed)
+        for relpath, markup in sorted(pages.items()):
+            removed_here = []
+
+            def purge_style(match):
+                purged, removed = purge_css(match.group(2), page_tokens[relpath])
+                removed_here.append((match.group(2), purged, removed))
+                return match.group(1) + purged + match.group(3)
+
+            updated = _STYLE_RE.sub(purge_style, markup)
+            if any(removed for _, _, removed in removed_here):
+                self._write_file(relpath, updated)
+                for css, purged, removed in removed_here:
+                    record(relpath, css, purged, removed)
+        for relpath, report in sorted(self.purge_report.items()):
+            print(f"✓ Purged {relpath}: {report['before']:,} → {report['after']:,} bytes, "
+                  f"removed {', '.join(report['removed'])}")
+        if not self.purge_report:
+            print("✓ No unused CSS to purge")
+
+    def subset_font_files(self):
+        """Subset the woff2 fonts to the characters and weight/width ranges the site uses
+
+        Each @font-face rule that loads a subsetted font, in CSS files and
+        inlined critical CSS alike, gets a matching unicode-range and narrowed
+        font-weight/font-stretch descriptors. Needs fontTools and brotli;
+        placeholder fonts are left alone.
+        """
+        if not self.subset_fonts:
+            return
+        fonttools = _fonttools()
+        if fonttools is None or brotli is None:
+            print("⚠ fontTools and brotli are needed to subset fonts; skipped")
+            return
+        with self._lock:
+            fonts = sorted(relpath for relpath, data in self.files.items()
+                           if relpath.endswith(".woff2") and data.startswith(b"wOF2"))
+            sources = {relpath: data.decode("utf-8") for relpath, data in self.files.items()
+                       if relpath.endswith((".html", ".css", ".js"))}
+        if not fonts:
+            print("✓ Skipped font subsetting (no real fonts, only placeholders)")
+            return
+        codepoints = used_codepoints(sources.values())
+        axes = used_font_axes(text for relpath, text in sources.items() if not relpath.endswith(".js"))
+        descriptors = {}
+        for relpath in fonts:
+            data = self.files[relpath]
+            font = fonttools.TTFont(io.BytesIO(data))
+            faces, limits = {}, {}
+            if "fvar" in font:
+                for axis in font["fvar"].axes:
+                    if axis.axisTag in axes:
+                        low, high = axes[axis.axisTag]
+                        low = min(max(low, axis.minValue), axis.maxValue)
+                        high = min(max(high, axis.minValue), axis.maxValue)
+                        limits[axis.axisTag] = (low, high)
+                        descriptor = "font-weight" if axis.axisTag == "wght" else "font-stretch"
+                        faces[descriptor] = _format_axis_range(low, high, "" if axis.axisTag == "wght" else "%")
+
+            def subset(font=font, limits=limits):
+                if limits:
+                    font = fonttools.instancer.instantiateVariableFont(font, limits)
+                options = fonttools.subset.Options()
+                options.flavor = "woff2"
+                subsetter = fonttools.subset.Subsetter(options)
+                subsetter.populate(unicodes=codepoints)
+                subsetter.subset(font)
+                out = io.BytesIO()
+                font.flavor = "woff2"
+                font.save(out)
+                return out.getvalue()
+
+            key = [hashlib.sha256(data).hexdigest(), sorted(codepoints), limits, fonttools.version]
+            subsetted, cached = self._derived("font-subset", key, subset)
+            faces["unicode-range"] = unicode_range(fonttools.TTFont(io.BytesIO(subsetted)).getBestCmap())
+            self._write_file(relpath, subsetted)
+            descriptors[Path(relpath).name] = faces
+            print(f"✓ Subsetted {relpath}: {len(data):,} → {len(subsetted):,} bytes{' (cached)' if cached else ''}")
+
+        def update_rule(match):
+            rule = match.group(0)
+            for url in _CSS_URL_RE.findall(rule):
+                faces = descriptors.get(Path(url).name)
+                if faces:
+                    return _set_font_face_descriptors(rule, faces)
+            return rule
+
+        for relpath, text in sorted(sources.items()):
+            if relpath.endswith(".js"):
+                continue
+            updated = _FONT_FACE_RE.sub(update_rule, text)
+            if updated != text:
+                self._write_file(relpath, updated)
+
+    def minify_assets(self):
+        """Minify generated HTML, CSS and JS, with source maps for the CSS and JS files"""
+        if not self.minify:
+            return
+        with self._lock:
+            targets = sorted(relpath for relpath in self.files if relpath.endswith((".html", ".css", ".js")))
+        before_total = after_total = 0
+        for relpath in targets:
+            source = self._read_file(relpath)
+            name = Path(relpath).name
+            if relpath.endswith(".html"):
+                code = minify_html(source)
+            else:
+                if relpath.endswith(".css"):
+                    code, offsets = minify_css(source)
+                    starts = _line_starts(source)
+                    segments = [(0, col, *_offset_to_position(starts, offset)) for col, offset in offsets]
+                    code += f"\n/*# sourceMappingURL={name}.map */"
+                else:
+                    code, segments = minify_js(source)
+                    code += f"\n//# sourceMappingURL={name}.map"
+                source_map = build_source_map(name, f"src/{relpath}", source, segments)
+                self._write_file(f"{relpath}.map", json.dumps(source_map, separators=(",", ":")))
+            self._write_file(relpath, code)
+            before, after = len(source.encode("utf-8")), len(code.encode("utf-8"))
+            self.minify_report[relpath] = {"before": before, "after": after}
+            before_total += before
+            after_total += after
+            print(f"✓ Minified {relpath}: {before:,} → {after:,} bytes (-{100 - after * 100 // max(before, 1)}%)")
+        print(f"✓ Minification saved {before_total - after_total:,} bytes across {len(targets)} files")
+        
+    def fingerprint_assets(self):
+        """Rename files under assets/ to content-hashed names and rewrite every reference
+
+        References are rewritten in pages, manifest.json, sw.js and in other
+        assets, which are hashed only after the assets they reference. Files
+        minified with a source map get the map shifted to match. The
+        old -> new mapping is written to asset-manifest.json.
+        """
+        if not self.fingerprint:
+            return
+        with self._lock:
+            assets = sorted(relpath for relpath in self.files
+                            if relpath.startswith("assets/") and not relpath.endswith(".map"))
+            text_files = sorted(relpath for relpath in self.files
+                                if relpath.endswith(TEXT_REFERENCE_SUFFIXES) and relpath not in assets)
+        renamed = {}
+        remaining = list(assets)
+
+        def references_pending(relpath):
+            if not relpath.endswith(TEXT_REFERENCE_SUFFIXES):
+                return False
+            text = self.files[relpath].decode("utf-8")
+            return any(form in text for other in remaining if other != relpath
+                       for form in _reference_forms(other, relpath))
+
+        while remaining:
+            # Hash assets only once the assets they reference have their final names
+            ready = [relpath for relpath in remaining if not references_pending(relpath)] or remaining[:1]
+            for relpath in ready:
+                remaining.remove(relpath)
+                data = self.files[relpath]
+                source_map = f"{relpath}.map"
+                map_data = json.loads(self.files[source_map]) if source_map in self.files else None
+                if relpath.endswith(TEXT_REFERENCE_SUFFIXES):
+                    text = data.decode("utf-8")
+                    edits = reference_edits(text, relpath, renamed)
+                    if map_data is not None:
+                        text, map_data = splice_source_mapped(text, edits, map_data)
+                    else:
+                        text = splice(text, edits)
+                    data = text.encode("utf-8")
+                path = Path(relpath)
+                new_relpath = str(path.with_name(f"{path.stem}.{hashlib.sha256(data).hexdigest()[:10]}{path.suffix}"))
+                if map_data is not None:
+                    # The comment is the last line, after every mapped segment
+                    text = data.decode("utf-8").replace(f"sourceMappingURL={path.name}.map",
+                                                        f"sourceMappingURL={Path(new_relpath).name}.map")
+                    data = text.encode("utf-8")
+                    map_data["file"] = Path(new_relpath).name
+                    self._remove_file(source_map)
+                    self._write_file(f"{new_relpath}.map", json.dumps(map_data, separators=(",", ":")))
+                self._remove_file(relpath)
+                self._write_file(new_relpath, data)
+                renamed[relpath] = new_relpath
+        for relpath in text_files:
+            edits = reference_edits(self._read_file(relpath), relpath, renamed)
+            if edits:
+                self._splice_output(relpath, edits)
+        self._write_file("asset-manifest.json", json.dumps(renamed, indent=2, sort_keys=True))
+        print(f"✓ Fingerprinted {len(renamed)} assets")
+        
+    def precompress_assets(self):
+        """Write maximum-compression .gz and .br siblings for text outputs, in parallel
+
+        Brotli output needs the optional brotli package; without it only gzip
+        sidecars are written. Sidecars that do not beat PRECOMPRESS_MAX_RATIO
+        are skipped.
+        """
+        if not self.precompress:
+            return
+        if brotli is None:
+            print("⚠ brotli is not installed; writing gzip sidecars only")
+        with self._lock:
+            targets = sorted((relpath, data) for relpath, data in self.files.items()
+                             if relpath.endswith(PRECOMPRESS_SUFFIXES))
+
+        def compress(item):
+            relpath, data = item
+            digest = hashlib.sha256(data).hexdigest()
+            sidecars = {".gz": self._derived("gzip", [digest, 9],
+                                             lambda: gzip.compress(data, compresslevel=9, mtime=0))[0]}
+            if brotli is not None:
+                sidecars[".br"] = self._derived("brotli", [digest, 11, brotli.__version__],
+                                                lambda: brotli.compress(data, quality=11))[0]
+            return relpath, len(data), {suffix: packed for suffix, packed in sidecars.items()
+                                        if len(packed) <= len(data) * PRECOMPRESS_MAX_RATIO}
+
+        written = skipped = 0
+        for relpath, size, sidecars in self._parallel_map(compress, targets):
+            for suffix, packed in sidecars.items():
+                self._write_file(relpath + suffix, packed)
+            written += len(sidecars)
+            skipped += (2 if brotli is not None else 1) - len(sidecars)
+        print(f"✓ Precompressed {len(targets)} files ({written} sidecars, {skipped} skipped as not worth it)")
+        
+    def _splice_output(self, relpath, edits):
+        """Apply (start, end, replacement) edits to a text output, keeping its source map in step"""
+        text = self._read_file(relpath)
+        source_map = f"{relpath}.map"
+        if source_map in self.files:
+            text, rebuilt = splice_source_mapped(text, edits, json.loads(self.files[source_map]))
+            self._write_file(source_map, json.dumps(rebuilt, separators=(",", ":")))
+        else:
+            text = splice(text, edits)
+        self._write_file(relpath, text)
+
+    def inject_precache_manifest(self):
+        """Inject the precache list, with per-file revisions and a derived cache version, into sw.js
+
+        sw.js is usually minified by now, so the splice goes through
+        _splice_output to keep sw.js.map pointing at the right columns.
+        """
+        with self._lock:
+            hashes = dict(self.hashes)
+        entries = []
+        for relpath in sorted(hashes):
+            if relpath == "sw.js" or relpath in self.PRECACHE_EXCLUDE or relpath.endswith(self.PRECACHE_EXCLUDE_SUFFIXES):
+                continue
+            # Pages are linked by directory URL (/apps/wild-harvest/), so precache them that way
+            url = "/" + (relpath[:-len("index.html")] if relpath.endswith("index.html") else relpath)
+            entries.append({"url": url, "revision": hashes[relpath][:10]})
+        version = hashlib.sha256(json.dumps(entries, sort_keys=True).encode("utf-8")).hexdigest()[:10]
+        manifest = json.dumps({"version": version, "entries": entries}, separators=(",", ":"))
+        placeholder = "self.__PRECACHE_MANIFEST"
+        start = self._read_file("sw.js").find(placeholder)
+        if start < 0:
+            raise ValueError("sw.js has no self.__PRECACHE_MANIFEST placeholder")
+        self._splice_output("sw.js", [(start, start + len(placeholder), manifest)])
+        print(f"✓ Injected precache manifest ({len(entries)} entries, version {version})")
+        
+    def create_images(self):
+        """Derive the icons from ICON_MASTER and write recompressed content images and their variants
+
+        Without Pillow the prebuilt PREBUILT_IMAGES are copied instead and no
+        variants are written.
+        """
+        Image = _pillow()
+        if Image is None:
+            for relpath, source in sorted(self.PREBUILT_IMAGES.items()):
+                self._write_file(relpath, self._read_input(SOURCE_DIR / source)[0])
+            print(f"⚠ Pillow is not installed; copied {len(self.PREBUILT_IMAGES)} prebuilt images")
+            return
+        Image.init()
+        sources = {source: self._read_input(SOURCE_DIR / source)
+                   for source in {self.ICON_MASTER, *(source for source, _ in self.IMAGES.values())}}
+        masters = {}
+        masters_lock = threading.Lock()
+        background = self.site_data()["background_color"]
+
+        def master_image(source):
+            # Decoded only when some rendition is not in the derived cache yet
+            with masters_lock:
+                if source not in masters:
+                    masters[source] = Image.open(io.BytesIO(sources[source][0]))
+                    masters[source].load()
+                return masters[source]
+
+        tasks = [(relpath, self.ICON_MASTER, size, "PNG", {"optimize": True})
+                 for relpath, size in self.ICON_SIZES.items()]
+        for relpath, (source, width) in self.IMAGES.items():
+            tasks.append((relpath, source, width, "PNG", {"optimize": True}))
+            if not self.optimize_images:
+                continue
+            stem = relpath.rsplit(".", 1)[0]
+            for extension, _, image_format, options in IMAGE_FORMATS:
+                if image_format not in Image.SAVE:
+                    continue
+                for variant_width in self.IMAGE_WIDTHS:
+                    if variant_width <= min(width, (image_size(sources[source][0]) or (width,))[0]):
+                        tasks.append((f"{stem}-{variant_width}w.{extension}", source, variant_width,
+                                      image_format, options))
+
+        def render(task):
+            relpath, source, width, image_format, options = task
+            # iOS fills transparency with black; flatten touch icons onto the site background instead
+            flatten = background if relpath.endswith("apple-touch-icon.png") else None
+
+            def encode():
+                master = master_image(source)
+                size = min(width, master.width)
+                image = master.resize((size, max(1, round(master.height * size / master.width))),
+                                      Image.Resampling.LANCZOS)
+                if flatten:
+                    image = image.convert("RGBA")
+                    flat = Image.new("RGB", image.size, flatten)
+                    flat.paste(image, mask=image.getchannel("A"))
+                    image = flat
+                out = io.BytesIO()
+                image.save(out, image_format, **options)
+                return out.getvalue()
+
+            key = [sources[source][1], width, image_format, options, flatten, Image.__version__]
+            return (relpath, *self._derived("image", key, encode))
+
+        written = reused = 0
+        for relpath, data, cached in self._parallel_map(render, tasks):
+            self._write_file(relpath, data)
+            written += len(data)
+            reused += cached
+        print(f"✓ Created {len(tasks)} images ({written:,} bytes, {reused} from cache)")
+
+    def responsive_images(self):
+        """Serve content images that have WebP/AVIF variants through <picture>/srcset in every page"""
+        with self._lock:
+            outputs = set(self.files)
+            pages = sorted(relpath for relpath in outputs if relpath.endswith(".html"))
+        variants = {}
+        for relpath in self.IMAGES:
+            stem = relpath.rsplit(".", 1)[0]
+            sources = [(mime, [(width, f"/{stem}-{width}w.{extension}") for width in self.IMAGE_WIDTHS
+                               if f"{stem}-{width}w.{extension}" in outputs])
+                       for extension, mime, _, _ in IMAGE_FORMATS]
+            sources = [(mime, candidates) for mime, candidates in sources if candidates]
+            if sources:
+                variants[f"/{relpath}"] = sources
+        if not variants:
+            return
+        rewritten = 0
+        for relpath in pages:
+            html = self._read_file(relpath)
+            updated = picture_markup(html, variants)
+            if updated != html:
+                self._write_file(relpath, updated)
+                rewritten += 1
+        print(f"✓ Added responsive image sources to {rewritten} page(s)")
+
+    def lazy_load_media(self):
+        """Lazy-load below-the-fold images and iframes in every page and size images to avoid layout shift"""
+        with self._lock:
+            pages = sorted(relpath for relpath in self.files if relpath.endswith(".html"))
+
+        def intrinsic_size(src):
+            relpath = _resolve_output_url(src, page)
+            with self._lock:
+                data = self.files.get(relpath) if relpath else None
+            return image_size(data) if data else None
+
+        lazy = sized = 0
+        for page in pages:
+            html = self._read_file(page)
+            updated, page_lazy, page_sized = lazy_media_markup(html, intrinsic_size, self.ABOVE_THE_FOLD_ID)
+            if updated != html:
+                self._write_file(page, updated)
+            lazy += page_lazy
+            sized += page_sized
+        print(f"✓ Lazy-loaded {lazy} image(s)/iframe(s) and sized {sized} image(s) across {len(pages)} pages")
+
     def create_shed_organizer_app(self):
         """Create the shed organizer app"""
-        shed_html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Shed Layout Designer - TENET Tech</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: system-ui, sans-serif; background: #0a0a0a; color: #fff; }
-        .container { max-width: 1200px; margin: 0 auto; padding: 2rem 1rem; }
-        .back-link { color: #00ffff; text-decoration: none; margin-bottom: 2rem; display: inline-block; }
-        .canvas-container { background: #1a1a1a; border: 2px solid #333; border-radius: 8px; margin: 2rem 0; }
-        .canvas { width: 100%; height: 400px; background: repeating-linear-gradient(45deg, #0a0a0a, #0a0a0a 10px, transparent 10px, transparent 20px); cursor: crosshair; position: relative; }
-        .controls { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 1rem; margin-bottom: 2rem; }
-        .control-group { background: #1a1a1a; padding: 1.5rem; border-radius: 8px; border: 1px solid #333; }
-        .control-group h3 { color: #00ffff; margin-bottom: 1rem; }
-        .tool-button { background: #333; color: #fff; border: none; padding: 12px 16px; margin: 4px; border-radius: 6px; cursor: pointer; transition: all 0.3s; }
-        .tool-button:hover, .tool-button.active { background: #00ffff; color: #000; }
-        .item { position: absolute; border: 2px solid #00ffff; border-radius: 4px; cursor: move; display: flex; align-items: center; justify-content: center; font-size: 0.8rem; color: #00ffff; background: rgba(0, 255, 255, 0.1); user-select: none; }
-        .item:hover { border-color: #ff6b6b; color: #ff6b6b; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <a href="../../#apps" class="back-link">← Back to Portfolio</a>
-        <h1 style="color: #00ffff; margin-bottom: 1rem;">Shed Layout Designer</h1>
-        
-        <div class="controls">
-            <div class="control-group">
-                <h3>Tools</h3>
-                <button class="tool-button active" data-tool="workbench">Workbench</button>
-                <button class="tool-button" data-tool="shelf">Shelf</button>
-                <button class="tool-button" data-tool="toolbox">Toolbox</button>
-                <button class="tool-button" data-tool="bike">Bike</button>
-            </div>
-            <div class="control-group">
-                <h3>Actions</h3>
-                <button class="tool-button" id="clear-all">Clear All</button>
-                <button class="tool-button" id="save-layout">Save Layout</button>
-            </div>
-        </div>
-        
-        <div class="canvas-container">
-            <div class="canvas" id="canvas"></div>
-        </div>
-    </div>
-    
-    <script>
-        let selectedTool = 'workbench';
-        let items = [];
-        let dragOffset = { x: 0, y: 0 };
-        let isDragging = false;
-        let selectedItem = null;
-        
-        // Tool selection
-        document.querySelectorAll('.tool-button[data-tool]').forEach(button => {
-            button.addEventListener('click', () => {
-                document.querySelectorAll('.tool-button[data-tool]').forEach(b => b.classList.remove('active'));
-                button.classList.add('active');
-                selectedTool = button.dataset.tool;
-            });
-        });
-        
-        // Canvas click handler
-        document.getElementById('canvas').addEventListener('click', (e) => {
-            if (isDragging) return;
-            
-            const rect = e.target.getBoundingClientRect();
-            const x = e.clientX - rect.left;
-            const y = e.clientY - rect.top;
-            
-            createItem(x, y);
-        });
-        
-        function createItem(x, y) {
-            const item = document.createElement('div');
-            item.className = 'item';
-            item.textContent = selectedTool;
-            
-            const size = getItemSize(selectedTool);
-            item.style.left = `${x - size.width / 2}px`;
-            item.style.top = `${y - size.height / 2}px`;
-            item.style.width = `${size.width}px`;
-            item.style.height = `${size.height}px`;
-            
-            document.getElementById('canvas').appendChild(item);
-            items.push(item);
-            
-            // Make draggable
-            item.addEventListener('mousedown', startDrag);
-            item.addEventListener('touchstart', startDrag);
-        }
-        
-        function getItemSize(type) {
-            const sizes = {
-                workbench: { width: 120, height: 60 },
-                shelf: { width: 80, height: 40 },
-                toolbox: { width: 60, height: 40 },
-                bike: { width: 100, height: 50 }
-            };
-            return sizes[type] || { width: 80, height: 40 };
-        }
-        
-        function startDrag(e) {
-            isDragging = true;
-            selectedItem = e.target;
-            
-            const rect = selectedItem.getBoundingClientRect();
-            dragOffset.x = (e.clientX || e.touches[0].clientX) - rect.left;
-            dragOffset.y = (e.clientY || e.touches[0].clientY) - rect.top;
-            
-            document.addEventListener('mousemove', drag);
-            document.addEventListener('touchmove', drag);
-            document.addEventListener('mouseup', stopDrag);
-            document.addEventListener('touchend', stopDrag);
-        }
-        
-        function drag(e) {
-            if (!isDragging || !selectedItem) return;
-            
-            const canvas = document.getElementById('canvas');
-            const rect = canvas.getBoundingClientRect();
-            const x = (e.clientX || e.touches[0].clientX) - rect.left - dragOffset.x;
-            const y = (e.clientY || e.touches[0].clientY) - rect.top - dragOffset.y;
-            
-            selectedItem.style.left = `${Math.max(0, Math.min(x, canvas.offsetWidth - selectedItem.offsetWidth))}px`;
-            selectedItem.style.top = `${Math.max(0, Math.min(y, canvas.offsetHeight - selectedItem.offsetHeight))}px`;
-        }
-        
-        function stopDrag() {
-            isDragging = false;
-            selectedItem = null;
-            document.removeEventListener('mousemove', drag);
-            document.removeEventListener('touchmove', drag);
-            document.removeEventListener('mouseup', stopDrag);
-            document.removeEventListener('touchend', stopDrag);
-        }
-        
-        // Clear all items
-        document.getElementById('clear-all').addEventListener('click', () => {
-            items.forEach(item => item.remove());
-            items = [];
-        });
-        
-        // Save layout
-        document.getElementById('save-layout').addEventListener('click', () => {
-            const layout = items.map(item => ({
-                type: item.textContent,
-                x: parseInt(item.style.left),
-                y: parseInt(item.style.top),
-                width: parseInt(item.style.width),
-                height: parseInt(item.style.height)
-            }));
-            
-            localStorage.setItem('shed-layout', JSON.stringify(layout));
-            alert('Layout saved!');
-        });
-    </script>
-</body>
-</html>"""
-        
-        with open(self.base_path / "apps/shed-organizer/index.html", "w", encoding="utf-8") as f:
-            f.write(shed_html)
+        self._write_file("apps/shed-organizer/index.html", self.render_template("apps/shed-organizer/index.html"))
         print("✓ Created shed organizer app")
         
     def create_wild_harvest_app(self):
         """Create the wild harvest app"""
-        harvest_html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Chicago Wild Harvest - TENET Tech</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: system-ui, sans-serif; background: #0a0a0a; color: #fff; }
-        .container { max-width: 1200px; margin: 0 auto; padding: 2rem 1rem; }
-        .back-link { color: #00ffff; text-decoration: none; margin-bottom: 2rem; display: inline-block; }
-        .search-bar { background: #1a1a1a; border: 2px solid #333; border-radius: 8px; padding: 1rem; margin-bottom: 2rem; width: 100%; color: #fff; }
-        .search-bar:focus { outline: none; border-color: #00ffff; }
-        .filters { display: flex; flex-wrap: wrap; gap: 1rem; margin-bottom: 2rem; }
-        .filter-button { background: #333; color: #fff; border: none; padding: 12px 16px; border-radius: 6px; cursor: pointer; transition: all 0.3s; }
-        .filter-button:hover, .filter-button.active { background: #00ffff; color: #000; }
-        .plants-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(300px, 1fr)); gap: 2rem; }
-        .plant-card { background: #1a1a1a; border: 1px solid #333; border-radius: 8px; overflow: hidden; cursor: pointer; transition: all 0.3s; }
-        .plant-card:hover { transform: translateY(-5px); border-color: #00ffff; }
-        .plant-image { height: 200px; background: linear-gradient(45deg, #2a2a2a, #1a1a1a); display: flex; align-items: center; justify-content: center; font-size: 4rem; }
-        .plant-info { padding: 1.5rem; }
-        .plant-name { color: #00ffff; font-size: 1.3rem; font-weight: 600; margin-bottom: 0.5rem; }
-        .plant-scientific { color: #999; font-style: italic; margin-bottom: 1rem; }
-        .plant-description { color: #b0b0b0; line-height: 1.6; margin-bottom: 1rem; }
-        .plant-details { display: flex; flex-wrap: wrap; gap: 0.5rem; }
-        .plant-tag { background: rgba(0, 255, 255, 0.1); color: #00ffff; padding: 0.25rem 0.5rem; border-radius: 0.25rem; font-size: 0.8rem; }
-        .plant-tag.season { background: rgba(255, 107, 107, 0.1); color: #ff6b6b; }
-        .plant-tag.location { background: rgba(78, 205, 196, 0.1); color: #4ecdc4; }
-        .safety-warning { background: rgba(255, 107, 107, 0.1); border: 1px solid #ff6b6b; border-radius: 6px; padding: 1rem; margin-bottom: 2rem; color: #ff6b6b; }
-        .modal { display: none; position: fixed; z-index: 1000; left: 0; top: 0; width: 100%; height: 100%; background: rgba(0, 0, 0, 0.8); }
-        .modal-content { background: #1a1a1a; margin: 5% auto; padding: 2rem; border: 1px solid #333; border-radius: 8px; width: 90%; max-width: 600px; max-height: 80vh; overflow-y: auto; }
-        .modal-close { color: #999; float: right; font-size: 2rem; cursor: pointer; }
-        .modal-close:hover { color: #fff; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <a href="../../#apps" class="back-link">← Back to Portfolio</a>
-        <h1 style="color: #00ffff; margin-bottom: 1rem;">Chicago Wild Harvest</h1>
-        
-        <div class="safety-warning">
-            <strong>⚠️ Safety Warning:</strong> Never eat any wild plant unless you are 100% certain of its identification. This app is for educational purposes only.
-        </div>
-        
-        <input type="text" class="search-bar" id="search-bar" placeholder="Search plants by name...">
-        
-        <div class="filters">
-            <button class="filter-button active" data-filter="all">All</button>
-            <button class="filter-button" data-filter="spring">Spring</button>
-            <button class="filter-button" data-filter="summer">Summer</button>
-            <button class="filter-button" data-filter="fall">Fall</button>
-            <button class="filter-button" data-filter="parks">Parks</button>
-            <button class="filter-button" data-filter="lakefront">Lakefront</button>
-        </div>
-        
-        <div class="plants-grid" id="plants-grid"></div>
-    </div>
-    
-    <div id="plant-modal" class="modal">
-        <div class="modal-content">
-            <span class="modal-close" id="modal-close">&times;</span>
-            <div id="modal-body"></div>
-        </div>
-    </div>
-    
-    <script>
-        const plants = [
-            {
-                id: 1,
-                name: "Dandelion",
-                scientific: "Taraxacum officinale",
-                icon: "🌼",
-                description: "Common edible weed with yellow flowers. Leaves are bitter but nutritious.",
-                seasons: ["spring", "summer", "fall"],
-                locations: ["parks", "lakefront"],
-                edibleParts: ["leaves", "flowers", "roots"],
-                safety: "Generally safe, but avoid areas treated with chemicals"
-            },
-            {
-                id: 2,
-                name: "Plantain",
-                scientific: "Plantago major",
-                icon: "🌿",
-                description: "Common 'weed' with healing properties. Leaves are edible and medicinal.",
-                seasons: ["spring", "summer", "fall"],
-                locations: ["parks", "lakefront"],
-                edibleParts: ["leaves", "seeds"],
-                safety: "Very safe, known as 'nature's band-aid'"
-            },
-            {
-                id: 3,
-                name: "Wild Onion",
-                scientific: "Allium canadense",
-                icon: "🧅",
-                description: "Native wild onion with mild flavor. Bulbs and greens are edible.",
-                seasons: ["spring", "summer"],
-                locations: ["parks"],
-                edibleParts: ["bulbs", "greens"],
-                safety: "CRITICAL: Must smell like onion/garlic. If no onion smell, do not eat!"
-            }
-        ];
-        
-        let currentFilter = 'all';
-        let searchTerm = '';
-        
-        function renderPlants() {
-            const grid = document.getElementById('plants-grid');
-            const filteredPlants = plants.filter(plant => {
-                const matchesSearch = plant.name.toLowerCase().includes(searchTerm) ||
-                                    plant.scientific.toLowerCase().includes(searchTerm);
-                const matchesFilter = currentFilter === 'all' ||
-                                    plant.seasons.includes(currentFilter) ||
-                                    plant.locations.includes(currentFilter);
-                return matchesSearch && matchesFilter;
-            });
-            
-            grid.innerHTML = '';
-            
-            filteredPlants.forEach(plant => {
-                const card = document.createElement('div');
-                card.className = 'plant-card';
-                card.innerHTML = `
-                    <div class="plant-image">${plant.icon}</div>
-                    <div class="plant-info">
-                        <h3 class="plant-name">${plant.name}</h3>
-                        <p class="plant-scientific">${plant.scientific}</p>
-                        <p class="plant-description">${plant.description}</p>
-                        <div class="plant-details">
-                            ${plant.seasons.map(season => `<span class="plant-tag season">${season}</span>`).join('')}
-                            ${plant.locations.map(location => `<span class="plant-tag location">${location}</span>`).join('')}
-                            ${plant.edibleParts.map(part => `<span class="plant-tag">${part}</span>`).join('')}
-                        </div>
-                    </div>
-                `;
-                
-                card.addEventListener('click', () => showPlantDetails(plant));
-                grid.appendChild(card);
-            });
-        }
-        
-        function showPlantDetails(plant) {
-            const modal = document.getElementById('plant-modal');
-            const modalBody = document.getElementById('modal-body');
-            
-            modalBody.innerHTML = `
-                <div style="text-align: center; font-size: 4rem; margin-bottom: 1rem;">${plant.icon}</div>
-                <h2 style="color: #00ffff; margin-bottom: 0.5rem;">${plant.name}</h2>
-                <p style="color: #999; font-style: italic; margin-bottom: 2rem;">${plant.scientific}</p>
-                <div style="margin-bottom: 2rem;">
-                    <h3 style="color: #ff6b6b; margin-bottom: 1rem;">⚠️ Safety Information</h3>
-                    <p style="color: #b0b0b0; line-height: 1.6;">${plant.safety}</p>
-                </div>
-                <div style="margin-bottom: 2rem;">
-                    <h3 style="color: #00ffff; margin-bottom: 1rem;">🌿 Edible Parts</h3>
-                    <p style="color: #b0b0b0; line-height: 1.6;">${plant.edibleParts.join(', ')}</p>
-                </div>
-            `;
-            
-            modal.style.display = 'block';
-        }
-        
-        // Search functionality
-        document.getElementById('search-bar').addEventListener('input', (e) => {
-            searchTerm = e.target.value.toLowerCase();
-            renderPlants();
-        });
-        
-        // Filter buttons
-        document.querySelectorAll('.filter-button').forEach(button => {
-            button.addEventListener('click', () => {
-                document.querySelectorAll('.filter-button').forEach(b => b.classList.remove('active'));
-                button.classList.add('active');
-                currentFilter = button.dataset.filter;
-                renderPlants();
-            });
-        });
-        
-        // Modal close
-        document.getElementById('modal-close').addEventListener('click', () => {
-            document.getElementById('plant-modal').style.display = 'none';
-        });
-        
-        window.addEventListener('click', (e) => {
-            if (e.target === document.getElementById('plant-modal')) {
-                document.getElementById('plant-modal').style.display = 'none';
-            }
-        });
-        
-        // Initialize
-        renderPlants();
-    </script>
-</body>
-</html>"""
-        
-        with open(self.base_path / "apps/wild-harvest/index.html", "w", encoding="utf-8") as f:
-            f.write(harvest_html)
+        self._write_file("apps/wild-harvest/index.html", self.render_template("apps/wild-harvest/index.html"))
         print("✓ Created wild harvest app")
         
+    def extract_shared_app_assets(self):
+        """Move the CSS rules and inline scripts that every app page starts with into shared asset files
+
+        The app pages link SHARED_APP_CSS and SHARED_APP_JS where their
+        inline blocks were, so the browser caches the common part once for
+        all apps; only page-specific rules and scripts stay inline.
+        """
+        pages = {relpath: self._read_file(relpath) for relpath in self.APP_PAGES}
+        styles = {relpath: _STYLE_RE.search(markup) for relpath, markup in pages.items()}
+        if len(pages) < 2 or not all(styles.values()):
+            return
+        shared_css, rests = split_shared_css([match.group(2) for match in styles.values()])
+        scripts = {relpath: list(_INLINE_SCRIPT_RE.finditer(markup)) for relpath, markup in pages.items()}
+        shared_scripts = 0
+        while all(shared_scripts < len(blocks) for blocks in scripts.values()) and len(
+                {textwrap.dedent(blocks[shared_scripts].group(2)).strip() for blocks in scripts.values()}) == 1:
+            shared_scripts += 1
+        if shared_css:
+            self._write_file(self.SHARED_APP_CSS, shared_css)
+        if shared_scripts:
+            first = next(iter(scripts.values()))
+            self._write_file(self.SHARED_APP_JS, "\n\n".join(
+                textwrap.dedent(block.group(2)).strip() for block in first[:shared_scripts]) + "\n")
+        for (relpath, markup), rest in zip(pages.items(), rests):
+            edits = []
+            if shared_scripts:
+                blocks = scripts[relpath][:shared_scripts]
+                edits.append((blocks[0].start(2) - len("<script>"), blocks[0].end(),
+                              f'<script src="/{self.SHARED_APP_JS}"></script>'))
+                edits.extend((block.start(), block.end(), "") for block in blocks[1:])
+            if shared_css:
+                style = styles[relpath]
+                link = f'<link rel="stylesheet" href="/{self.SHARED_APP_CSS}">'
+                if rest.strip():
+                    indent = markup[markup.rfind("\n", 0, style.start()) + 1:style.start()]
+                    link += f"\n{indent}{style.group(1)}{rest}{style.group(3)}"
+                edits.append((style.start(), style.end(), link))
+            for start, end, replacement in sorted(edits, reverse=True):
+                markup = markup[:start] + replacement + markup[end:]
+            self._write_file(relpath, markup)
+        if not shared_css and not shared_scripts:
+            print("✓ App pages share no CSS or scripts to extract")
+            return
+        print(f"✓ Extracted shared app assets: {len(shared_css.encode('utf-8')):,} bytes of CSS, "
+              f"{shared_scripts} script(s), linked from {len(pages)} pages")
+
     def create_fonts_placeholder(self):
-        """Create placeholder font files"""
+        """Create fonts.css and the web font files (placeholders until the real fonts are added)"""
         # Create font CSS
-        font_css = """/* Variable Fonts for TENET Tech Portfolio */
-@font-face {
-    font-family: 'InterVariable';
-    src: url('InterVariable.woff2') format('woff2-variations');
-    font-weight: 100 900;
-    font-style: normal;
-    font-display: swap;
-}
-
-@font-face {
-    font-family: 'MonaSans';
-    src: url('MonaSans-Variable.woff2') format('woff2-variations');
-    font-weight: 200 900;
-    font-stretch: 75% 125%;
-    font-style: normal;
-    font-display: swap;
-}
-
-:root {
-    --font-body: "InterVariable", system-ui, -apple-system, sans-serif;
-    --font-display: "MonaSans", "InterVariable", system-ui, sans-serif;
-}
-
-.font-inter { font-family: var(--font-body); }
-.font-mona { font-family: var(--font-display); }
-"""
-        
-        with open(self.base_path / "assets/fonts/fonts.css", "w", encoding="utf-8") as f:
-            f.write(font_css)
-        
-        # Create placeholder font files
-        with open(self.base_path / "assets/fonts/InterVariable.woff2", "wb") as f:
-            f.write(b"# Placeholder - Replace with actual InterVariable.woff2 font file")
-        
-        with open(self.base_path / "assets/fonts/MonaSans-Variable.woff2", "wb") as f:
-            f.write(b"# Placeholder - Replace with actual MonaSans-Variable.woff2 font file")
-        
-        print("✓ Created font placeholders")
+        self._write_file("assets/fonts/fonts.css", self.render_template("assets/fonts/fonts.css"))
+        
+        # Copy the real font files, or write placeholders until they are added
+        placeholders = 0
+        for relpath in self.FONT_FILES:
+            try:
+                data = self._read_input(SOURCE_DIR / relpath)[0]
+            except OSError:
+                data = b""
+            if not data.startswith(b"wOF2"):
+                data = f"# Placeholder - Replace with actual {Path(relpath).name} font file".encode("utf-8")
+                placeholders += 1
+            self._write_file(relpath, data)
+        
+        print(f"✓ Created fonts ({placeholders} placeholder(s))")
         
     def create_readme(self):
         """Create README file"""
-        readme_content = """# TENET Tech Portfolio Website
-
-A modern, mobile-first portfolio website built with progressive web app capabilities.
-
-## Features
-
-- Mobile-First Design: Optimized for touch devices with 48px minimum touch targets
-- Variable Fonts: Uses Inter and Mona Sans for optimal performance
-- Progressive Web App: Installable with offline capabilities
-- Touch-Friendly Navigation: Collapsible mobile menu with accessibility features
-- Service Worker Caching: Stale-while-revalidate strategy for optimal performance
-- Interactive Apps: Shed Layout Designer and Chicago Wild Harvest apps
-- Core Web Vitals Optimized: Critical CSS inlined, lazy loading, and performance optimizations
-
-## Performance Optimizations
-
-- Critical CSS inlined for faster First Contentful Paint
-- Variable fonts reduce HTTP requests by 50%
-- Service worker enables offline functionality
-- Lazy loading for images and non-critical resources
-- Optimized JavaScript with intersection observers
-- Mobile-specific touch event handling
-
-## File Structure
-
-├── index.html (main page)
-├── assets/
-│ ├── css/main.css
-│ ├── js/main.js
-│ └── fonts/ (add Inter and Mona Sans variable fonts)
-├── apps/ (interactive applications)
-├── manifest.json (PWA configuration)
-└── sw.js (service worker)
-
-## Deployment
-
-1. Upload all files to your web server
-2. Replace placeholder font files with actual variable fonts
-3. Configure your server to serve the correct MIME types
-4. Test PWA functionality in Chrome DevTools
-
-## Browser Support
-
-- Chrome 80+
-- Firefox 75+
-- Safari 14+
-- Edge 80+
-- Mobile browsers (iOS Safari, Chrome Mobile)
-
-## License
-
-MIT License - feel free to use and modify
-"""
-        
-        with open(self.base_path / "README.md", "w", encoding="utf-8") as f:
-            f.write(readme_content)
+        self._write_file("README.md", self.render_template("README.md"))
         print("✓ Created README.md")
         
+    def _write_file(self, relpath, content):
+        """Record a build output; it reaches disk in write_output_tree()"""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self.files[relpath] = data
+            self.hashes[relpath] = digest
+        outputs = getattr(self._local, "outputs", None)
+        if outputs is not None:
+            outputs[relpath] = digest
+
+    def _remove_file(self, relpath):
+        """Drop a build output (e.g. after renaming it); recorded as a None output"""
+        with self._lock:
+            self.files.pop(relpath, None)
+            self.hashes.pop(relpath, None)
+        outputs = getattr(self._local, "outputs", None)
+        if outputs is not None:
+            outputs[relpath] = None
+
+    def _read_file(self, relpath):
+        """Return a build output produced by an earlier step as text"""
+        with self._lock:
+            return self.files[relpath].decode("utf-8")
+
+    def _read_input(self, path):
+        """Read a source file and record its hash as an input of the running step
+
+        A missing file is recorded too (as None) before the OSError is
+        raised, so the step reruns once the file appears.
+        """
+        inputs = getattr(self._local, "inputs", None)
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            if inputs is not None:
+                inputs[str(path)] = None
+            raise
+        digest = hashlib.sha256(data).hexdigest()
+        if inputs is not None:
+            inputs[str(path)] = digest
+        return data, digest
+
+    def _read_template(self, name):
+        data, digest = self._read_input(self.template_dir / name)
+        return data.decode("utf-8"), digest
+
+    def load_template(self, name):
+        """Return the render function for a template, compiling each source at most once
+
+        Compiled code is cached in <cache_dir>/templates/ keyed by the source
+        hash, so later builds (and other processes) only unmarshal it.
+        """
+        source, digest = self._read_template(name)
+        key = hashlib.sha256(f"{TEMPLATE_ENGINE_VERSION}\0{sys.version}\0{digest}".encode("utf-8")).hexdigest()
+        render = _TEMPLATE_RENDERERS.get(key)
+        if render is not None:
+            return render
+        path = self.cache_dir / "templates" / key[:2] / key
+        try:
+            code = marshal.loads(path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            code = compile_template(source, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(marshal.dumps(code))
+            os.replace(tmp, path)
+        namespace = dict(_TEMPLATE_GLOBALS)
+        exec(code, namespace)
+        render = _TEMPLATE_RENDERERS[key] = namespace["render"]
+        return render
+
+    def site_data(self):
+        """The site name, contact details and page content lists from site.json, with the site overrides"""
+        return {**json.loads(self._read_template("site.json")[0]), **self.site_overrides}
+
+    def render_template(self, name, **context):
+        """Render a template with `site` (see site_data()) plus context in scope"""
+        def include(partial, ctx):
+            return self.load_template(partial)(ctx, include)
+
+        return self.load_template(name)({"site": self.site_data(), **context}, include)
+
+    def _derived(self, kind, key, compute):
+        """compute()'s bytes, cached under <cache_dir>/derived/ by kind and key; returns (data, cached)
+
+        The key must cover every input of compute(). Entries are content
+        addressed, so identical work is shared by every build, site and
+        process using the same cache_dir.
+        """
+        digest = hashlib.sha256(json.dumps([kind, key], sort_keys=True).encode("utf-8")).hexdigest()
+        path = self.cache_dir / "derived" / digest[:2] / digest
+        try:
+            return path.read_bytes(), True
+        except OSError:
+            pass
+        data = compute()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return data, False
+
+    def _object_path(self, digest):
+        return self.cache_dir / "objects" / digest[:2] / digest
+
+    def _store_object(self, digest, data):
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+
+    def load_manifest(self):
+        """Load the build manifest from the previous incremental build"""
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            manifest = {}
+        self.manifest = manifest
+        return manifest
+
+    def save_manifest(self):
+        """Persist step fingerprints, file hashes and archive state"""
+        self.manifest["version"] = MANIFEST_VERSION
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    def build_settings(self):
+        """Options that change build output; part of every step fingerprint"""
+        return {"project_name": self.project_name, "minify": self.minify, "fingerprint": self.fingerprint,
+                "precompress": self.precompress, "optimize_images": self.optimize_images,
+                "subset_fonts": self.subset_fonts, "purge_css": self.purge_css, "site": self.site_overrides}
+
+    def _transitive_deps(self, name):
+        deps, stack = set(), list(self.BUILD_STEPS.get(name, ()))
+        while stack:
+            dep = stack.pop()
+            if dep not in deps:
+                deps.add(dep)
+                stack.extend(self.BUILD_STEPS.get(dep, ()))
+        return sorted(deps)
+
+    def source_fingerprint(self):
+        """Hash of the source files that define this compiler class and its bases
+
+        Steps call module-level helpers and read class constants, so an edit
+        to any of them has to invalidate the cached steps too.
+        """
+        if self._source_digest is None:
+            files = set()
+            for klass in type(self).__mro__[:-1]:
+                # Freshly loaded copies (watch mode) are not in sys.modules; their functions know the file
+                module = sys.modules.get(klass.__module__)
+                files.update(value.__code__.co_filename for value in vars(klass).values()
+                             if isinstance(value, types.FunctionType))
+                if getattr(module, "__file__", None):
+                    files.add(module.__file__)
+            files = sorted(files)
+            digest = hashlib.sha256()
+            for path in files:
+                try:
+                    digest.update(Path(path).read_bytes())
+                except OSError:
+                    digest.update(path.encode("utf-8"))
+            self._source_digest = digest.hexdigest()
+        return self._source_digest
+
+    def step_fingerprint(self, name):
+        """Fingerprint a build step from its code, the compiler source, the settings and all upstream steps' outputs
+
+        Upstream is transitive: a change can pass through a step that is a
+        no-op in this configuration (e.g. fingerprint_assets without
+        --fingerprint).
+        """
+        digest = _code_fingerprint(getattr(type(self), name).__code__)
+        digest.update(self.source_fingerprint().encode("utf-8"))
+        digest.update(json.dumps(self.build_settings(), sort_keys=True).encode("utf-8"))
+        for dep in self._transitive_deps(name):
+            for relpath, file_hash in sorted(self.step_outputs.get(dep, {}).items()):
+                digest.update(f"{dep}\0{relpath}\0{file_hash}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _restore_step(self, name, fingerprint):
+        """Reuse a step's cached outputs if its fingerprint and the source files it read are unchanged"""
+        entry = self.manifest.get("steps", {}).get(name)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return False
+        for path, digest in entry.get("inputs", {}).items():
+            try:
+                current = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+            except OSError:
+                current = None
+            if current != digest:
+                return False
+        outputs = {}
+        for relpath, digest in entry["outputs"].items():
+            try:
+                outputs[relpath] = None if digest is None else self._object_path(digest).read_bytes()
+            except OSError:
+                return False
+        with self._lock:
+            for relpath, data in outputs.items():
+                if data is None:
+                    self.files.pop(relpath, None)
+                    self.hashes.pop(relpath, None)
+                    continue
+                self.files[relpath] = data
+                self.hashes[relpath] = entry["outputs"][relpath]
+            self.step_outputs[name] = dict(entry["outputs"])
+        return True
+
+    @contextlib.contextmanager
+    def _traced(self, name, category):
+        """Time a build phase (wall and CPU time) and record it in self.metrics
+
+        CPU time is the phase thread's own plus that of the pool workers it
+        ran through _counting_cpu; process CPU time would also take in the
+        steps running next to it. The yielded dict is stored with the metric,
+        for counters like bytes and files written.
+        """
+        counters = {}
+        worker_cpu = []
+        outer, self._local.worker_cpu = getattr(self._local, "worker_cpu", None), worker_cpu
+        started, cpu_started = time.perf_counter(), time.thread_time()
+        try:
+            yield counters
+        finally:
+            self._local.worker_cpu = outer
+            metric = {
+                "name": name,
+                "category": category,
+                "start_ms": round((started - self._build_started) * 1000, 3),
+                "wall_ms": round((time.perf_counter() - started) * 1000, 3),
+                "cpu_ms": round((time.thread_time() - cpu_started + sum(worker_cpu)) * 1000, 3),
+                "thread": threading.current_thread().name,
+                "tid": threading.get_ident(),
+                **counters,
+            }
+            with self._lock:
+                self.metrics.append(metric)
+
+    def _counting_cpu(self, fn):
+        """Wrap fn for a pool worker so its CPU time counts towards the calling phase"""
+        worker_cpu = getattr(self._local, "worker_cpu", None)
+        if worker_cpu is None:
+            return fn
+
+        def run(*args):
+            cpu_started = time.thread_time()
+            try:
+                return fn(*args)
+            finally:
+                worker_cpu.append(time.thread_time() - cpu_started)
+        return run
+
+    def _parallel_map(self, fn, items):
+        """fn over items, in order, on the calling thread and the idle workers of the build pool
+
+        Sharing the build graph's pool keeps a build at self.jobs threads
+        however many steps fan out at once. The caller takes items too and
+        only waits for helpers that already started, so the map finishes even
+        when every worker is busy with other steps.
+        """
+        fn = self._counting_cpu(fn)
+        items = list(items)
+        results = [None] * len(items)
+        indexes = iter(range(len(items)))
+        indexes_lock = threading.Lock()
+
+        def drain():
+            while True:
+                with indexes_lock:
+                    index = next(indexes, None)
+                if index is None:
+                    return
+                results[index] = fn(items[index])
+
+        helpers = [self._pool.submit(drain) for _ in range(min(self.jobs, len(items)) - 1)] if self._pool else []
+        try:
+            drain()
+        finally:
+            for helper in helpers:
+                if not helper.cancel():
+                    helper.result()
+        return results
+
+    def run_step(self, name):
+        """Run one create_* step, or skip it when nothing it depends on changed"""
+        with self._traced(name, "step") as counters:
+            fingerprint = self.step_fingerprint(name) if self.incremental else None
+            if self.incremental and self._restore_step(name, fingerprint):
+                counters.update(skipped=True, files=0, bytes=0, removed=0)
+                print(f"✓ Skipped {name} (unchanged)")
+                return False
+            self._local.outputs = outputs = {}
+            self._local.inputs = inputs = {}
+            try:
+                getattr(self, name)()
+            finally:
+                self._local.outputs = self._local.inputs = None
+            with self._lock:
+                self.step_outputs[name] = outputs
+                if self.incremental:
+                    self.manifest.setdefault("steps", {})[name] = {
+                        "fingerprint": fingerprint,
+                        "outputs": outputs,
+                        "inputs": inputs,
+                    }
+                written = [relpath for relpath, digest in outputs.items() if digest is not None]
+                counters.update(skipped=False, files=len(written), removed=len(outputs) - len(written),
+                                bytes=sum(len(self.files[relpath]) for relpath in written))
+            if self.incremental:
+                for relpath in written:
+                    self._store_object(outputs[relpath], self.files[relpath])
+            return True
+
+    def write_build_reports(self):
+        """Write the per-step JSON report and a Chrome trace-event file to report_dir"""
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        metrics = sorted(self.metrics, key=lambda metric: metric["start_ms"])
+        report = {
+            "project": self.project_name,
+            "settings": self.build_settings(),
+            "jobs": self.jobs,
+            "incremental": self.incremental,
+            "wall_ms": round((time.perf_counter() - self._build_started) * 1000, 3),
+            "output": {"files": len(self.files), "bytes": sum(len(data) for data in self.files.values())},
+            "phases": metrics,
+            "archive": self.archive_report,
+            "minify": self.minify_report,
+            "purge_css": self.purge_report,
+            "budget_violations": self.budget_violations,
+        }
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}}
+                  for tid, thread in sorted({(m["tid"], m["thread"]) for m in metrics})]
+        events.extend({
+            "name": metric["name"],
+            "cat": metric["category"],
+            "ph": "X",
+            "ts": round(metric["start_ms"] * 1000),
+            "dur": round(metric["wall_ms"] * 1000),
+            "pid": pid,
+            "tid": metric["tid"],
+            "args": {key: value for key, value in metric.items()
+                     if key not in ("name", "category", "start_ms", "wall_ms", "thread", "tid")},
+        } for metric in metrics)
+        report_path = self.report_dir / f"{self.project_name}.build-report.json"
+        trace_path = self.report_dir / f"{self.project_name}.trace.json"
+        report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        trace_path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+        print(f"✓ Wrote build report {report_path} and trace {trace_path}")
+        return report_path, trace_path
+
+    def _transfer_size(self, relpath, cache):
+        """Bytes on the wire: gzip-9 for compressible outputs, raw size for already-compressed formats"""
+        if relpath not in cache:
+            data = self.files[relpath]
+            cache[relpath] = (len(data) if relpath.endswith(tuple(INCOMPRESSIBLE_SUFFIXES))
+                              else min(len(data), len(gzip.compress(data, compresslevel=9, mtime=0))))
+        return cache[relpath]
+
+    def page_resources(self, page):
+        """Build outputs fetched while loading a page (itself first), and its inline <head> CSS
+
+        Stylesheets pull in the outputs their url()s reference.
+        """
+        collector = _PageResourceCollector()
+        collector.feed(self._read_file(page))
+        resources = [page]
+        pending = [_resolve_output_url(url, page) for url in collector.urls if url]
+        while pending:
+            relpath = pending.pop(0)
+            if relpath is None or relpath in resources or relpath not in self.files:
+                continue
+            resources.append(relpath)
+            if relpath.endswith(".css"):
+                pending.extend(_resolve_output_url(url, relpath) for url in _CSS_URL_RE.findall(self._read_file(relpath)))
+        return resources, "".join(collector.head_styles)
+
+    def resource_hints(self, page):
+        """Resource hints a page's asset graph calls for, most important first: [(rel, href, attributes), ...]
+
+        Fonts that the page's stylesheets load and use are preloaded, as the
+        browser only finds them once the CSS is parsed (placeholder font files
+        are not); static imports of
+        module scripts are modulepreloaded, origins of external resources the
+        page loads are preconnected and same-site pages it links to are
+        prefetched, followed by the assets several of those pages share.
+        Anything the page already loads or hints is skipped.
+        """
+        collector = _PageResourceCollector()
+        collector.feed(self._read_file(page))
+        known = {_resolve_output_url(url, page) for url in [*collector.urls, *collector.hinted] if url}
+        hints, origins = [], collections.defaultdict(bool)
+
+        def add(rel, href, relpath=None, **attrs):
+            if href not in collector.hinted and (relpath is None or relpath not in known):
+                known.add(relpath)
+                hints.append((rel, href, attrs))
+
+        def add_origin(url, crossorigin):
+            origin = _URL_ORIGIN_RE.match(url).group(0)
+            origins[origin if origin[0] != "/" else "https:" + origin] |= crossorigin
+
+        styles = [(page, text) for text in collector.head_styles]
+        for url in collector.urls:
+            if url and _URL_ORIGIN_RE.match(url):
+                add_origin(url, False)
+            elif url and (_resolve_output_url(url, page) or "").endswith(".css"):
+                relpath = _resolve_output_url(url, page)
+                if relpath in self.files:
+                    styles.append((relpath, self._read_file(relpath)))
+        css_text = "".join(_FONT_FACE_RE.sub("", text) for _, text in styles)
+        for referrer, text in styles:
+            for rule in _FONT_FACE_RE.findall(text):
+                family = re.search(r"font-family\s*:\s*['\"]?([^;'\"}]+)", rule)
+                if family is None or not re.search(rf"['\"\s,:]{re.escape(family.group(1).strip())}['\"\s,;]",
+                                                   css_text):
+                    continue
+                for url in _CSS_URL_RE.findall(rule):
+                    if _URL_ORIGIN_RE.match(url):
+                        add_origin(url, True)
+                        continue
+                    relpath = _resolve_output_url(url, referrer)
+                    suffix = Path(relpath or "").suffix
+                    if relpath in self.files and self.files[relpath].startswith(FONT_SIGNATURES.get(suffix, (b"",))):
+                        add("preload", f"/{relpath}", relpath, **{
+                            "as": "font", "type": FONT_MIME_TYPES.get(Path(relpath).suffix, "font/woff2"),
+                            "crossorigin": True})
+        pending, seen = [(url, page, True) for url in collector.modules], set()
+        while pending:
+            url, referrer, entry = pending.pop(0)
+            relpath = _resolve_output_url(url, referrer)
+            if relpath not in self.files or relpath in seen:
+                continue
+            seen.add(relpath)
+            if not entry:
+                add("modulepreload", f"/{relpath}", relpath)
+            pending.extend((url, relpath, False) for url in _JS_IMPORT_RE.findall(self._read_file(relpath)))
+        for origin, crossorigin in origins.items():
+            if crossorigin:
+                add("preconnect", origin, crossorigin=True)
+            else:
+                add("preconnect", origin)
+        linked = collections.Counter()
+        for href in collector.links:
+            href = href.split("#", 1)[0]
+            relpath = href and _resolve_output_url(href, page)
+            if relpath and relpath.endswith(".html") and relpath in self.files and relpath != page:
+                if relpath not in linked:
+                    linked.update(self.page_resources(relpath)[0][1:])
+                add("prefetch", href, relpath)
+        # Assets that more than one linked page loads are worth fetching ahead of the navigation
+        for relpath, pages in linked.most_common():
+            if pages > 1:
+                add("prefetch", f"/{relpath}", relpath)
+        return hints
+
+    def add_resource_hints(self):
+        """Add the resource hints each page's asset graph calls for, up to RESOURCE_HINT_LIMITS per kind"""
+        with self._lock:
+            pages = sorted(relpath for relpath in self.files if relpath.endswith(".html"))
+        for page in pages:
+            hints, counts, dropped = [], collections.Counter(), 0
+            for hint in self.resource_hints(page):
+                if counts[hint[0]] < self.RESOURCE_HINT_LIMITS.get(hint[0], 0):
+                    counts[hint[0]] += 1
+                    hints.append(hint)
+                else:
+                    dropped += 1
+            if not hints:
+                continue
+            self._write_file(page, resource_hint_markup(self._read_file(page), hints))
+            summary = ", ".join(f"{count} {rel}" for rel, count in counts.items())
+            print(f"✓ Added resource hints to {page} ({summary}{f'; {dropped} over the cap' if dropped else ''})")
+
+    def check_budgets(self):
+        """Check the build output against the budget file; returns (and prints) the violations
+
+        The budget file sets limits per file type (keyed by suffix), per page
+        (keyed by page path, "*" for all; bytes of the page and everything it
+        loads, and the request count) and for the inline critical CSS of each
+        page. max_bytes limits are uncompressed, max_gzip_bytes limits are
+        transfer sizes.
+        """
+        self.budget_violations = violations = []
+        if not self.budget_file or not self.budget_file.exists():
+            return violations
+        budgets = json.loads(self.budget_file.read_text(encoding="utf-8"))
+        wire = {}
+
+        def check(target, budget, limits, raw, compressed=None, requests=None):
+            for key, actual in (("max_bytes", raw), ("max_gzip_bytes", compressed), ("max_requests", requests)):
+                if key in limits and actual is not None and actual > limits[key]:
+                    violations.append({"target": target, "budget": f"{budget}.{key}", "actual": actual,
+                                       "limit": limits[key]})
+
+        with self._lock:
+            outputs = sorted(self.files)
+        for relpath in outputs:
+            suffix = Path(relpath).suffix
+            limits = budgets.get("file_types", {}).get(suffix)
+            if limits:
+                check(relpath, f"file_types[{suffix}]", limits, len(self.files[relpath]),
+                      self._transfer_size(relpath, wire) if "max_gzip_bytes" in limits else None)
+        page_budgets = budgets.get("pages", {})
+        for page in (relpath for relpath in outputs if relpath.endswith(".html")):
+            resources, critical_css = self.page_resources(page)
+            key = page if page in page_budgets else "*"
+            limits = {**page_budgets.get("*", {}), **page_budgets.get(page, {})}
+            if limits:
+                check(page, f"pages[{key}]", limits, sum(len(self.files[relpath]) for relpath in resources),
+                      sum(self._transfer_size(relpath, wire) for relpath in resources), len(resources))
+            limits = budgets.get("critical_css")
+            if limits and critical_css:
+                data = critical_css.encode("utf-8")
+                check(page, "critical_css", limits, len(data), len(gzip.compress(data, compresslevel=9, mtime=0)))
+
+        if violations:
+            print(f"✗ {len(violations)} performance budget violation(s) ({self.budget_file.name}):")
+            for violation in violations:
+                unit = "" if violation["budget"].endswith("max_requests") else " bytes"
+                print(f"  ✗ {violation['target']}: {violation['budget']} {violation['actual']:,} > "
+                      f"{violation['limit']:,}{unit}")
+        else:
+            print(f"✓ Within performance budgets ({self.budget_file.name})")
+        return violations
+
+    def run_build_graph(self):
+        """Run BUILD_STEPS on a thread pool, each step once its dependencies are done
+
+        Steps fan their own work out onto the same pool (_parallel_map), so a
+        build never runs more than self.jobs threads.
+        """
+        pending = dict(self.BUILD_STEPS)
+        unknown = {dep for deps in pending.values() for dep in deps} - pending.keys()
+        if unknown:
+            raise ValueError(f"Unknown build step dependencies: {', '.join(sorted(unknown))}")
+        done = set()
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            self._pool = pool
+            try:
+                running = {}
+                while pending or running:
+                    for name, deps in list(pending.items()):
+                        if done.issuperset(deps):
+                            running[pool.submit(self.run_step, name)] = name
+                            del pending[name]
+                    if not running:
+                        raise ValueError(f"Build step dependency cycle: {', '.join(sorted(pending))}")
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        future.result()
+                        done.add(running.pop(future))
+            finally:
+                self._pool = None
+
+    def write_output_tree(self):
+        """Write changed outputs under base_path and remove stale ones"""
+        previous = self.manifest.get("files", {})
+        current = {}
+        written = 0
+        for relpath, data in self.files.items():
+            path = self.base_path / relpath
+            digest = self.hashes[relpath]
+            entry = previous.get(relpath)
+            try:
+                stat = path.stat()
+            except OSError:
+                stat = None
+            if (entry is None or stat is None or entry["sha256"] != digest
+                    or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+                stat = path.stat()
+                written += 1
+            current[relpath] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        for relpath in previous.keys() - current.keys():
+            (self.base_path / relpath).unlink(missing_ok=True)
+        self.manifest["files"] = current
+        print(f"✓ Wrote {written} changed file(s) of {len(current)}")
+        return written
+
+    def _members_digest(self):
+        digest = hashlib.sha256()
+        for relpath in sorted(self.hashes):
+            digest.update(f"{relpath}\0{self.hashes[relpath]}\n".encode("utf-8"))
+        return digest.hexdigest()
+
     def create_zip_archive(self):
-        """Create zip file with all project files"""
-        zip_filename = f"{self.project_name}.zip"
-        
-        with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(self.base_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, self.base_path.parent)
-                    zipf.write(file_path, arcname)
-        
-        print(f"✓ Created zip archive: {zip_filename}")
+        """Create a reproducible zip file with all project files, streamed from the in-memory file map
+
+        Members are sorted with fixed timestamps and permissions, so identical
+        builds give byte-identical archives. Already-compressed files are
+        STORED; everything else is deflated at compress_level. An archive_path
+        of "-" writes the zip to stdout.
+        """
+        zip_filename = self.archive_path
+        members = self._members_digest()
+        archive = self.manifest.get("archive", {})
+        if (self.incremental and archive.get("path") == zip_filename and archive.get("members") == members
+                and archive.get("compress_level") == self.compress_level and Path(zip_filename).exists()):
+            print(f"✓ Zip archive up to date: {zip_filename}")
+            return zip_filename
+        
+        started = time.perf_counter()
+        date_time = _archive_timestamp()
+        # sys.__stdout__: progress output may be redirected away from sys.stdout
+        target = sys.__stdout__.buffer if zip_filename == "-" else zip_filename
+        with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED, compresslevel=self.compress_level) as zipf:
+            for relpath in sorted(self.files):
+                info = zipfile.ZipInfo(f"{self.base_path.name}/{relpath}", date_time)
+                info.create_system = 3
+                info.external_attr = 0o644 << 16
+                if Path(relpath).suffix.lower() in INCOMPRESSIBLE_SUFFIXES:
+                    info.compress_type = zipfile.ZIP_STORED
+                else:
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                zipf.writestr(info, self.files[relpath])
+            infos = zipf.infolist()
+        
+        self.archive_report = {
+            "files": len(infos),
+            "stored": sum(1 for info in infos if info.compress_type == zipfile.ZIP_STORED),
+            "raw_bytes": sum(info.file_size for info in infos),
+            "compressed_bytes": sum(info.compress_size for info in infos),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+        self.manifest["archive"] = {"path": zip_filename, "members": members,
+                                    "compress_level": self.compress_level}
+        report = self.archive_report
+        print(f"✓ Created zip archive: {zip_filename} ({report['files']} files, {report['stored']} stored, "
+              f"{report['raw_bytes']:,} → {report['compressed_bytes']:,} bytes in {report['seconds']:.3f}s)")
         return zip_filename
 
+    def watch_paths(self):
+        """Source files whose changes trigger a rebuild in watch mode"""
+        sources = {self.ICON_MASTER, *self.PREBUILT_IMAGES.values(), *(source for source, _ in self.IMAGES.values()),
+                   *self.FONT_FILES}
+        return [Path(__file__).resolve(), *sorted(path for path in self.template_dir.rglob("*") if path.is_file()),
+                *sorted(SOURCE_DIR / source for source in sources)]
+
+    def build(self):
+        """Run the build steps and write the output tree; returns the number of files written"""
+        self._build_started = time.perf_counter()
+        self.metrics = []
+        
+        if self.incremental:
+            self.load_manifest()
+        
+        # Create directory structure (in-memory builds never stage to disk)
+        if not self.in_memory:
+            self.create_directory_structure()
+        
+        # Create all files, skipping steps whose inputs are unchanged
+        self.run_build_graph()
+        if self.in_memory:
+            return len(self.files)
+        with self._traced("write_output_tree", "io") as counters:
+            counters["files"] = written = self.write_output_tree()
+        return written
+
     def compile_website(self):
         """Main compilation process - THIS WAS MISSING FROM YOUR SCRIPT"""
         print("🚀 Compiling TENET Tech Portfolio Website...")
         print("=" * 50)
-        
-        # Create directory structure
-        self.create_directory_structure()
-        
-        # Create all files
-        self.create_index_html()
-        self.create_main_css()
-        self.create_main_js()
-        self.create_manifest_json()
-        self.create_service_worker()
-        self.create_shed_organizer_app()
-        self.create_wild_harvest_app()
-        self.create_fonts_placeholder()
-        self.create_readme()
+        self.build()
+        self.check_budgets()
         
         # Create zip archive
-        zip_file = self.create_zip_archive()
+        with self._traced("create_zip_archive", "archive") as counters:
+            zip_file = self.create_zip_archive()
+            counters["bytes"] = self.archive_report.get("compressed_bytes", 0)
+        if self.report_dir:
+            self.write_build_reports()
         
         print(f"\n🎉 Website compilation complete!")
         print(f"📦 Package created: {zip_file}")
-        print(f"📂 Project folder: {self.base_path.absolute()}")
+        if not self.in_memory:
+            print(f"📂 Project folder: {self.base_path.absolute()}")
+        
+        if self.incremental:
+            # Keep the output tree; it is the baseline for the next build
+            self.save_manifest()
+            return zip_file
+        if self.in_memory:
+            return zip_file
         
         # Cleanup project directory
         import shutil
@@ -1777,8 +2690,285 @@ MIT License - feel free to use and modify
         
         return zip_file
 
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = (
+    f"<script>new EventSource('{LIVE_RELOAD_PATH}').onmessage = () => location.reload();</script>"
+)
+# Served instead of sw.js by the dev server so a cached worker never masks a rebuild
+DEV_SERVICE_WORKER = (
+    "self.addEventListener('install', () => self.skipWaiting());\n"
+    "self.addEventListener('activate', () => self.registration.unregister());\n"
+)
+
+
+class _LiveReload:
+    """Build generation counter that live-reload connections wait on"""
+
+    def __init__(self):
+        self.generation = 0
+        self.changed = threading.Condition()
+
+    def bump(self):
+        with self.changed:
+            self.generation += 1
+            self.changed.notify_all()
+
+
+def make_dev_handler(directory, live_reload):
+    """Static file handler for the output tree with live reload injected into HTML pages"""
+    import http.server
+
+    class DevRequestHandler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(directory), **kwargs)
+
+        def end_headers(self):
+            self.send_header("Cache-Control", "no-store")
+            super().end_headers()
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == LIVE_RELOAD_PATH:
+                return self._stream_reloads()
+            if path == "/sw.js":
+                return self._send(DEV_SERVICE_WORKER.encode("utf-8"), "text/javascript")
+            target = Path(self.translate_path(path))
+            if target.is_dir():
+                target = target / "index.html"
+            if target.suffix == ".html" and target.is_file():
+                html = target.read_text(encoding="utf-8")
+                if "</body>" in html:
+                    html = html.replace("</body>", LIVE_RELOAD_SCRIPT + "</body>", 1)
+                else:
+                    html += LIVE_RELOAD_SCRIPT
+                return self._send(html.encode("utf-8"), "text/html; charset=utf-8")
+            return super().do_GET()
+
+        def _send(self, body, content_type):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream_reloads(self):
+            """Server-sent events: one message per finished rebuild, comments as keep-alive"""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            seen = live_reload.generation
+            try:
+                while True:
+                    with live_reload.changed:
+                        live_reload.changed.wait_for(lambda: live_reload.generation != seen, timeout=15)
+                        current = live_reload.generation
+                    self.wfile.write(b"data: reload\n\n" if current != seen else b": ping\n\n")
+                    self.wfile.flush()
+                    seen = current
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return DevRequestHandler
+
+
+def _load_compiler_class():
+    """Load a fresh copy of this module so edited templates and steps take effect"""
+    spec = importlib.util.spec_from_file_location("_website_compiler_live", Path(__file__).resolve())
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.TenetTechWebsiteCompiler
+
+
+def _snapshot(paths):
+    snapshot = {}
+    for path in paths:
+        try:
+            snapshot[path] = path.stat().st_mtime_ns
+        except OSError:
+            snapshot[path] = None
+    return snapshot
+
+
+def watch_and_serve(host="127.0.0.1", port=8000, interval=0.2, **compiler_kwargs):
+    """Rebuild incrementally whenever a source changes, serve the output tree and live-reload browsers
+
+    Each rebuild loads a fresh copy of the compiler. Steps whose inputs
+    changed run again, and an edit to the compiler source (helpers and
+    constants included) reruns every step; a failing rebuild is reported and
+    the previous output keeps being served.
+    """
+    import http.server
+
+    compiler_kwargs.update(incremental=True, in_memory=False)
+    live_reload = _LiveReload()
+
+    def rebuild():
+        started = time.perf_counter()
+        compiler = _load_compiler_class()(**compiler_kwargs)
+        written = compiler.build()
+        compiler.save_manifest()
+        print(f"✓ Rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms ({written} file(s) changed)")
+        compiler.check_budgets()
+        return compiler, written
+
+    compiler, _ = rebuild()
+    server = http.server.ThreadingHTTPServer((host, port), make_dev_handler(compiler.base_path, live_reload))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="dev-server", daemon=True).start()
+    print(f"👀 Watching for changes; serving {compiler.base_path} at http://{host}:{server.server_port}/")
+    snapshot = _snapshot(compiler.watch_paths())
+    try:
+        while True:
+            time.sleep(interval)
+            current = _snapshot(compiler.watch_paths())
+            if current == snapshot:
+                continue
+            snapshot = current
+            try:
+                compiler, written = rebuild()
+            except Exception as e:
+                print(f"✗ Rebuild failed: {e}")
+                continue
+            if written:
+                live_reload.bump()
+    except KeyboardInterrupt:
+        print("\n✓ Stopped watching")
+    finally:
+        server.shutdown()
+
+
+def _compile_site(config):
+    """Build one site of a batch in a worker process; returns its summary with the captured log"""
+    log = io.StringIO()
+    started = time.perf_counter()
+    summary = {"project_name": config.get("project_name"), "archive": None, "error": None, "budget_violations": []}
+    with contextlib.redirect_stdout(log):
+        try:
+            compiler = TenetTechWebsiteCompiler(**config)
+            summary["archive"] = compiler.compile_website()
+            summary["budget_violations"] = compiler.budget_violations
+        except Exception as e:
+            summary["error"] = f"{type(e).__name__}: {e}"
+    summary.update(seconds=round(time.perf_counter() - started, 3), log=log.getvalue())
+    return summary
+
+
+def compile_sites(configs, processes=None, output_dir=None, **common):
+    """Build several site variants in a process pool, one archive per site
+
+    Each config holds TenetTechWebsiteCompiler arguments (project_name is
+    required; site overrides values from site.json for branding) on top of
+    the common ones. All sites share cache_dir, so compiled templates,
+    derived images, font subsets and compressed sidecars and incremental
+    objects are computed and stored once. Archives go to output_dir as
+    <project_name>.zip when it is given. Logs are printed per site in
+    config order; returns the per-site summaries.
+    """
+    configs = [{**common, **config} for config in configs]
+    names = [config.get("project_name") for config in configs]
+    if None in names or len(set(names)) != len(names):
+        raise ValueError("every site needs its own project_name")
+    processes = min(processes or os.cpu_count() or 1, len(configs)) or 1
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    for config in configs:
+        if config.get("jobs") is None:
+            # Split the cores between sites instead of oversubscribing them
+            config["jobs"] = max(1, (os.cpu_count() or 1) // processes)
+        if output_dir is not None:
+            config.setdefault("archive_path", str(Path(output_dir) / f"{config['project_name']}.zip"))
+    started = time.perf_counter()
+    print(f"🚀 Compiling {len(configs)} sites with {processes} process(es)...")
+    results = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for result in pool.map(_compile_site, configs):
+            print(f"── {result['project_name']} ({result['seconds']:.2f}s) " + "─" * 20)
+            print(result["log"], end="")
+            if result["error"]:
+                print(f"✗ {result['project_name']} failed: {result['error']}")
+            results.append(result)
+    failed = sum(1 for result in results if result["error"] or result["budget_violations"])
+    print(f"\n🎉 Compiled {len(results) - failed} of {len(results)} sites cleanly in "
+          f"{time.perf_counter() - started:.2f}s")
+    return results
+
+
 # Main execution
 if __name__ == "__main__":
-    compiler = TenetTechWebsiteCompiler()
-    zip_file = compiler.compile_website()
-    print(f"\n🎯 Ready to deploy: {zip_file}")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Compile the TENET Tech portfolio website")
+    parser.add_argument('--project-name', default="tenet-tech-portfolio", help='Output folder and archive name')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Keep the output tree and skip steps whose inputs are unchanged')
+    parser.add_argument('--cache-dir', default=str(BUILD_CACHE_DIR), help='Build manifest and object cache location')
+    parser.add_argument('--in-memory', action='store_true',
+                        help='Stream generated files straight into the archive without a staging directory')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Archive path (default: <project-name>.zip); "-" writes the zip to stdout. '
+                             'With --sites, the directory the archives are written to')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Number of build steps to run in parallel (default: CPU count; with --sites, '
+                             'CPU count divided between the sites built at once)')
+    parser.add_argument('--compress-level', type=int, default=6, choices=range(0, 10), metavar='0-9',
+                        help='Deflate level for compressible archive members (default: 6)')
+    parser.add_argument('--minify', action='store_true',
+                        help='Minify HTML, CSS and JS output and write source maps')
+    parser.add_argument('--fingerprint', action='store_true',
+                        help='Give assets content-hashed file names and rewrite references to them')
+    parser.add_argument('--precompress', action='store_true',
+                        help='Write .gz and .br (if brotli is installed) siblings for text assets')
+    parser.add_argument('--optimize-images', action='store_true',
+                        help='Write resized WebP/AVIF variants of content images and serve them via <picture> '
+                             '(needs Pillow)')
+    parser.add_argument('--subset-fonts', action='store_true',
+                        help='Subset web fonts to the characters and weights the site uses (needs fontTools, brotli)')
+    parser.add_argument('--purge-css', action='store_true',
+                        help='Remove CSS rules that match no element, class or id used by any generated page')
+    parser.add_argument('--budget', default=str(BUDGET_FILE),
+                        help='Performance budget file checked after the build; violations exit non-zero '
+                             '("" to skip the check)')
+    parser.add_argument('--report-dir', default=None,
+                        help='Write a per-step JSON build report and a Chrome trace-event file here')
+    parser.add_argument('--watch', action='store_true',
+                        help='Rebuild on source changes and serve the output with live reload (implies --incremental)')
+    parser.add_argument('--port', type=int, default=8000, help='Dev server port for --watch (default: 8000)')
+    parser.add_argument('--sites', default=None,
+                        help='JSON list of site configs (project_name, site overrides, compiler options) '
+                             'to build in a process pool, one archive each')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Number of sites built at once with --sites (default: CPU count)')
+    args = parser.parse_args()
+
+    if args.watch:
+        watch_and_serve(port=args.port, project_name=args.project_name, cache_dir=args.cache_dir, jobs=args.jobs,
+                        minify=args.minify, fingerprint=args.fingerprint, precompress=args.precompress,
+                        optimize_images=args.optimize_images, subset_fonts=args.subset_fonts, budget_file=args.budget,
+                        purge_css=args.purge_css)
+        sys.exit(0)
+
+    if args.sites:
+        if args.output == "-":
+            parser.error("--output - (zip to stdout) cannot be combined with --sites")
+        configs = json.loads(Path(args.sites).read_text(encoding="utf-8"))
+        results = compile_sites(configs, processes=args.processes, output_dir=args.output, jobs=args.jobs,
+                                incremental=args.incremental, cache_dir=args.cache_dir, in_memory=args.in_memory,
+                                compress_level=args.compress_level, minify=args.minify,
+                                fingerprint=args.fingerprint, precompress=args.precompress,
+                                optimize_images=args.optimize_images, subset_fonts=args.subset_fonts,
+                                purge_css=args.purge_css, budget_file=args.budget, report_dir=args.report_dir)
+        sys.exit(1 if any(result["error"] or result["budget_violations"] for result in results) else 0)
+
+    compiler = TenetTechWebsiteCompiler(args.project_name, incremental=args.incremental, cache_dir=args.cache_dir,
+                                        in_memory=args.in_memory, archive_path=args.output, jobs=args.jobs,
+                                        compress_level=args.compress_level, minify=args.minify,
+                                        fingerprint=args.fingerprint, precompress=args.precompress,
+                                        report_dir=args.report_dir, optimize_images=args.optimize_images,
+                                        subset_fonts=args.subset_fonts, budget_file=args.budget,
+                                        purge_css=args.purge_css)
+    # Progress goes to stderr when the archive itself is written to stdout
+    with contextlib.redirect_stdout(sys.stderr) if args.output == "-" else contextlib.nullcontext():
+        zip_file = compiler.compile_website()
+    if compiler.budget_violations:
+        sys.exit(1)